@@ -0,0 +1,73 @@
+# Compares the planar and interleaved layouts of DualArray on elementwise and gather/scatter heavy workloads
+#
+#     python benchmarks/layout.py [--size N] [--repeat R]
+#
+# Each workload is timed on the same points stored in both layouts, and the fastest of R runs is reported. The ratio is
+# the planar time over the interleaved time, so above 1 the interleaved layout is faster.
+import argparse
+import timeit
+
+import numpy as np
+
+from dual_autodiff import DualArray
+
+
+
+def _workloads(x, indices, values):
+    """
+    The operations timed for an array `x`, as a list of (name, callable) pairs
+    """
+
+    def elementwise():
+        return (x * x).sin() + x.exp()
+
+    def gather():
+        return x[indices]
+
+    def scatter():
+        x[indices] = values
+
+    def update():
+        # a small update of scattered elements, as in particle or sparse solvers
+        x[indices] = x[indices] * 0.5 + 1.0
+
+    return [("elementwise", elementwise), ("gather", gather), ("scatter", scatter), ("gather/update/scatter", update)]
+
+
+
+def _best(f, repeat):
+    """
+    The fastest time of `repeat` calls of f in milliseconds
+    """
+
+    return 1e3 * min(timeit.repeat(f, number=1, repeat=repeat))
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Times DualArray workloads in the planar and interleaved layouts")
+    parser.add_argument("--size", type=int, default=4_000_000, help="number of dual numbers in the array")
+    parser.add_argument("--gathered", type=int, default=500_000, help="number of random indices gathered")
+    parser.add_argument("--repeat", type=int, default=7, help="number of timed runs of each workload")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    planar = DualArray(rng.random(args.size), rng.random(args.size))
+    interleaved = planar.to_layout("interleaved")
+    indices = rng.integers(0, args.size, args.gathered)
+    values = DualArray(rng.random(args.gathered), rng.random(args.gathered))
+
+    print("{} dual numbers, {} random indices, best of {} runs (ms)\n".format(args.size, args.gathered, args.repeat))
+    print("{:<24}{:>10}{:>14}{:>10}".format("workload", "planar", "interleaved", "ratio"))
+    for (name, f), (_, g) in zip(_workloads(planar, indices, values), _workloads(interleaved, indices, values)):
+        a, b = _best(f, args.repeat), _best(g, args.repeat)
+        print("{:<24}{:>10.2f}{:>14.2f}{:>10.2f}".format(name, a, b, a / b))
+
+    print("\nconversion (ms): planar to interleaved {:.2f}, interleaved to planar {:.2f}".format(
+        _best(lambda: planar.to_layout("interleaved"), args.repeat),
+        _best(lambda: interleaved.to_layout("planar"), args.repeat)))
+
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,61 @@
-from dual_autodiff.dual import Dual
+import importlib
 
+from dual_autodiff.backends import Dual, MutableDual, BACKEND, available_backends, load_backend
 
-__all__ = ["Dual"]
\ No newline at end of file
+
+# features which are only imported the first time they are used, mapping the public name to the submodule providing it.
+# This keeps ``import dual_autodiff`` fast and free of numpy for code that only needs the scalar Dual class.
+_LAZY = {
+    "profile": "dual_autodiff.profiling",
+    "Profile": "dual_autodiff.profiling",
+    "DualArray": "dual_autodiff.array",
+    "ComplexDual": "dual_autodiff.complex_dual",
+    "Taylor": "dual_autodiff.taylor",
+    "where": "dual_autodiff.array",
+    "maximum": "dual_autodiff.array",
+    "minimum": "dual_autodiff.array",
+    "clip": "dual_autodiff.array",
+    "set_domain_policy": "dual_autodiff.policy",
+    "get_domain_policy": "dual_autodiff.policy",
+    "domain_policy": "dual_autodiff.policy",
+    "ErrorCode": "dual_autodiff.policy",
+    "config": "dual_autodiff.settings",
+    "get_config": "dual_autodiff.settings",
+    "set_config": "dual_autodiff.settings",
+    "sum": "dual_autodiff.reductions",
+    "prod": "dual_autodiff.reductions",
+    "mean": "dual_autodiff.reductions",
+    "norm": "dual_autodiff.reductions",
+    "logsumexp": "dual_autodiff.reductions",
+    "check_grad": "dual_autodiff.gradcheck",
+    "sweep": "dual_autodiff.sweep",
+    "primitive": "dual_autodiff.primitives",
+    "get_primitive": "dual_autodiff.primitives",
+    "fft": "dual_autodiff.spectral",
+    "ifft": "dual_autodiff.spectral",
+    "rfft": "dual_autodiff.spectral",
+    "irfft": "dual_autodiff.spectral",
+    "convolve": "dual_autodiff.spectral",
+}
+
+
+__all__ = ["Dual", "MutableDual", "BACKEND", "available_backends", "load_backend"] + list(_LAZY)
+
+
+
+def __getattr__(name):
+    """
+    Imports lazily loaded features on first access
+    """
+
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        # cache on the package so later lookups do not come through here
+        globals()[name] = value
+        return value
+    raise AttributeError("module 'dual_autodiff' has no attribute {}".format(name))
+
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
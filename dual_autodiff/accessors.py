@@ -0,0 +1,307 @@
+import numpy as np
+
+from dual_autodiff.array import DualArray
+
+
+# importing this module registers a ``dual`` accessor on pandas Series and DataFrames and, when xarray is installed, on
+# xarray DataArrays. Both libraries are optional, so an accessor is only registered when its library can be imported.
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import xarray as xr
+except ImportError:
+    xr = None
+
+
+
+def _evaluate(f, array):
+    """
+    Evaluates `f` on the DualArray `array`, returning the real and dual planes of the result broadcast to the shape of
+    `array` so that functions returning constants or scalar duals still give one value per element
+    """
+
+    result = f(array)
+    if hasattr(result, "dual"):
+        real, dual = result.real, result.dual
+    else:
+        real, dual = result, 0
+    return np.broadcast_to(real, array.shape), np.broadcast_to(dual, array.shape)
+
+
+
+def _grouping(by):
+    """
+    The columns named by the `by` argument of the DataFrame accessor, which may be a single name or a list of names
+    """
+
+    if by is None:
+        return []
+    return [by] if isinstance(by, str) else list(by)
+
+
+
+def _evaluate_columns(f, frame, wrt):
+    """
+    Evaluates `f` with each numeric column of `frame` as a keyword argument, seeding the column `wrt` with a dual part
+    of 1
+    """
+
+    columns = {name: DualArray(frame[name].to_numpy(), 1 if name == wrt else 0)
+               for name in frame.columns if frame[name].dtype.kind in "iuf"}
+    if wrt not in columns:
+        raise KeyError("cannot differentiate with respect to {}, it is not a numeric column".format(wrt))
+    return _evaluate(lambda _: f(**columns), columns[wrt])
+
+
+
+def _grouped(evaluate, frame, by):
+    """
+    Applies `evaluate` to `frame` as a whole, or to each group of rows of `frame` when `by` is given, and returns the
+    real and dual planes of the results in the row order of `frame`. The grouping columns are not passed on.
+    """
+
+    grouping = _grouping(by)
+    if not grouping:
+        return evaluate(frame)
+
+    real = np.empty(len(frame))
+    dual = np.empty(len(frame))
+    for positions in frame.groupby(grouping, sort=False).indices.values():
+        real[positions], dual[positions] = evaluate(frame.iloc[positions].drop(columns=grouping))
+    return real, dual
+
+
+
+if pd is not None:
+
+    @pd.api.extensions.register_series_accessor("dual")
+    class SeriesAccessor:
+        """
+        The ``Series.dual`` accessor, which treats a numeric Series as the real parts of a DualArray
+
+
+        Examples
+        --------
+        >>> s = pd.Series([1.0, 2.0], index=["a", "b"])
+        >>> s.dual.value_and_derivative(np.log)      # doctest: +NORMALIZE_WHITESPACE
+              value  derivative
+        a  0.000000         1.0
+        b  0.693147         0.5
+        """
+
+        def __init__(self, series):
+            if series.dtype.kind not in "iuf":
+                raise AttributeError("the dual accessor needs a numeric Series, not {}".format(series.dtype))
+            self._series = series
+
+
+        def to_array(self, dual=1):
+            """
+            Returns the Series as a DualArray
+
+
+            Parameters
+            ----------
+            dual : array_like
+                The dual parts, defaults to 1 so that functions of the array give derivatives with respect to the values
+
+
+            Returns
+            -------
+            DualArray
+                The values of the Series as the real plane
+            """
+
+            return DualArray(self._series.to_numpy(), dual)
+
+
+        def derivative(self, f):
+            """
+            Differentiates `f` at every value of the Series in a single vectorised evaluation
+
+
+            Parameters
+            ----------
+            f : callable
+                A function of a DualArray, written with DualArray methods or numpy ufuncs
+
+
+            Returns
+            -------
+            pandas.Series
+                The derivatives, with the index and name of the Series
+            """
+
+            _, dual = _evaluate(f, self.to_array())
+            return pd.Series(dual, index=self._series.index, name=self._series.name)
+
+
+        def value_and_derivative(self, f):
+            """
+            Evaluates and differentiates `f` at every value of the Series
+
+
+            Parameters
+            ----------
+            f : callable
+                A function of a DualArray
+
+
+            Returns
+            -------
+            pandas.DataFrame
+                The columns ``value`` and ``derivative``, with the index of the Series
+            """
+
+            real, dual = _evaluate(f, self.to_array())
+            return pd.DataFrame({"value": real, "derivative": dual}, index=self._series.index)
+
+
+
+    @pd.api.extensions.register_dataframe_accessor("dual")
+    class DataFrameAccessor:
+        """
+        The ``DataFrame.dual`` accessor, which differentiates functions of several columns
+
+        Functions are called with every numeric column as a keyword argument holding a DualArray, so a function of
+        columns ``x`` and ``y`` is written ``lambda x, y: ...`` (use ``**kwargs`` to accept columns which are not
+        needed).
+
+
+        Examples
+        --------
+        >>> df = pd.DataFrame({"x": [1.0, 2.0], "y": [3.0, 4.0]})
+        >>> df.dual.gradient(lambda x, y: x * y)
+             x    y
+        0  3.0  1.0
+        1  4.0  2.0
+        """
+
+        def __init__(self, frame):
+            self._frame = frame
+
+
+        def to_array(self, real, dual):
+            """
+            Builds a DualArray from a column of real parts and a column of dual parts
+
+
+            Parameters
+            ----------
+            real, dual : str
+                The names of the columns holding the real and dual parts
+
+
+            Returns
+            -------
+            DualArray
+                The dual numbers held by the two columns
+            """
+
+            return DualArray(self._frame[real].to_numpy(), self._frame[dual].to_numpy())
+
+
+        def derivative(self, f, wrt, by=None):
+            """
+            Differentiates `f` with respect to one column, evaluating it on whole columns at once
+
+
+            Parameters
+            ----------
+            f : callable
+                A function taking the columns as keyword arguments
+            wrt : str
+                The column to differentiate with respect to
+            by : str or list of str, optional
+                Columns to group the rows by, `f` is then evaluated on each group separately so that it may depend on
+                statistics of the group. The grouping columns are not passed to `f`.
+
+
+            Returns
+            -------
+            pandas.Series
+                The partial derivatives, with the index of the DataFrame
+            """
+
+            _, dual = _grouped(lambda frame: _evaluate_columns(f, frame, wrt), self._frame, by)
+            return pd.Series(dual, index=self._frame.index, name=wrt)
+
+
+        def gradient(self, f, columns=None, by=None):
+            """
+            Differentiates `f` with respect to each of `columns`
+
+
+            Parameters
+            ----------
+            f : callable
+                A function taking the columns as keyword arguments
+            columns : list of str, optional
+                The columns to differentiate with respect to, defaults to every column not used for grouping
+            by : str or list of str, optional
+                Columns to group the rows by, see :meth:`derivative`
+
+
+            Returns
+            -------
+            pandas.DataFrame
+                One column of partial derivatives for each of `columns`, with the index of the DataFrame
+            """
+
+            if columns is None:
+                columns = [c for c in self._frame.columns
+                           if c not in _grouping(by) and self._frame[c].dtype.kind in "iuf"]
+            return pd.DataFrame({c: self.derivative(f, c, by).to_numpy() for c in columns}, index=self._frame.index)
+
+
+
+if xr is not None:
+
+    @xr.register_dataarray_accessor("dual")
+    class DataArrayAccessor:
+        """
+        The ``DataArray.dual`` accessor, which differentiates functions elementwise over the values of a DataArray
+        """
+
+        def __init__(self, data):
+            self._data = data
+
+
+        def derivative(self, f):
+            """
+            Differentiates `f` at every value of the DataArray
+
+
+            Parameters
+            ----------
+            f : callable
+                A function of a DualArray
+
+
+            Returns
+            -------
+            xarray.DataArray
+                The derivatives, with the dimensions and coordinates of the DataArray
+            """
+
+            _, dual = _evaluate(f, DualArray(self._data.values, 1))
+            return self._data.copy(data=np.array(dual))
+
+
+        def value_and_derivative(self, f):
+            """
+            Evaluates and differentiates `f` at every value of the DataArray
+
+
+            Returns
+            -------
+            xarray.Dataset
+                The variables ``value`` and ``derivative``
+            """
+
+            real, dual = _evaluate(f, DualArray(self._data.values, 1))
+            return xr.Dataset({"value": self._data.copy(data=np.array(real)),
+                               "derivative": self._data.copy(data=np.array(dual))})
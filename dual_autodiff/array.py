@@ -0,0 +1,2186 @@
+import functools
+import math
+
+import numpy as np
+
+from dual_autodiff import backends
+from dual_autodiff.complex_dual import ComplexDual
+from dual_autodiff.dual import Dual
+from dual_autodiff.policy import ErrorCode, get_domain_policy
+from dual_autodiff.settings import get_config
+
+
+# the scalar dual classes a DualArray can be combined with, the python class and the class of the selected backend
+_DUAL_TYPES = tuple({Dual, backends.Dual})
+
+# the precisions each plane of a DualArray may be stored in
+_PLANE_TYPES = (np.float16, np.float32, np.float64, np.longdouble, np.complex64, np.complex128, np.clongdouble)
+
+# the ways the planes of a DualArray may be laid out in memory, see DualArray.to_layout
+_LAYOUTS = ("planar", "interleaved")
+
+
+
+def _plane_dtype(dtype):
+    """
+    Checks `dtype` is a supported precision for the real or dual plane and returns it as a numpy dtype
+    """
+
+    dtype = np.dtype(dtype)
+    if dtype.type not in _PLANE_TYPES:
+        raise TypeError("unsupported dtype for a dual array plane {}, expected one of {}".format(
+            dtype, ", ".join(np.dtype(t).name for t in _PLANE_TYPES)))
+    return dtype
+
+
+
+def _default_dtype(values):
+    """
+    The dtype a plane is stored in when no dtype is requested, supported precisions are kept and integers become float64
+    """
+
+    if values.dtype.type in _PLANE_TYPES:
+        return values.dtype
+    return np.dtype(np.float64)
+
+
+
+def _record_dtype(dtype, dual_dtype):
+    """
+    The structured dtype of an interleaved DualArray, a real and a dual field next to each other in every element
+    """
+
+    return np.dtype([("real", dtype), ("dual", dual_dtype)])
+
+
+
+def _check_numeric(values, name):
+    """
+    Raises a TypeError if `values` is not an array of numbers, mirroring the checks made by Dual
+    """
+
+    if values.dtype.kind not in "iufc":
+        raise TypeError("{} component must be an array of complex numbers, floats or integers, not {}".format(
+            name, values.dtype))
+
+
+
+def _keep_complex(dtype, values):
+    """
+    Promotes a real `dtype` to complex when the computed `values` are complex, so that mixing a complex plane into a
+    real one never discards the imaginary part
+    """
+
+    if np.iscomplexobj(values) and dtype.kind != "c":
+        return np.promote_types(dtype, np.complex64)
+    return dtype
+
+
+
+def _check_domain(invalid, error, message, code):
+    """
+    Applies the domain policy to the boolean array `invalid` of lanes outside the domain of an operation. Under the
+    "raise" policy `error` is raised with `message` if any lane is set, under the "nan" and "mask" policies the
+    ErrorCode `code` is returned in a uint8 array for the invalid lanes (0 elsewhere) so that the result can be marked,
+    and None is returned when there is nothing to mark.
+    """
+
+    policy = get_domain_policy()
+    if policy == "off" or not np.any(invalid):
+        return None
+    if policy == "raise":
+        raise error(message)
+    return np.where(invalid, np.uint8(code), np.uint8(ErrorCode.OK))
+
+
+
+def _quiet(function):
+    """
+    Decorator evaluating `function` with numpy's floating point warnings silenced unless the domain policy is "raise".
+    Under the other policies invalid lanes are reported by setting them to nan (and marking them) or are deliberately
+    left unchecked, so numpy warning about each of them only adds noise.
+    """
+
+    @functools.wraps(function)
+    def quiet(*args, **kwargs):
+        if get_domain_policy() == "raise":
+            return function(*args, **kwargs)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            return function(*args, **kwargs)
+    return quiet
+
+
+
+def _either(first, second):
+    """
+    Combines two sets of error codes returned by _check_domain, either of which may be None. A lane invalid in both
+    keeps the code from `first`.
+    """
+
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return np.where(first != 0, first, second)
+
+
+
+def _last_axis(values, axis):
+    """
+    Moves the axes of `values` in `axis` (an int, a tuple of ints or None for every axis) to a single last axis, keeping
+    their elements in index order, so a reduction over them is a reduction over the last axis
+    """
+
+    if axis is None:
+        return values.reshape(-1)
+    axis = axis if isinstance(axis, tuple) else (axis,)
+    values = np.moveaxis(values, axis, range(-len(axis), 0))
+    kept = values.ndim - len(axis)
+    return values.reshape(values.shape[:kept] + (math.prod(values.shape[kept:]),))
+
+
+
+def _first_code(codes, axis=None):
+    """
+    Reduces error codes along `axis` (an int, a tuple of ints or None for every axis) to the first nonzero code in index
+    order, or 0 where every code is 0, so a reduction keeps the code of the first invalid element it reduced
+    """
+
+    codes = _last_axis(codes, axis)
+    first = np.argmax(codes != 0, axis=-1)[..., None]
+    return np.take_along_axis(codes, first, axis=-1)[..., 0]
+
+
+
+def _mark(result, invalid, *operands):
+    """
+    Sets the `invalid` lanes of `result` to nan and, under the "mask" policy, records them in the mask of `result`
+    together with the masks of the DualArray `operands` it was computed from
+    """
+
+    if invalid is not None:
+        invalid = np.broadcast_to(invalid, result.shape)
+        result.real = np.where(invalid, np.nan, result.real)
+        result.dual = np.where(invalid, np.nan, result.dual)
+    return _merge_masks(result, invalid, *operands)
+
+
+
+def _merge_masks(result, invalid, *operands):
+    """
+    Sets the mask of `result` under the "mask" policy to the error codes of the `invalid` lanes together with the masks
+    of the DualArray `operands`, which may include `result` itself when it was updated in place
+    """
+
+    masks = [o._mask for o in operands if isinstance(o, DualArray) and o._mask is not None]
+    if invalid is not None:
+        masks.append(invalid)
+    result._mask = None
+    if masks and get_domain_policy() == "mask":
+        # the codes of the operands come first, so a lane keeps the code of the failure it was computed from
+        result._mask = np.array(np.broadcast_to(functools.reduce(_either, masks), result.shape))
+    return result
+
+
+
+def _into(out, result):
+    """
+    Copies `result` into the DualArray `out` given as the out argument of an operation, keeping the precision of out,
+    and returns out
+    """
+
+    if not isinstance(out, DualArray) or not isinstance(result, DualArray):
+        raise TypeError("out must be a DualArray, not {}".format(type(out)))
+    if out.shape != result.shape:
+        raise ValueError("out has shape {} but the result has shape {}".format(out.shape, result.shape))
+    np.copyto(out.real, result.real, casting="same_kind")
+    np.copyto(out.dual, result.dual, casting="same_kind")
+    out._mask = result._mask
+    return out
+
+
+
+@functools.lru_cache(maxsize=None)
+def _batch_kernels(backend):
+    """
+    The compiled batch kernels of `backend`, or None, looked up once per backend
+    """
+
+    return backends.load_batch(backend)
+
+
+
+def _kernels(*planes):
+    """
+    Returns the compiled batch kernels when the selected backend has them and every plane is a C contiguous float64
+    array they can work on directly, otherwise None so the numpy implementation is used
+    """
+
+    kernels = _batch_kernels(get_config().backend)
+    if kernels is None:
+        return None
+    for plane in planes:
+        if plane.dtype != np.float64 or not plane.flags.c_contiguous:
+            return None
+    return kernels
+
+
+
+class DualArray:
+    """
+    An array of dual numbers stored as two numpy arrays, the real plane and the dual plane.
+
+    Each element of a DualArray behaves like a :class:`~dual_autodiff.dual.Dual` number, but arithmetic and the elementary
+    functions act on whole planes at a time so large batches of dual numbers are evaluated at numpy speed. The planes
+    may be stored in ``float16``, ``float32``, ``float64`` or ``longdouble`` precision and the dual plane may use a
+    different precision to the real plane, for example a ``float64`` real plane with a ``float32`` dual plane halves the
+    memory used by the derivatives.
+
+    The planes may also be complex (``complex64``, ``complex128`` or ``clongdouble``), in which case each element behaves
+    like a :class:`~dual_autodiff.complex_dual.ComplexDual` and the elementary functions use the principal branch, so
+    complex valued pipelines can be differentiated at numpy speed.
+
+
+    Attributes
+    -----------
+    real : numpy.ndarray
+        The real parts of the dual numbers
+    dual : numpy.ndarray
+        The dual parts of the dual numbers
+
+
+    Notes
+    -----
+    Precision follows numpy's promotion rules applied separately to each plane:
+
+    - The real plane of a result has the promoted dtype of the real planes of the operands, and the dual plane has the
+      promoted dtype of the dual planes of the operands.
+    - Python scalars and :class:`~dual_autodiff.dual.Dual` numbers never increase the precision of a result.
+    - A numpy array operand is treated as having a zero dual part in its own precision, so it takes part in the
+      promotion of both planes.
+    - Elementary functions keep the precision of each plane.
+
+    As with :class:`~dual_autodiff.dual.Dual` the components given on construction must be finite, and operations
+    which are not defined for some elements raise the same exceptions as the scalar class. Both can be changed with the
+    domain policy (see :func:`~dual_autodiff.policy.set_domain_policy`), under the ``"nan"`` policy invalid elements
+    become nan and under the ``"mask"`` policy they are also recorded in :attr:`mask`, so the valid elements of a large
+    batch are still evaluated.
+
+    Long running loops can avoid allocating new planes on every iteration: the augmented assignment operators (``+=``,
+    ``-=``, ``*=`` and ``/=``) update an array in place, and the elementwise functions take an ``out`` DualArray to
+    write their result into, as do numpy ufuncs called with ``out=``. With the cython backend and ``float64`` planes
+    the kernels of :mod:`dual_autodiff_x.batch` write straight into ``out``.
+
+    By default the two planes are separate arrays (the ``"planar"`` layout), which is fastest for elementwise work. An
+    array may instead be stored ``"interleaved"``, as one structured array with the real and dual part of each element
+    next to each other, so that gathering or scattering scattered elements touches one cache line per element instead
+    of two, see :meth:`to_layout`.
+
+
+    Examples
+    --------
+    >>> x = DualArray([0.0, 1.0, 2.0], 1)
+    >>> y = (x * x).sin()
+    >>> y.dual
+    array([ 0.        ,  1.08060461, -2.61457448])
+
+    >>> x = DualArray([1, 2, 3], 1, dtype=np.float32)
+    >>> (x * 2.5).dtype
+    dtype('float32')
+    """
+
+    # makes numpy hand operations between ndarrays and DualArrays to the DualArray
+    __array_priority__ = 1000
+
+
+    def __init__(self, real, dual=0, dtype=None, dual_dtype=None):
+        """
+        Initialises the DualArray
+
+
+        Parameters
+        -----------
+        real : array_like
+            The real parts of the dual numbers
+        dual : array_like
+            The dual parts of the dual numbers, broadcast against `real`. Defaults to 0.
+        dtype : numpy.dtype, optional
+            Precision of the real plane, defaults to the ``dtype`` setting of :func:`~dual_autodiff.settings.config` if
+            it is set and otherwise to the precision of `real` (or float64 for integers)
+        dual_dtype : numpy.dtype, optional
+            Precision of the dual plane, defaults to `dtype`
+
+
+        Raises
+        ------
+        TypeError
+            If `real` or `dual` are not numeric or a dtype is not supported.
+        ValueError
+            If any component is NaN or infinite, under the ``"raise"`` domain policy. Under the ``"mask"`` policy the
+            non-finite elements are masked instead. Neither is checked when the ``check`` setting is off.
+        """
+
+        # the settings are read once for the whole array
+        settings = get_config()
+        if dtype is None:
+            dtype = settings.dtype
+
+        real = np.asarray(real)
+        dual = np.asarray(dual)
+        _check_numeric(real, "real")
+        _check_numeric(dual, "dual")
+
+        dtype = _plane_dtype(_default_dtype(real) if dtype is None else dtype)
+        dual_dtype = dtype if dual_dtype is None else _plane_dtype(dual_dtype)
+
+        shape = np.broadcast_shapes(real.shape, dual.shape)
+
+        # the planes may share memory with the inputs when no conversion is needed, broadcast inputs are copied so that
+        # every plane owns one value per element
+        if real.shape == shape:
+            real = real.astype(dtype, copy=False)
+        else:
+            real = np.array(np.broadcast_to(real, shape), dtype=dtype)
+        if dual.shape == shape:
+            dual = dual.astype(dual_dtype, copy=False)
+        else:
+            dual = np.array(np.broadcast_to(dual, shape), dtype=dual_dtype)
+
+        self._mask = None
+        if settings.check and settings.domain == "raise":
+            if not np.all(np.isfinite(real)):
+                raise ValueError("real component cannot be nan or inf")
+            if not np.all(np.isfinite(dual)):
+                raise ValueError("dual component cannot be nan or inf")
+        elif settings.check and settings.domain == "mask":
+            invalid = ~(np.isfinite(real) & np.isfinite(dual))
+            if np.any(invalid):
+                self._mask = np.where(invalid, np.uint8(ErrorCode.NON_FINITE), np.uint8(ErrorCode.OK))
+
+        self.real = real
+        self.dual = dual
+        self._records = None
+
+
+    @classmethod
+    def _new(cls, real, dual, dtype=None, dual_dtype=None):
+        """
+        Builds a DualArray from planes which are already valid without copying or checking them, casting each plane to
+        the requested precision where given
+        """
+
+        obj = cls.__new__(cls)
+        obj.real = np.asarray(real if dtype is None else np.asarray(real).astype(dtype, copy=False))
+        obj.dual = np.asarray(dual if dual_dtype is None else np.asarray(dual).astype(dual_dtype, copy=False))
+        obj._mask = None
+        obj._records = None
+        return obj
+
+
+    @classmethod
+    def _interleaved(cls, records):
+        """
+        Builds an interleaved DualArray whose planes are the fields of the structured array `records`, without copying
+        """
+
+        obj = cls._new(records["real"], records["dual"])
+        obj._records = records
+        return obj
+
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds an interleaved DualArray from a structured array with a ``real`` and a ``dual`` field, such as
+        ``np.dtype([("real", "f8"), ("dual", "f8")])``. The array shares memory with `records`.
+
+
+        Parameters
+        ----------
+        records : numpy.ndarray
+            Structured array whose fields are ``real`` and ``dual``, in that order
+
+
+        Returns
+        -------
+        DualArray
+            The dual numbers, in the ``"interleaved"`` layout
+
+
+        Raises
+        ------
+        TypeError
+            If `records` does not have exactly the fields ``real`` and ``dual`` or a field has an unsupported dtype.
+        ValueError
+            If any component is NaN or infinite, under the ``"raise"`` domain policy.
+        """
+
+        records = np.asarray(records)
+        if records.dtype.names != ("real", "dual"):
+            raise TypeError("records must be a structured array with the fields real and dual, not {}".format(
+                records.dtype))
+        dtype = _plane_dtype(records.dtype["real"])
+        dual_dtype = _plane_dtype(records.dtype["dual"])
+        # the fields are already in the requested precisions, so the constructor keeps them as views
+        result = cls(records["real"], records["dual"], dtype=dtype, dual_dtype=dual_dtype)
+        result._records = records
+        return result
+
+
+    def to_records(self):
+        """
+        Returns the dual numbers as a structured array with a ``real`` and a ``dual`` field. An interleaved array
+        returns the array it is stored in, without copying.
+
+
+        Returns
+        -------
+        numpy.ndarray
+            Structured array with the shape of this array
+
+
+        Examples
+        --------
+        >>> DualArray([1.0, 2.0], 1).to_records()
+        array([(1., 1.), (2., 1.)], dtype=[('real', '<f8'), ('dual', '<f8')])
+        """
+
+        if self._records is not None:
+            return self._records
+        records = np.empty(self.shape, _record_dtype(self.dtype, self.dual_dtype))
+        records["real"] = self.real
+        records["dual"] = self.dual
+        return records
+
+
+    @property
+    def layout(self):
+        """
+        How the planes are stored, ``"planar"`` for two separate arrays or ``"interleaved"`` for one structured array
+        """
+        return "planar" if self._records is None else "interleaved"
+
+
+    def to_layout(self, layout):
+        """
+        Returns the array stored in the given layout, or the array itself if it already has that layout
+
+        The ``"planar"`` layout keeps the real and dual planes in separate arrays. numpy and the compiled batch kernels
+        evaluate elementwise operations fastest on these, and the results of operations are always planar. The
+        ``"interleaved"`` layout stores each element's real and dual part next to each other, which makes indexing with
+        an array of scattered indices (gathers) and assigning to scattered elements (scatters) about twice as fast, as
+        each element is read or written with one memory access instead of two. In place operators and ``out=`` keep
+        the layout of the array they write to. Converting costs one copy of the planes.
+
+
+        Parameters
+        ----------
+        layout : str
+            ``"planar"`` or ``"interleaved"``
+
+
+        Returns
+        -------
+        DualArray
+            The array in the requested layout
+
+
+        Raises
+        ------
+        ValueError
+            If `layout` is not a known layout.
+
+
+        Examples
+        --------
+        >>> x = DualArray(np.linspace(0, 1, 10**6), 1).to_layout("interleaved")
+        >>> y = x[np.random.randint(0, 10**6, 1000)]
+        >>> y.layout
+        'interleaved'
+        """
+
+        if layout not in _LAYOUTS:
+            raise ValueError("layout must be one of {}, not {!r}".format(", ".join(_LAYOUTS), layout))
+        if layout == self.layout:
+            return self
+        if layout == "interleaved":
+            result = DualArray._interleaved(self.to_records())
+        else:
+            result = DualArray._new(self.real.copy(), self.dual.copy())
+        return _mark(result, None, self)
+
+
+    @classmethod
+    def from_duals(cls, duals, dtype=None, dual_dtype=None):
+        """
+        Builds a DualArray from a sequence of Dual numbers
+
+
+        Parameters
+        ----------
+        duals : iterable of Dual
+            The dual numbers
+        dtype, dual_dtype : numpy.dtype, optional
+            Precision of the real and dual planes
+
+
+        Returns
+        -------
+        DualArray
+            A one dimensional array of the dual numbers, with complex planes if any of `duals` is a ComplexDual
+
+
+        Examples
+        --------
+        >>> DualArray.from_duals([Dual(1, 2), Dual(3, 4)]).real
+        array([1., 3.])
+        """
+
+        duals = list(duals)
+        for d in duals:
+            if not isinstance(d, _DUAL_TYPES + (ComplexDual,)):
+                raise TypeError("can only build a DualArray from Dual numbers, not {}".format(type(d)))
+        return cls([d.real for d in duals], [d.dual for d in duals], dtype=dtype, dual_dtype=dual_dtype)
+
+
+    def to_duals(self):
+        """
+        Converts the array into a (nested) list of Dual numbers
+
+
+        Returns
+        -------
+        list
+            Dual numbers with the same nesting as the shape of the array
+        """
+
+        if self.ndim == 0:
+            return self[()]
+        return [item.to_duals() if isinstance(item, DualArray) else item for item in self]
+
+
+    def format(self, fmt="%r"):
+        """
+        Formats every element as a string like str(Dual), all at once
+
+
+        Parameters
+        ----------
+        fmt : str
+            A printf style format for the components, such as ``"%.6g"``, the default ``"%r"`` gives the same strings as
+            str(Dual)
+
+
+        Returns
+        -------
+        numpy.ndarray
+            An array of strings with the shape of the array
+
+
+        Raises
+        ------
+        TypeError
+            If the planes are complex.
+
+
+        Examples
+        --------
+        >>> DualArray([1, 2], [0.5, 3]).format("%.2f")
+        array(['Dual(real = 1.00, dual = 0.50)', 'Dual(real = 2.00, dual = 3.00)'],
+              dtype='<U30')
+        """
+
+        self._require_real("format")
+        lines = []
+        for text in _format_rows("Dual(real = {0}, dual = {0})".format(fmt), self.real, self.dual):
+            lines.extend(text.split("\n")[:-1])
+        return np.array(lines, dtype=str).reshape(self.shape)
+
+
+    def to_csv(self, fname, fmt="%.17g", delimiter=",", header=True):
+        """
+        Writes the array to a text file with a ``real`` and a ``dual`` column and a row per element, in C order
+
+        Rows are formatted a chunk at a time with a single string formatting operation, which is several times faster
+        than :func:`numpy.savetxt`. Shorter formats are faster still, the default ``"%.17g"`` reads back exactly.
+
+
+        Parameters
+        ----------
+        fname : str, path or file
+            The file to write to, or an open text file
+        fmt : str
+            A printf style format for both columns
+        delimiter : str
+            The string between the columns
+        header : bool
+            Whether to write a header line naming the columns
+
+
+        Raises
+        ------
+        TypeError
+            If the planes are complex.
+
+
+        Examples
+        --------
+        >>> import io
+        >>> buffer = io.StringIO()
+        >>> DualArray([1, 2], [0.5, 3]).to_csv(buffer, fmt="%g")
+        >>> buffer.getvalue()
+        'real,dual\\n1,0.5\\n2,3\\n'
+        """
+
+        self._require_real("to_csv")
+        if hasattr(fname, "write"):
+            _write_csv(fname, self, fmt, delimiter, header)
+        else:
+            with open(fname, "w") as file:
+                _write_csv(file, self, fmt, delimiter, header)
+
+
+    @property
+    def shape(self):
+        """
+        The shape of the array
+        """
+        return self.real.shape
+
+
+    @property
+    def ndim(self):
+        """
+        The number of dimensions of the array
+        """
+        return self.real.ndim
+
+
+    @property
+    def size(self):
+        """
+        The number of dual numbers in the array
+        """
+        return self.real.size
+
+
+    @property
+    def dtype(self):
+        """
+        The precision of the real plane
+        """
+        return self.real.dtype
+
+
+    @property
+    def dual_dtype(self):
+        """
+        The precision of the dual plane
+        """
+        return self.dual.dtype
+
+
+    @property
+    def is_complex(self):
+        """
+        Whether either plane is complex
+        """
+        return np.iscomplexobj(self.real) or np.iscomplexobj(self.dual)
+
+
+    @property
+    def mask(self):
+        """
+        Boolean array of the elements which were outside the domain of an operation, recorded under the ``"mask"``
+        domain policy and carried through every operation computed from them
+        """
+        if self._mask is None:
+            return np.zeros(self.shape, dtype=bool)
+        return self._mask != 0
+
+
+    @property
+    def errors(self):
+        """
+        uint8 array of the :class:`~dual_autodiff.policy.ErrorCode` of every element, recorded under the ``"mask"``
+        domain policy. Valid elements are 0 (``ErrorCode.OK``) and an invalid element has the code of the first rule it
+        broke, which is carried through every operation computed from it.
+        """
+        if self._mask is None:
+            return np.zeros(self.shape, dtype=np.uint8)
+        return self._mask
+
+
+    @property
+    def nbytes(self):
+        """
+        The memory used by both planes in bytes
+        """
+        return self.real.nbytes + self.dual.nbytes
+
+
+    def astype(self, dtype, dual_dtype=None):
+        """
+        Returns a copy of the array stored in a different precision
+
+
+        Parameters
+        ----------
+        dtype : numpy.dtype
+            Precision of the real plane
+        dual_dtype : numpy.dtype, optional
+            Precision of the dual plane, defaults to `dtype`
+
+
+        Returns
+        -------
+        DualArray
+            The converted array
+        """
+
+        dtype = _plane_dtype(dtype)
+        dual_dtype = dtype if dual_dtype is None else _plane_dtype(dual_dtype)
+        return _mark(DualArray._new(self.real.astype(dtype), self.dual.astype(dual_dtype)), None, self)
+
+
+    def conjugate(self):
+        """
+        Returns the complex conjugate of both planes
+        """
+        return _mark(DualArray._new(np.conjugate(self.real), np.conjugate(self.dual)), None, self)
+
+
+    def copy(self):
+        """
+        Returns a copy of the array, in the same layout
+        """
+        if self._records is not None:
+            return _mark(DualArray._interleaved(self._records.copy()), None, self)
+        return _mark(DualArray._new(self.real.copy(), self.dual.copy()), None, self)
+
+
+    def reshape(self, *shape):
+        """
+        Returns the array with a new shape, see :meth:`numpy.ndarray.reshape`
+        """
+        if self._records is not None:
+            result = DualArray._interleaved(self._records.reshape(*shape))
+        else:
+            result = DualArray._new(self.real.reshape(*shape), self.dual.reshape(*shape))
+        if self._mask is not None:
+            result._mask = self._mask.reshape(*shape)
+        return result
+
+
+    def __len__(self):
+        return len(self.real)
+
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+    def __getitem__(self, index):
+        """
+        Indexes the array, single elements are returned as Dual numbers and anything else as a DualArray in the same
+        layout
+        """
+
+        if self._records is not None:
+            # whole elements are gathered at once rather than a plane at a time
+            records = self._records[index]
+            real, dual = records["real"], records["dual"]
+        else:
+            real = self.real[index]
+            dual = self.dual[index]
+        if np.ndim(real) == 0:
+            if np.iscomplexobj(real) or np.iscomplexobj(dual):
+                return ComplexDual(complex(real), complex(dual))
+            return get_config().Dual(float(real), float(dual))
+        result = DualArray._new(real, dual)
+        if self._records is not None:
+            result._records = records
+        if self._mask is not None:
+            result._mask = self._mask[index]
+        return result
+
+
+    def __setitem__(self, index, value):
+        """
+        Assigns dual numbers or scalars (with a zero dual part) to elements of the array
+        """
+
+        real, dual = _planes(value)
+        if real is None:
+            raise TypeError("cannot assign {} to a DualArray".format(type(value)))
+        if self._records is not None and isinstance(value, DualArray):
+            # whole elements are scattered at once rather than a plane at a time
+            self._records[index] = value.to_records()
+        else:
+            self.real[index] = real
+            self.dual[index] = 0 if dual is None else dual
+        if self._mask is None and isinstance(value, DualArray) and value._mask is not None and value._mask.any():
+            # the codes of an invalid value are kept even when this array has no invalid elements yet
+            self._mask = np.zeros(self.shape, np.uint8)
+        if self._mask is not None:
+            self._mask[index] = value.errors if isinstance(value, DualArray) else ErrorCode.OK
+
+
+    def __repr__(self):
+        return "DualArray(real={!r}, dual={!r})".format(self.real, self.dual)
+
+
+    def __str__(self):
+        return "DualArray(real = {}, dual = {})".format(self.real, self.dual)
+
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """
+        Allows numpy ufuncs such as ``np.sin`` or ``np.add`` to be applied to a DualArray, so functions written for numpy
+        arrays can be differentiated without changes
+        """
+
+        # numpy passes out as a tuple, a single DualArray is supported
+        out = kwargs.pop("out", None)
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        if out is not None:
+            if len(out) != 1 or not isinstance(out[0], DualArray):
+                return NotImplemented
+            out = out[0]
+
+        if ufunc in _UNARY_UFUNCS and len(inputs) == 1:
+            name = _UNARY_UFUNCS[ufunc]
+            if out is None:
+                return getattr(inputs[0], name)()
+            if name.startswith("__"):
+                return _into(out, getattr(inputs[0], name)())
+            return getattr(inputs[0], name)(out=out)
+
+        if ufunc in _SELECTIONS and len(inputs) == 2:
+            result = _SELECTIONS[ufunc](*inputs)
+            return result if out is None else _into(out, result)
+
+        if ufunc in _BINARY_UFUNCS and len(inputs) == 2:
+            a, b = inputs
+            # np.add(x, y, out=x) is x += y
+            if out is not None and a is out and ufunc in _IN_PLACE:
+                return getattr(out, _IN_PLACE[ufunc])(b)
+            forward, reflected = _BINARY_UFUNCS[ufunc]
+            if isinstance(a, DualArray):
+                result = getattr(a, forward)(b)
+            else:
+                result = getattr(b, reflected)(a)
+            if out is None or result is NotImplemented:
+                return result
+            return _into(out, result)
+
+        return NotImplemented
+
+
+    def __add__(self, other):
+        """
+        Adds a DualArray, Dual, array or scalar elementwise
+        """
+
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        # an unchanged dual plane is copied so the result never shares a plane with an operand, which the in place
+        # operators would otherwise write through
+        new_dual = self.dual.copy() if dual is None else self.dual + dual
+        return self._result(self.real + real, new_dual, real, dual, other)
+
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+
+    def __sub__(self, other):
+        """
+        Subtracts a DualArray, Dual, array or scalar elementwise
+        """
+
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        new_dual = self.dual.copy() if dual is None else self.dual - dual
+        return self._result(self.real - real, new_dual, real, dual, other)
+
+
+    def __rsub__(self, other):
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        new_dual = -self.dual if dual is None else dual - self.dual
+        return self._result(real - self.real, new_dual, real, dual, other)
+
+
+    def __mul__(self, other):
+        """
+        Multiplies by a DualArray, Dual, array or scalar elementwise, following
+
+        .. math::
+            (a + b\\epsilon)(c + d\\epsilon) = ac + (ad + bc)\\epsilon
+        """
+
+        if isinstance(other, DualArray):
+            result = self._batch("multiply", other)
+            if result is not None:
+                return result
+
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        if dual is None:
+            new_dual = self.dual * real
+        else:
+            new_dual = self.real * dual + self.dual * real
+        return self._result(self.real * real, new_dual, real, dual, other)
+
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+
+    @_quiet
+    def __truediv__(self, other):
+        """
+        Divides by a DualArray, Dual, array or scalar elementwise, following
+
+        .. math::
+            \\frac{a + b \\epsilon}{c + d \\epsilon} = \\frac{a}{c} + \\frac{bc - ad}{c^2} \\epsilon
+
+
+        Raises
+        ------
+        ZeroDivisionError
+            If the real part of any divisor is zero.
+        """
+
+        if isinstance(other, DualArray):
+            result = self._batch("divide", other)
+            if result is not None:
+                return result
+
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        invalid = _check_domain(np.equal(real, 0), ZeroDivisionError,
+                                "The real part of the divisor is 0, division is not defined", ErrorCode.ZERO_DIVISION)
+
+        new_real = self.real / real
+        if dual is None:
+            new_dual = self.dual / real
+        else:
+            new_dual = (self.dual * real - self.real * dual) / (real * real)
+        return self._result(new_real, new_dual, real, dual, other, invalid)
+
+
+    @_quiet
+    def __rtruediv__(self, other):
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        invalid = _check_domain(self.real == 0, ZeroDivisionError,
+                                "Division by a dual number with a zero real part is undefined.",
+                                ErrorCode.ZERO_DIVISION)
+
+        new_real = real / self.real
+        if dual is None:
+            new_dual = -real * self.dual / (self.real * self.real)
+        else:
+            new_dual = (dual * self.real - real * self.dual) / (self.real * self.real)
+        return self._result(new_real, new_dual, real, dual, other, invalid)
+
+
+    def __iadd__(self, other):
+        """
+        Adds a DualArray, Dual, array or scalar elementwise in place, writing into the planes of this array so no new
+        planes are allocated. The planes keep their precision and `other` must broadcast to the shape of this array.
+        """
+
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        np.add(self.real, real, out=self.real)
+        if dual is not None:
+            np.add(self.dual, dual, out=self.dual)
+        return _merge_masks(self, None, self, other)
+
+
+    def __isub__(self, other):
+        """
+        Subtracts a DualArray, Dual, array or scalar elementwise in place, see :meth:`__iadd__`
+        """
+
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        np.subtract(self.real, real, out=self.real)
+        if dual is not None:
+            np.subtract(self.dual, dual, out=self.dual)
+        return _merge_masks(self, None, self, other)
+
+
+    def __imul__(self, other):
+        """
+        Multiplies by a DualArray, Dual, array or scalar elementwise in place, see :meth:`__iadd__`
+        """
+
+        if isinstance(other, DualArray) and self._batch("multiply", other, out=self) is not None:
+            return self
+
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        if dual is None:
+            np.multiply(self.dual, real, out=self.dual)
+        else:
+            # ad + bc needs the original real part a, so the dual plane is updated before the real plane
+            scaled = self.real * dual
+            np.multiply(self.dual, real, out=self.dual)
+            np.add(self.dual, scaled, out=self.dual)
+        np.multiply(self.real, real, out=self.real)
+        return _merge_masks(self, None, self, other)
+
+
+    @_quiet
+    def __itruediv__(self, other):
+        """
+        Divides by a DualArray, Dual, array or scalar elementwise in place, see :meth:`__iadd__`
+
+
+        Raises
+        ------
+        ZeroDivisionError
+            If the real part of any divisor is zero.
+        """
+
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        # checked before anything is written, so this array is left unchanged when the division raises
+        invalid = _check_domain(np.equal(real, 0), ZeroDivisionError,
+                                "The real part of the divisor is 0, division is not defined", ErrorCode.ZERO_DIVISION)
+        if isinstance(other, DualArray) and self._batch("divide", other, out=self) is not None:
+            return self
+
+        # (bc - ad) / c^2 = (b - (a / c) d) / c, so the real plane is divided first and reused
+        np.divide(self.real, real, out=self.real)
+        if dual is not None:
+            np.subtract(self.dual, self.real * dual, out=self.dual)
+        np.divide(self.dual, real, out=self.dual)
+
+        if invalid is not None:
+            invalid = np.broadcast_to(invalid, self.shape)
+            self.real[invalid != 0] = np.nan
+            self.dual[invalid != 0] = np.nan
+        return _merge_masks(self, invalid, self, other)
+
+
+    def __lt__(self, other):
+        """
+        Compares the real parts elementwise, ignoring the dual parts as :meth:`Dual.__lt__ <dual_autodiff.dual.Dual.__lt__>`
+        does, and returns a boolean array which may be used with :func:`where`
+        """
+
+        return self._compare(np.less, other)
+
+
+    def __le__(self, other):
+        return self._compare(np.less_equal, other)
+
+
+    def __gt__(self, other):
+        return self._compare(np.greater, other)
+
+
+    def __ge__(self, other):
+        return self._compare(np.greater_equal, other)
+
+
+    def __eq__(self, other):
+        """
+        Compares the real parts elementwise, ignoring the dual parts like the ordering operators, and returns a boolean
+        array. Unlike :meth:`Dual.__eq__ <dual_autodiff.dual.Dual.__eq__>` no tolerance is used, as for ``np.equal``.
+        """
+
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        return np.equal(self.real, real)
+
+
+    def __ne__(self, other):
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        return np.not_equal(self.real, real)
+
+
+    # elementwise equality does not give a single truth value, so arrays are not hashable, as for numpy arrays
+    __hash__ = None
+
+
+    def _compare(self, comparison, other):
+        """
+        Applies an ordering `comparison` to the real planes
+        """
+
+        self._require_real("ordering")
+        real, dual = _planes(other)
+        if real is None or np.iscomplexobj(real):
+            return NotImplemented
+        return comparison(self.real, real)
+
+
+    def __neg__(self):
+        return _mark(DualArray._new(-self.real, -self.dual), None, self)
+
+
+    def __pos__(self):
+        return self
+
+
+    def __pow__(self, power):
+        """
+        Raises the array to a DualArray, Dual, array or scalar power elementwise, following
+
+        .. math::
+            (a+b\\epsilon)^{c+d\\epsilon} = a^{c} + a^{c-1} (ad\\ln(a) +cb)\\epsilon
+
+        The same powers are undefined as for :meth:`Dual.__pow__ <dual_autodiff.dual.Dual.__pow__>`, except that a
+        negative base may be raised to any integer valued power.
+
+
+        Raises
+        ------
+        ValueError
+            If the power is not defined for any element.
+        """
+
+        real, dual = _planes(power)
+        if real is None:
+            return NotImplemented
+        return _power(self.real, self.dual, real, dual, self, power)
+
+
+    def __rpow__(self, other):
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        return _power(real, dual, self.real, self.dual, other, self)
+
+
+    def _result(self, new_real, new_dual, other_real, other_dual, other=None, invalid=None, out=None):
+        """
+        Builds the result of a binary operation with `other`, casting each plane to the precision given by the promotion
+        rules and marking the `invalid` lanes, and copies it into `out` if given
+        """
+
+        dtype = np.result_type(self.real, other_real)
+        dual_dtype = _keep_complex(np.result_type(self.dual, other_real if other_dual is None else other_dual), new_dual)
+        result = _mark(DualArray._new(new_real, new_dual, dtype, dual_dtype), invalid, self, other)
+        return result if out is None else _into(out, result)
+
+
+    def _batch(self, name, other=None, out=None):
+        """
+        Evaluates the operation `name` with the compiled batch kernels of the backend in one call for the whole array,
+        writing straight into the planes of `out` if given. Returns None when the kernels cannot be used (see
+        :func:`_kernels`) or `other` or `out` has a different shape.
+
+        The kernels make a single pass over the planes without temporaries, so they are used for the operations where
+        that is faster than numpy. Sums and logarithms are left to numpy, which vectorises them as well.
+        """
+
+        planes = (self.real, self.dual) if other is None else (self.real, self.dual, other.real, other.dual)
+        targets = () if out is None else (out.real, out.dual)
+        kernels = _kernels(*planes, *targets)
+        if kernels is None or any(a.shape != self.shape for a in (other, out) if a is not None):
+            return None
+
+        # the kernels write the error code of invalid lanes to a uint8 buffer, which is only needed when they are marked
+        flags = None if get_domain_policy() in ("raise", "off") else np.zeros(self.size, np.uint8)
+        real, dual = getattr(kernels, name)(*(p.reshape(-1) for p in planes + targets), invalid=flags)
+        invalid = flags.reshape(self.shape) if flags is not None and flags.any() else None
+        if out is not None:
+            # the kernels have already set the invalid lanes of out to nan
+            return _merge_masks(out, invalid, self, other)
+        return _mark(DualArray._new(real.reshape(self.shape), dual.reshape(self.shape)), invalid, self, other)
+
+
+    def _unary(self, new_real, new_dual, invalid=None, out=None):
+        """
+        Builds the result of an elementary function, keeping the precision of each plane and marking the `invalid` lanes,
+        and copies it into `out` if given
+        """
+
+        result = DualArray._new(new_real, new_dual, self.real.dtype, _keep_complex(self.dual.dtype, new_dual))
+        result = _mark(result, invalid, self)
+        return result if out is None else _into(out, result)
+
+
+    def sin(self, out=None):
+        """
+        Computes the sine of each element, :math:`\\sin(a) + b \\cos(a)\\epsilon`
+        """
+
+        result = self._batch("sin", out=out)
+        if result is not None:
+            return result
+
+        return self._unary(np.sin(self.real), self.dual * np.cos(self.real), out=out)
+
+
+    def cos(self, out=None):
+        """
+        Computes the cosine of each element, :math:`\\cos(a) - b \\sin(a)\\epsilon`
+        """
+
+        result = self._batch("cos", out=out)
+        if result is not None:
+            return result
+
+        return self._unary(np.cos(self.real), -self.dual * np.sin(self.real), out=out)
+
+
+    def tan(self, out=None):
+        """
+        Computes the tangent of each element, :math:`\\tan(a) + b \\sec^{2}(a)\\epsilon`
+
+
+        Raises
+        ------
+        ZeroDivisionError
+            If the cosine of the real part of any element is zero.
+        """
+
+        # the tangent is computed once and reused for the derivative, sec^2 = 1 + tan^2 = 1 / cos^2 so the domain check is
+        # the same |cos(a)| <= 1e-8 check as the scalar class
+        new_real = np.tan(self.real)
+        sec2 = 1 + new_real * new_real
+        invalid = _check_domain(np.abs(sec2) >= 1e16, ZeroDivisionError,
+                                "tangent is non-defined when real component = pi/2 + n*pi", ErrorCode.TAN_POLE)
+        return self._unary(new_real, self.dual * sec2, invalid, out=out)
+
+
+    @_quiet
+    def sinh(self, out=None):
+        """
+        Computes the hyperbolic sine of each element, :math:`\\sinh(a) + b \\cosh(a)\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the result overflows.
+        """
+
+        with np.errstate(over="ignore"):
+            new_real = np.sinh(self.real)
+        invalid = self._check_overflow(new_real, "hyperbolic sine")
+        return self._unary(new_real, self.dual * np.cosh(self.real), invalid, out=out)
+
+
+    @_quiet
+    def cosh(self, out=None):
+        """
+        Computes the hyperbolic cosine of each element, :math:`\\cosh(a) + b \\sinh(a)\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the result overflows.
+        """
+
+        with np.errstate(over="ignore"):
+            new_real = np.cosh(self.real)
+        invalid = self._check_overflow(new_real, "hyperbolic cosine")
+        return self._unary(new_real, self.dual * np.sinh(self.real), invalid, out=out)
+
+
+    def tanh(self, out=None):
+        """
+        Computes the hyperbolic tangent of each element, :math:`\\tanh(a) + b (1 - \\tanh^{2}(a))\\epsilon`, finite for
+        every real part
+        """
+
+        result = self._batch("tanh", out=out)
+        if result is not None:
+            return result
+
+        new_real = np.tanh(self.real)
+        if self.is_complex:
+            return self._unary(new_real, self.dual * (1 - new_real * new_real), out=out)
+        return self._unary(new_real, self.dual * _sech2(self.real, new_real), out=out)
+
+
+    @_quiet
+    def sqrt(self, out=None):
+        """
+        Computes the square root of each element, :math:`\\sqrt{a} + \\frac{b}{2\\sqrt{a}} \\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of any element is not positive, or is zero for complex planes.
+        """
+
+        result = self._batch("sqrt", out=out)
+        if result is not None:
+            return result
+
+        if self.is_complex:
+            invalid = _check_domain(self.real == 0, ValueError, "Square root is undefined for a zero real part",
+                                    ErrorCode.SQRT_DOMAIN)
+        else:
+            invalid = _check_domain(self.real <= 0, ValueError,
+                                    "Square root is undefined for a non positive real part", ErrorCode.SQRT_DOMAIN)
+        new_real = np.sqrt(self.real)
+        return self._unary(new_real, self.dual / (2 * new_real), invalid, out=out)
+
+
+    @_quiet
+    def exp(self, out=None):
+        """
+        Computes the exponential of each element, :math:`e^{a} + b e^{a} \\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the result overflows.
+        """
+
+        with np.errstate(over="ignore"):
+            new_real = np.exp(self.real)
+        invalid = self._check_overflow(new_real, "exponential")
+        return self._unary(new_real, self.dual * new_real, invalid, out=out)
+
+
+    def _check_overflow(self, new_real, name):
+        """
+        Checks for real parts of a result which overflow to infinity from a finite real part, like the scalar Dual and
+        the compiled kernels, returning the lanes to mark
+        """
+
+        return _check_domain(np.isinf(new_real) & np.isfinite(self.real), ValueError,
+                             "{} overflows for a real part".format(name), ErrorCode.OVERFLOW)
+
+
+    @_quiet
+    def log(self, out=None):
+        """
+        Computes the natural logarithm of each element, :math:`\\log(a) + \\frac{b}{a}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of any element is not positive, or is zero for complex planes.
+        """
+
+        if self.is_complex:
+            invalid = _check_domain(self.real == 0, ValueError,
+                                    "Natural Logarithm is not defined for a zero real part", ErrorCode.LOG_DOMAIN)
+        else:
+            invalid = _check_domain(self.real <= 0, ValueError,
+                                    "Natural Logarithm is not defined for non-positive real parts",
+                                    ErrorCode.LOG_DOMAIN)
+        return self._unary(np.log(self.real), self.dual / self.real, invalid, out=out)
+
+
+    def sum(self, axis=None):
+        """
+        Sums the elements along `axis`, using numpy's pairwise summation in both planes
+
+
+        Parameters
+        ----------
+        axis : int or tuple of int, optional
+            The axes to sum over, defaults to every axis
+
+
+        Returns
+        -------
+        DualArray or Dual
+            The sums, a single dual number when every axis is reduced
+        """
+
+        return self._reduced(np.sum(self.real, axis=axis), np.sum(self.dual, axis=axis), axis)
+
+
+    def mean(self, axis=None):
+        """
+        Averages the elements along `axis`, see :meth:`sum`
+        """
+
+        return self._reduced(np.mean(self.real, axis=axis), np.mean(self.dual, axis=axis), axis)
+
+
+    def prod(self, axis=None):
+        """
+        Multiplies the elements along `axis`, :math:`\\prod_i a_i + (\\sum_i b_i \\prod_{j \\neq i} a_j)\\epsilon`
+
+        The products of the other real parts are formed from prefix and suffix products rather than by dividing the
+        product by each real part, so the derivative is exact when some real parts are zero.
+
+
+        Parameters
+        ----------
+        axis : int or tuple of int, optional
+            The axis or axes to multiply along, defaults to every axis
+        """
+
+        real = _last_axis(self.real, axis)
+        dual = _last_axis(self.dual, axis)
+
+        # products of the real parts strictly before and strictly after each element of the reduced axis
+        ones = np.ones(real.shape[:-1] + (1,), dtype=real.dtype)
+        before = np.cumprod(np.concatenate([ones, real[..., :-1]], axis=-1), axis=-1)
+        after = np.cumprod(np.concatenate([ones, real[..., :0:-1]], axis=-1), axis=-1)[..., ::-1]
+        return self._reduced(np.prod(real, axis=-1), np.sum(dual * before * after, axis=-1), axis)
+
+
+    def norm(self, axis=None):
+        """
+        The Euclidean norm along `axis`, :math:`\\sqrt{\\sum_i a_i^2} + \\frac{\\sum_i a_i b_i}{\\sqrt{\\sum_i a_i^2}}\\epsilon`,
+        computed with ``np.hypot`` so it does not overflow
+
+
+        Parameters
+        ----------
+        axis : int, optional
+            The axis to take the norm along, defaults to every axis
+
+
+        Raises
+        ------
+        ValueError
+            If every real part along the axis is zero, where the norm is not differentiable.
+        """
+
+        self._require_real("norm")
+        real = self.real.ravel() if axis is None else self.real
+        dual = self.dual.ravel() if axis is None else self.dual
+        reduce_axis = -1 if axis is None else axis
+
+        new_real = np.hypot.reduce(real, axis=reduce_axis)
+        invalid = _check_domain(new_real == 0, ValueError, "norm is not differentiable when every real part is 0",
+                                ErrorCode.NOT_DIFFERENTIABLE)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new_dual = np.sum(real * dual, axis=reduce_axis) / new_real
+        return self._reduced(new_real, new_dual, axis, invalid)
+
+
+    def logsumexp(self, axis=None):
+        """
+        Computes :math:`\\log\\sum_i e^{a_i}` along `axis` without overflow, the derivative is the softmax weighted sum of
+        the dual parts
+
+
+        Parameters
+        ----------
+        axis : int or tuple of int, optional
+            The axes to reduce over, defaults to every axis
+        """
+
+        self._require_real("logsumexp")
+        # shifting by the largest real part keeps every exponential in [0, 1]
+        shift = np.max(self.real, axis=axis, keepdims=True)
+        weights = np.exp(self.real - shift)
+        total = np.sum(weights, axis=axis)
+        new_dual = np.sum(weights * self.dual, axis=axis) / total
+        return self._reduced(np.squeeze(shift, axis=axis) + np.log(total), new_dual, axis)
+
+
+    def _reduced(self, new_real, new_dual, axis, invalid=None):
+        """
+        Builds the result of a reduction along `axis`, keeping the precision of each plane. A full reduction gives a
+        single dual number, and the masks of the reduced elements are combined, keeping the error code of the first
+        invalid element.
+        """
+
+        result = DualArray._new(new_real, new_dual, self.real.dtype, _keep_complex(self.dual.dtype, new_dual))
+        if self._mask is not None:
+            invalid = _either(_first_code(self._mask, axis), invalid)
+        result = _mark(result, invalid)
+        if result.ndim == 0:
+            return result[()]
+        return result
+
+
+    def _require_real(self, name):
+        """
+        Raises a TypeError for functions which are not holomorphic and so have no complex derivative
+        """
+
+        if self.is_complex:
+            raise TypeError("{} is not defined for complex dual arrays".format(name))
+
+
+    @_quiet
+    def arcsin(self, out=None):
+        """
+        Computes the inverse sine of each element, :math:`\\arcsin(a) + \\frac{b}{\\sqrt{1 - a^2}}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of any element is not strictly between -1 and 1 (or is -1 or 1 for complex planes).
+        """
+
+        invalid = self._check_unit_interval("inverse sine")
+        return self._unary(np.arcsin(self.real), self.dual * self._inverse_sqrt_one_minus_square(), invalid, out=out)
+
+
+    @_quiet
+    def arccos(self, out=None):
+        """
+        Computes the inverse cosine of each element, :math:`\\arccos(a) - \\frac{b}{\\sqrt{1 - a^2}}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of any element is not strictly between -1 and 1 (or is -1 or 1 for complex planes).
+        """
+
+        invalid = self._check_unit_interval("inverse cosine")
+        return self._unary(np.arccos(self.real), -self.dual * self._inverse_sqrt_one_minus_square(), invalid, out=out)
+
+
+    def _check_unit_interval(self, name):
+        """
+        Checks the domain shared by arcsin and arccos, returning the lanes to mark
+        """
+
+        if self.is_complex:
+            invalid = (self.real == 1) | (self.real == -1)
+        else:
+            invalid = (self.real <= -1) | (self.real >= 1)
+        return _check_domain(invalid, ValueError,
+                             "{} is only differentiable for real parts strictly between -1 and 1".format(name),
+                             ErrorCode.INVERSE_TRIG_DOMAIN)
+
+
+    def _inverse_sqrt_one_minus_square(self):
+        """
+        The factor :math:`1/\\sqrt{1 - a^2}` shared by the derivatives of arcsin and arccos, (1 - a)(1 + a) is more
+        accurate than 1 - a^2 close to the end points
+        """
+
+        return 1 / np.sqrt((1 - self.real) * (1 + self.real))
+
+
+    def arctan(self, out=None):
+        """
+        Computes the inverse tangent of each element, :math:`\\arctan(a) + \\frac{b}{1 + a^2}\\epsilon`
+        """
+
+        return self._unary(np.arctan(self.real), self.dual / (1 + self.real * self.real), out=out)
+
+
+    @_quiet
+    def arctan2(self, other, out=None):
+        """
+        Computes the quadrant aware inverse tangent of self / other elementwise, where self holds the y coordinates
+        and other the x coordinates, see :meth:`Dual.arctan2 <dual_autodiff.dual.Dual.arctan2>`
+
+
+        Raises
+        ------
+        ValueError
+            If both coordinates of any element are zero.
+        """
+
+        self._require_real("arctan2")
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+
+        r2 = self.real * self.real + real * real
+        invalid = _check_domain(r2 == 0, ValueError, "arctan2 is not defined when both real parts are 0",
+                                ErrorCode.NOT_DIFFERENTIABLE)
+        new_dual = real * self.dual if dual is None else real * self.dual - self.real * dual
+        return self._result(np.arctan2(self.real, real), new_dual / r2, real, dual, other, invalid, out)
+
+
+    def __rarctan2__(self, other):
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+        return _from_planes(real, dual).arctan2(self)
+
+
+    @_quiet
+    def hypot(self, other, out=None):
+        """
+        Computes :math:`\\sqrt{a^2 + c^2}` elementwise without intermediate overflow, see
+        :meth:`Dual.hypot <dual_autodiff.dual.Dual.hypot>`
+
+
+        Raises
+        ------
+        ValueError
+            If both real parts of any element are zero.
+        """
+
+        self._require_real("hypot")
+        real, dual = _planes(other)
+        if real is None:
+            return NotImplemented
+
+        new_real = np.hypot(self.real, real)
+        invalid = _check_domain(new_real == 0, ValueError, "hypot is not differentiable when both real parts are 0",
+                                ErrorCode.NOT_DIFFERENTIABLE)
+        new_dual = self.real * self.dual if dual is None else self.real * self.dual + real * dual
+        return self._result(new_real, new_dual / new_real, real, dual, other, invalid, out)
+
+
+    def __rhypot__(self, other):
+        return self.hypot(other)
+
+
+    def __abs__(self):
+        """
+        Computes the absolute value of each element, :math:`|a| + \\mathrm{sign}(a) b\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of any element is zero.
+        """
+
+        self._require_real("absolute value")
+        sign = np.sign(self.real)
+        invalid = _check_domain(sign == 0, ValueError, "absolute value is not differentiable for a zero real part",
+                                ErrorCode.NOT_DIFFERENTIABLE)
+        return self._unary(np.abs(self.real), self.dual * sign, invalid)
+
+
+    @_quiet
+    def cbrt(self, out=None):
+        """
+        Computes the real cube root of each element, :math:`\\sqrt[3]{a} + \\frac{b}{3\\sqrt[3]{a}^2}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of any element is zero.
+        """
+
+        self._require_real("cube root")
+        invalid = _check_domain(self.real == 0, ValueError, "cube root is not differentiable for a zero real part",
+                                ErrorCode.NOT_DIFFERENTIABLE)
+        new_real = np.cbrt(self.real)
+        return self._unary(new_real, self.dual / (3 * new_real * new_real), invalid, out=out)
+
+
+    @_quiet
+    def log1p(self, out=None):
+        """
+        Computes :math:`\\log(1 + a) + \\frac{b}{1 + a}\\epsilon` for each element, accurately for small real parts
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of any element is not greater than -1 (or is -1 for complex planes).
+        """
+
+        invalid = (self.real == -1) if self.is_complex else (self.real <= -1)
+        invalid = _check_domain(invalid, ValueError, "log1p is not defined for real parts less than or equal to -1",
+                                ErrorCode.LOG_DOMAIN)
+        return self._unary(np.log1p(self.real), self.dual / (1 + self.real), invalid, out=out)
+
+
+    @_quiet
+    def expm1(self, out=None):
+        """
+        Computes :math:`(e^{a} - 1) + b e^{a}\\epsilon` for each element, accurately for small real parts
+
+
+        Raises
+        ------
+        ValueError
+            If the result overflows.
+        """
+
+        with np.errstate(over="ignore"):
+            new_real = np.expm1(self.real)
+        invalid = self._check_overflow(new_real, "exponential")
+        return self._unary(new_real, self.dual * (new_real + 1), invalid, out=out)
+
+
+    @_quiet
+    def log10(self, out=None):
+        """
+        Computes the base 10 logarithm of each element, :math:`\\log_{10}(a) + \\frac{b}{a\\ln(10)}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of any element is not positive, or is zero for complex planes.
+        """
+
+        invalid = self._check_log_domain()
+        return self._unary(np.log10(self.real), self.dual / (self.real * np.log(10)), invalid, out=out)
+
+
+    @_quiet
+    def log2(self, out=None):
+        """
+        Computes the base 2 logarithm of each element, :math:`\\log_{2}(a) + \\frac{b}{a\\ln(2)}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of any element is not positive, or is zero for complex planes.
+        """
+
+        invalid = self._check_log_domain()
+        return self._unary(np.log2(self.real), self.dual / (self.real * np.log(2)), invalid, out=out)
+
+
+    def _check_log_domain(self):
+        """
+        Checks the domain shared by the logarithms, returning the lanes to mark
+        """
+
+        if self.is_complex:
+            return _check_domain(self.real == 0, ValueError, "Logarithm is not defined for a zero real part",
+                                 ErrorCode.LOG_DOMAIN)
+        return _check_domain(self.real <= 0, ValueError, "Logarithm is not defined for non-positive real parts",
+                             ErrorCode.LOG_DOMAIN)
+
+
+    def erf(self, out=None):
+        """
+        Computes the error function of each element, :math:`\\mathrm{erf}(a) + \\frac{2b}{\\sqrt{\\pi}} e^{-a^2}\\epsilon`
+
+        Uses :func:`scipy.special.erf` when scipy is installed and :func:`math.erf` element by element otherwise.
+        """
+
+        self._require_real("erf")
+        erf, _ = _error_functions()
+        return self._unary(erf(self.real), self.dual * self._gaussian(), out=out)
+
+
+    def erfc(self, out=None):
+        """
+        Computes the complementary error function of each element,
+        :math:`\\mathrm{erfc}(a) - \\frac{2b}{\\sqrt{\\pi}} e^{-a^2}\\epsilon`
+
+        Uses :func:`scipy.special.erfc` when scipy is installed and :func:`math.erfc` element by element otherwise.
+        """
+
+        self._require_real("erfc")
+        _, erfc = _error_functions()
+        return self._unary(erfc(self.real), -self.dual * self._gaussian(), out=out)
+
+
+    def _gaussian(self):
+        """
+        The factor :math:`\\frac{2}{\\sqrt{\\pi}} e^{-a^2}` shared by the derivatives of erf and erfc
+        """
+
+        return (2 / np.sqrt(np.pi)) * np.exp(-self.real * self.real)
+
+
+    def sigmoid(self, out=None):
+        """
+        Computes the logistic sigmoid of each element, :math:`\\sigma(a) + b\\sigma(a)(1 - \\sigma(a))\\epsilon`,
+        without overflow for any real part
+        """
+
+        self._require_real("sigmoid")
+        new_real = _sigmoid(self.real)
+        return self._unary(new_real, self.dual * new_real * (1 - new_real), out=out)
+
+
+    def softplus(self, out=None):
+        """
+        Computes :math:`\\log(1 + e^{a}) + b\\sigma(a)\\epsilon` for each element, evaluated as
+        :math:`\\max(a, 0) + \\log(1 + e^{-|a|})` so it never overflows
+        """
+
+        self._require_real("softplus")
+        new_real = np.maximum(self.real, 0) + np.log1p(np.exp(-np.abs(self.real)))
+        return self._unary(new_real, self.dual * _sigmoid(self.real), out=out)
+
+
+
+
+def _planes(value):
+    """
+    Splits an operand into its real and dual planes. The dual plane is None for operands with no dual part and both are
+    None for unsupported types.
+    """
+
+    if isinstance(value, DualArray):
+        return value.real, value.dual
+    if isinstance(value, _DUAL_TYPES + (ComplexDual,)):
+        return value.real, value.dual
+    if isinstance(value, (int, float, complex, np.number)):
+        return value, None
+    if isinstance(value, np.ndarray) and value.dtype.kind in "iufc":
+        return value, None
+    return None, None
+
+
+
+def _format_rows(template, real, dual, chunk_size=65536):
+    """
+    Yields the text of `template` formatted with the elements of the planes in C order, a chunk at a time. Each row is
+    `template` with one printf style conversion for the real part and one for the dual part, followed by a newline, and
+    a whole chunk is formatted by a single % operation rather than a call per element.
+    """
+
+    rows = np.stack([np.ravel(real), np.ravel(dual)], axis=1)
+    row = template + "\n"
+    for start in range(0, len(rows), chunk_size):
+        values = rows[start:start + chunk_size]
+        yield (row * len(values)) % tuple(values.ravel().tolist())
+
+
+
+def _write_csv(file, array, fmt, delimiter, header):
+    """
+    Writes the real and dual columns of `array` to an open text file
+    """
+
+    if header:
+        file.write("real{}dual\n".format(delimiter))
+    for text in _format_rows(fmt + delimiter + fmt, array.real, array.dual):
+        file.write(text)
+
+
+
+def _from_planes(real, dual):
+    """
+    Builds a DualArray from the planes returned by _planes, with a zero dual plane when there is none
+    """
+
+    real = np.asarray(real)
+    dual = np.zeros_like(real) if dual is None else np.broadcast_to(dual, real.shape)
+    return DualArray._new(real, dual)
+
+
+
+def where(condition, x, y):
+    """
+    Selects elements from `x` where `condition` holds and from `y` elsewhere, taking the real and dual parts of each
+    element from the same operand so that every lane carries the derivative of the branch it took
+
+    This evaluates piecewise functions in one batched pass, for example ``where(x > 0, x.sqrt(), -x)``. As with
+    ``np.where`` both branches are evaluated for every element, so a branch which is invalid for some elements should
+    be evaluated under the ``"nan"`` domain policy or on clipped inputs.
+
+
+    Parameters
+    ----------
+    condition : array_like of bool
+        Where to take elements from `x`
+    x, y : DualArray, Dual, array_like or scalar
+        The values to select from, scalars and arrays have a zero dual part
+
+
+    Returns
+    -------
+    DualArray or Dual
+        The selected values, a single dual number when every input is a scalar
+
+
+    Examples
+    --------
+    >>> x = DualArray([-2.0, 3.0], 1)
+    >>> where(x > 0, x * x, -x).dual
+    array([-1.,  6.])
+    """
+
+    condition = np.asarray(condition)
+    x_real, x_dual = _planes(x)
+    y_real, y_dual = _planes(y)
+    if x_real is None or y_real is None:
+        raise TypeError("can only select from dual numbers, arrays and scalars, not {} and {}".format(type(x), type(y)))
+
+    new_real = np.where(condition, x_real, y_real)
+    new_dual = np.where(condition, 0 if x_dual is None else x_dual, 0 if y_dual is None else y_dual)
+    dual_dtype = np.result_type(*[p for p in (x_dual, y_dual) if p is not None] or [new_real])
+    result = DualArray._new(new_real, np.broadcast_to(new_dual, new_real.shape), new_real.dtype,
+                            _keep_complex(dual_dtype, new_dual))
+
+    masks = [o._mask if isinstance(o, DualArray) else None for o in (x, y)]
+    if any(m is not None for m in masks) and get_domain_policy() == "mask":
+        x_mask, y_mask = [np.uint8(ErrorCode.OK) if m is None else m for m in masks]
+        result._mask = np.array(np.broadcast_to(np.where(condition, x_mask, y_mask), result.shape))
+
+    if result.ndim == 0:
+        return result[()]
+    return result
+
+
+
+def maximum(x, y):
+    """
+    The elementwise maximum of the real parts, each element carries the dual part of the operand it was taken from
+
+    Where the real parts are equal the element of `x` is taken, and nan real parts propagate as in ``np.maximum``.
+
+
+    Parameters
+    ----------
+    x, y : DualArray, Dual, array_like or scalar
+        The values to compare
+
+
+    Returns
+    -------
+    DualArray or Dual
+        The larger values
+    """
+
+    x_real, y_real = _real_planes(x, y)
+    return where((x_real >= y_real) | np.isnan(x_real), x, y)
+
+
+
+def minimum(x, y):
+    """
+    The elementwise minimum of the real parts, each element carries the dual part of the operand it was taken from,
+    see :func:`maximum`
+    """
+
+    x_real, y_real = _real_planes(x, y)
+    return where((x_real <= y_real) | np.isnan(x_real), x, y)
+
+
+
+def clip(x, lower=None, upper=None):
+    """
+    Limits the real parts of `x` to the interval [`lower`, `upper`]
+
+    Clipped elements take the value (and the dual part, zero for scalar bounds) of the bound, so the derivative is zero
+    outside of the interval and that of `x` inside it.
+
+
+    Parameters
+    ----------
+    x : DualArray, Dual, array_like or scalar
+        The values to clip
+    lower, upper : DualArray, Dual, array_like or scalar, optional
+        The bounds, either may be None to leave that side unbounded
+
+
+    Returns
+    -------
+    DualArray or Dual
+        The clipped values
+
+
+    Examples
+    --------
+    >>> clip(DualArray([-1.0, 0.5, 2.0], 1), 0, 1).dual
+    array([0., 1., 0.])
+    """
+
+    if lower is not None:
+        x = maximum(x, lower)
+    if upper is not None:
+        x = minimum(x, upper)
+    return x
+
+
+
+def _real_planes(x, y):
+    """
+    The real planes of two operands of an ordering, which must not be complex
+    """
+
+    x_real, _ = _planes(x)
+    y_real, _ = _planes(y)
+    if x_real is None or y_real is None:
+        raise TypeError("can only compare dual numbers, arrays and scalars, not {} and {}".format(type(x), type(y)))
+    if np.iscomplexobj(x_real) or np.iscomplexobj(y_real):
+        raise TypeError("ordering is not defined for complex values")
+    return np.asarray(x_real), np.asarray(y_real)
+
+
+
+@_quiet
+def _power(base, base_dual, power, power_dual, *operands):
+    """
+    Raises the planes of `base` to the planes of `power`, checking the same domain rules as Dual.__pow__. The masks of
+    the DualArray `operands` are carried into the result.
+    """
+
+    # follows the edge cases of the scalar implementation, a zero dual part in the power means the scalar formula applies
+    constant = np.equal(power_dual, 0) if power_dual is not None else np.True_
+    zero = np.equal(base, 0)
+    is_complex = any(np.iscomplexobj(p) for p in (base, base_dual, power, power_dual) if p is not None)
+
+    if is_complex:
+        # complex powers use the principal branch, so only a zero base is undefined
+        invalid = _check_domain(zero & constant & ((np.imag(power) != 0) | (np.real(power) < 1) |
+                                                   (np.floor(np.real(power)) != np.real(power))),
+                                ValueError, "0 can only be raised to positive integer powers", ErrorCode.ZERO_BASE)
+        invalid = _either(invalid, _check_domain(zero & ~constant, ValueError,
+                                                 "Cannot raise 0 real dual to a dual with non zero dual component",
+                                                 ErrorCode.ZERO_BASE))
+        return _mark(_power_result(base, base_dual, power, power_dual, constant), invalid, *operands)
+
+    # the checks are skipped entirely under the "off" policy
+    invalid = None
+    if get_domain_policy() != "off":
+        invalid = _check_domain(zero & constant & np.equal(power, 0), ValueError, "0^0 is not defined",
+                                ErrorCode.ZERO_TO_ZERO)
+        invalid = _either(invalid, _check_domain((base < 0) & constant & (np.floor(power) != power), ValueError,
+                                                 "cannot raise negative numbers to fractional powers",
+                                                 ErrorCode.NEGATIVE_BASE))
+        invalid = _either(invalid, _check_domain(zero & constant & np.equal(power, 1), ValueError,
+                                                 "0^0 is not defined and is present in dual component",
+                                                 ErrorCode.ZERO_TO_ZERO))
+        invalid = _either(invalid, _check_domain(zero & constant & (power < 0), ValueError,
+                                                 "cannot raise 0 to negative exponents", ErrorCode.ZERO_BASE))
+        invalid = _either(invalid, _check_domain(zero & constant & (0 < power) & (power < 1), ValueError,
+                                                 "cannot raise 0 to negative exponents, present in Dual component of result",
+                                                 ErrorCode.ZERO_BASE))
+        # a negative and a zero base are told apart in the error codes, but raise the same error as Dual
+        message = "Cannot raise negtive or 0 real dual to a dual with non zero dual component"
+        for rule, code in [(base < 0, ErrorCode.NEGATIVE_BASE), (zero, ErrorCode.ZERO_BASE)]:
+            invalid = _either(invalid, _check_domain(rule & ~constant, ValueError, message, code))
+    return _mark(_power_result(base, base_dual, power, power_dual, constant), invalid, *operands)
+
+
+
+def _power_result(base, base_dual, power, power_dual, constant):
+    """
+    Computes the planes of a power once its domain has been checked
+    """
+
+    new_real = np.power(base, power)
+    if base_dual is None:
+        new_dual = 0
+    else:
+        new_dual = power * base_dual * np.power(base, power - 1)
+    if power_dual is not None and not np.all(constant):
+        # log(base) is only needed (and only defined) where the power has a dual part
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_base = np.log(np.where(constant, 1, base))
+        new_dual = new_dual + new_real * power_dual * log_base
+
+    dtype = np.result_type(base, power)
+    dual_dtype = _keep_complex(np.result_type(*[p for p in (base_dual, power_dual) if p is not None]), new_dual)
+    new_dual = np.broadcast_to(new_dual, np.shape(new_real))
+    return DualArray._new(new_real, np.array(new_dual, dtype=dual_dtype), dtype, dual_dtype)
+
+
+
+
+def _sech2(x, t):
+    """
+    The derivative of tanh for an array `x` with t = tanh(x), 1 - t^2 where it is accurate and the equivalent
+    4e^{-2|x|} / (1 + e^{-2|x|})^2 where t has rounded towards 1, matching the scalar class
+    """
+
+    e = np.exp(-2 * np.abs(x))
+    return np.where(np.abs(x) < 1, (1 - t) * (1 + t), 4 * e / ((1 + e) * (1 + e)))
+
+
+
+def _sigmoid(x):
+    """
+    Numerically stable logistic sigmoid of an array, the exponential is only taken of non-positive numbers
+    """
+
+    e = np.exp(-np.abs(x))
+    return np.where(x >= 0, 1 / (1 + e), e / (1 + e))
+
+
+
+# erf and erfc for arrays, found on first use so that scipy is only imported when it is needed
+_ERROR_FUNCTIONS = []
+
+
+
+def _error_functions():
+    """
+    Returns vectorised erf and erfc, from scipy when it is installed and otherwise by applying the math module
+    functions element by element
+    """
+
+    if not _ERROR_FUNCTIONS:
+        try:
+            from scipy.special import erf, erfc
+        except ImportError:
+            erf = np.vectorize(math.erf, otypes=[np.float64])
+            erfc = np.vectorize(math.erfc, otypes=[np.float64])
+        _ERROR_FUNCTIONS.extend([erf, erfc])
+    return _ERROR_FUNCTIONS
+
+
+
+# numpy ufuncs which map onto DualArray methods
+_UNARY_UFUNCS = {
+    np.negative: "__neg__",
+    np.positive: "__pos__",
+    np.sin: "sin",
+    np.cos: "cos",
+    np.tan: "tan",
+    np.sinh: "sinh",
+    np.cosh: "cosh",
+    np.tanh: "tanh",
+    np.sqrt: "sqrt",
+    np.exp: "exp",
+    np.log: "log",
+    np.arcsin: "arcsin",
+    np.arccos: "arccos",
+    np.arctan: "arctan",
+    np.absolute: "__abs__",
+    np.cbrt: "cbrt",
+    np.log1p: "log1p",
+    np.expm1: "expm1",
+    np.log10: "log10",
+    np.log2: "log2",
+}
+
+# numpy ufuncs which select between their operands
+_SELECTIONS = {
+    np.maximum: maximum,
+    np.minimum: minimum,
+}
+
+# the in place operators used for binary ufuncs whose output is their first input
+_IN_PLACE = {
+    np.add: "__iadd__",
+    np.subtract: "__isub__",
+    np.multiply: "__imul__",
+    np.true_divide: "__itruediv__",
+}
+
+_BINARY_UFUNCS = {
+    np.add: ("__add__", "__radd__"),
+    np.subtract: ("__sub__", "__rsub__"),
+    np.multiply: ("__mul__", "__rmul__"),
+    np.true_divide: ("__truediv__", "__rtruediv__"),
+    np.power: ("__pow__", "__rpow__"),
+    np.arctan2: ("arctan2", "__rarctan2__"),
+    np.hypot: ("hypot", "__rhypot__"),
+    np.less: ("__lt__", "__gt__"),
+    np.less_equal: ("__le__", "__ge__"),
+    np.greater: ("__gt__", "__lt__"),
+    np.greater_equal: ("__ge__", "__le__"),
+    np.equal: ("__eq__", "__eq__"),
+    np.not_equal: ("__ne__", "__ne__"),
+}
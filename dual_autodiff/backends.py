@@ -0,0 +1,202 @@
+import functools
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+
+
+# environment variable used to override the automatic choice of backend
+ENV_VAR = "DUAL_AUTODIFF_BACKEND"
+
+# the module providing the Dual class for each backend, in order of preference (fastest first)
+_BACKENDS = {
+    "cython": "dual_autodiff_x.dual",
+    "python": "dual_autodiff.dual",
+}
+
+# the module of batch kernels, which evaluate whole buffers of dual numbers in one call, for the backends which have one
+_BATCH = {
+    "cython": "dual_autodiff_x.batch",
+}
+
+
+
+def _has_extension(package, module):
+    """
+    Checks whether the compiled extension `module` of `package` exists without importing the package, this avoids the
+    import errors (and messages) raised by a source checkout of ``dual_autodiff_x`` which has not been built
+    """
+
+    try:
+        spec = importlib.util.find_spec(package)
+    except (ImportError, ValueError):
+        return False
+    if spec is None or spec.submodule_search_locations is None:
+        return False
+
+    for location in spec.submodule_search_locations:
+        for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+            if os.path.exists(os.path.join(location, module + suffix)):
+                return True
+    return False
+
+
+
+@functools.lru_cache(maxsize=None)
+def _matches_source(module):
+    """
+    Checks the compiled Dual class in `module` was built from the current source. An extension built from an older
+    dual.pyx, such as one installed from an old wheel, lacks methods of the python class or the shared domain policy, so
+    it is not offered as a backend.
+    """
+
+    try:
+        compiled = importlib.import_module(module)
+    except ImportError:
+        return False
+    python = importlib.import_module(_BACKENDS["python"])
+    if not hasattr(compiled, "_DOMAIN_POLICY") or not hasattr(compiled, "MutableDual"):
+        return False
+    return all(hasattr(compiled.Dual, name) for name in vars(python.Dual) if not name.startswith("__"))
+
+
+
+def available_backends():
+    """
+    Returns the names of the backends which can be used in the current environment
+
+
+    Returns
+    -------
+    list of str
+        The available backends, fastest first. ``"python"`` is always available, a compiled backend only when it has been
+        built from the current source.
+
+
+    Examples
+    --------
+    >>> available_backends()
+    ['cython', 'python']
+    """
+
+    names = []
+    for name, module in _BACKENDS.items():
+        if name == "python":
+            names.append(name)
+        elif _has_extension(*module.rsplit(".", 1)) and _matches_source(module):
+            names.append(name)
+    return names
+
+
+
+def resolve_backend(name=None):
+    """
+    Resolves a requested backend name to the backend that will be used
+
+
+    Parameters
+    ----------
+    name : str, optional
+        ``"auto"``, ``"cython"`` or ``"python"``. Defaults to the value of the ``DUAL_AUTODIFF_BACKEND`` environment
+        variable, or ``"auto"`` if it is not set.
+
+
+    Returns
+    -------
+    str
+        The name of the backend
+
+
+    Raises
+    ------
+    ValueError
+        If `name` is not a known backend.
+    ImportError
+        If the requested backend is not available.
+    """
+
+    if name is None:
+        name = os.environ.get(ENV_VAR, "auto")
+    name = name.strip().lower()
+
+    if name == "auto":
+        return available_backends()[0]
+
+    if name not in _BACKENDS:
+        raise ValueError("unknown backend {}, expected one of 'auto', {}".format(
+            name, ", ".join("'{}'".format(b) for b in _BACKENDS)))
+
+    if name not in available_backends():
+        raise ImportError("the {} backend is not available, install or rebuild dual_autodiff_x to use it".format(name))
+
+    return name
+
+
+
+def load_backend(name=None):
+    """
+    Returns the Dual class implemented by a backend
+
+
+    Parameters
+    ----------
+    name : str, optional
+        The backend to load, see :func:`resolve_backend`
+
+
+    Returns
+    -------
+    type
+        The Dual class of the backend
+
+
+    Examples
+    --------
+    >>> Dual = load_backend("python")
+    >>> Dual(1, 2) * 2
+    Dual(2, 4)
+    """
+
+    module = importlib.import_module(_BACKENDS[resolve_backend(name)])
+
+    # every backend reads the domain policy from the context variable of the python backend, so setting it once
+    # applies to all of them
+    python = importlib.import_module(_BACKENDS["python"])
+    module._DOMAIN_POLICY = python._DOMAIN_POLICY
+    return module.Dual
+
+
+
+def load_batch(name=None):
+    """
+    Returns the batch kernels of a backend, functions such as ``sin(real, dual, out_real, out_dual)`` which evaluate a
+    whole buffer of dual numbers per call
+
+
+    Parameters
+    ----------
+    name : str, optional
+        The backend, see :func:`resolve_backend`
+
+
+    Returns
+    -------
+    module or None
+        The module of batch kernels, or None if the backend has none or they have not been built
+    """
+
+    module = _BATCH.get(resolve_backend(name))
+    if module is None or not _has_extension(*module.rsplit(".", 1)):
+        return None
+    # the kernels read the domain policy of their backend, which is shared with the python backend once it is loaded
+    load_backend(name)
+    return importlib.import_module(module)
+
+
+
+# the backend chosen when the package is imported, this is the one exposed as dual_autodiff.Dual
+BACKEND = resolve_backend()
+Dual = load_backend(BACKEND)
+
+# the variant of the selected Dual class which the augmented assignment operators update in place
+MutableDual = importlib.import_module(_BACKENDS[BACKEND]).MutableDual
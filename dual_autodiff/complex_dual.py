@@ -0,0 +1,518 @@
+import cmath
+import math
+
+from dual_autodiff import backends
+from dual_autodiff.dual import Dual
+from dual_autodiff.policy import get_domain_policy
+
+
+# the real dual classes which may be combined with a ComplexDual
+_DUAL_TYPES = tuple({Dual, backends.Dual})
+
+
+class ComplexDual:
+    """
+    A class used to represent a dual number with complex components, which has the form
+
+    .. math::
+        a + b \\epsilon, \\quad a, b \\in \\mathbb{C}
+
+    where :math:`\\epsilon^2 = 0`. The dual component carries the complex derivative, so holomorphic functions such as
+    polynomials, ``exp``, ``log``, ``sqrt`` and the trigonometric functions can be differentiated through complex
+    arithmetic in the same way as :class:`~dual_autodiff.dual.Dual` differentiates real functions. Functions which are
+    not holomorphic, such as the modulus or the complex conjugate, have no complex derivative, so ``abs``, ``cbrt``,
+    ``hypot``, ``arctan2``, ``erf``, ``erfc``, ``sigmoid`` and ``softplus`` are only provided for real dual numbers.
+
+    The principal branch is used for ``log``, ``sqrt`` and non-integer powers, as in :mod:`cmath`.
+
+
+    Attributes
+    -----------
+    real : complex
+        The real (non-dual) part of the dual number
+    dual : complex
+        The dual part of the dual number
+
+
+    Examples
+    --------
+    >>> z = ComplexDual(1j, 1)
+    >>> print(z * z)
+    ComplexDual(real = (-1+0j), dual = 2j)
+    """
+
+
+    def __init__(self, real, dual):
+        """
+        Initialises the ComplexDual object
+
+
+        Parameters
+        -----------
+        real : complex, float, int
+            The real (non-dual) part of the dual number
+        dual : complex, float, int
+            The dual part of the dual number
+
+        Raises
+        ------
+        TypeError
+            If the `real` or `dual` component is not a number.
+        ValueError
+            If the `real` or `dual` component is NaN or infinite, under the ``"raise"`` domain policy.
+        """
+
+        if not isinstance(real, (int, float, complex)):
+            raise TypeError("real component must be a complex, float or integer")
+        if not isinstance(dual, (int, float, complex)):
+            raise TypeError("dual component must be a complex, float or integer")
+
+        real = complex(real)
+        dual = complex(dual)
+
+        if not (cmath.isfinite(real) and cmath.isfinite(dual)) and get_domain_policy() == "raise":
+            if not cmath.isfinite(real):
+                raise ValueError("real component cannot be nan or inf")
+            raise ValueError("dual component cannot be nan or inf")
+
+        self.real = real
+        self.dual = dual
+
+
+    def __str__(self):
+        """
+        Returns the ComplexDual in string format, as ComplexDual(real = x, dual = y)
+        """
+
+        return "ComplexDual(real = {}, dual = {})".format(self.real, self.dual)
+
+
+    def __repr__(self):
+        """
+        Returns the ComplexDual as an expression which recreates it, as ComplexDual(x, y)
+        """
+
+        return "ComplexDual({!r}, {!r})".format(self.real, self.dual)
+
+
+    def __format__(self, format_spec):
+        """
+        Formats the ComplexDual like __str__, with `format_spec` applied to both (complex) components
+        """
+
+        if not format_spec:
+            return self.__str__()
+        return "ComplexDual(real = {0:{2}}, dual = {1:{2}})".format(self.real, self.dual, format_spec)
+
+
+    def __add__(self, other):
+        """
+        Adds a (complex) dual number or a scalar
+        """
+
+        other = _as_complex_dual(other)
+        if other is None:
+            return NotImplemented
+        return ComplexDual(self.real + other.real, self.dual + other.dual)
+
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+
+    def __sub__(self, other):
+        """
+        Subtracts a (complex) dual number or a scalar
+        """
+
+        other = _as_complex_dual(other)
+        if other is None:
+            return NotImplemented
+        return ComplexDual(self.real - other.real, self.dual - other.dual)
+
+
+    def __rsub__(self, other):
+        other = _as_complex_dual(other)
+        if other is None:
+            return NotImplemented
+        return other - self
+
+
+    def __mul__(self, other):
+        """
+        Multiplies by a (complex) dual number or scalar, :math:`(a + b\\epsilon)(c + d\\epsilon) = ac + (ad + bc)\\epsilon`
+        """
+
+        other = _as_complex_dual(other)
+        if other is None:
+            return NotImplemented
+        return ComplexDual(self.real * other.real, self.real * other.dual + self.dual * other.real)
+
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+
+    def __truediv__(self, other):
+        """
+        Divides by a (complex) dual number or scalar
+
+
+        Raises
+        ------
+        ZeroDivisionError
+            If the real part of the divisor is zero.
+        """
+
+        other = _as_complex_dual(other)
+        if other is None:
+            return NotImplemented
+        if other.real == 0 and get_domain_policy() != "off":
+            return _domain_error(ZeroDivisionError, "The real part of the divisor is 0, division is not defined")
+        return ComplexDual(self.real / other.real, (self.dual * other.real - self.real * other.dual) / other.real ** 2)
+
+
+    def __rtruediv__(self, other):
+        other = _as_complex_dual(other)
+        if other is None:
+            return NotImplemented
+        return other / self
+
+
+    def __neg__(self):
+        return ComplexDual(-self.real, -self.dual)
+
+
+    def __pow__(self, power):
+        """
+        Raises the dual number to a (complex) dual or scalar power
+
+        A power with no dual part uses :math:`(a+b\\epsilon)^{c} = a^{c} + c a^{c-1} b\\epsilon`, otherwise
+        :math:`(a+b\\epsilon)^{c+d\\epsilon} = a^{c} + a^{c}(d\\log(a) + \\frac{cb}{a})\\epsilon`.
+
+
+        Raises
+        ------
+        ValueError
+            If the real part of the base is zero and the power is not a positive integer.
+        """
+
+        power = _as_complex_dual(power)
+        if power is None:
+            return NotImplemented
+
+        if power.dual == 0:
+            c = power.real
+            if self.real == 0 and get_domain_policy() != "off":
+                # 0 may only be raised to positive integer powers, otherwise the derivative (or the value) is undefined
+                if c.imag != 0 or c.real < 1 or c.real != int(c.real):
+                    return _domain_error(ValueError, "0 can only be raised to positive integer powers")
+            return ComplexDual(self.real ** c, c * self.dual * self.real ** (c - 1))
+
+        if self.real == 0 and get_domain_policy() != "off":
+            return _domain_error(ValueError, "Cannot raise 0 real dual to a dual with non zero dual component")
+        new_real = self.real ** power.real
+        return ComplexDual(new_real, new_real * (power.dual * cmath.log(self.real) + power.real * self.dual / self.real))
+
+
+    def __rpow__(self, other):
+        other = _as_complex_dual(other)
+        if other is None:
+            return NotImplemented
+        return other ** self
+
+
+    def __eq__(self, other):
+        """
+        Two complex dual numbers are equal if both their real and dual parts are close, with the same tolerance as Dual.
+        Other types are left to their reflected method and otherwise compare unequal.
+        """
+
+        converted = _as_complex_dual(other)
+        if converted is None:
+            return NotImplemented
+        other = converted
+        return cmath.isclose(self.real, other.real, rel_tol=1e-12) and cmath.isclose(self.dual, other.dual, rel_tol=1e-12)
+
+
+    def conjugate(self):
+        """
+        Returns the complex conjugate of both components, :math:`\\bar{a} + \\bar{b}\\epsilon`
+        """
+
+        return ComplexDual(self.real.conjugate(), self.dual.conjugate())
+
+
+    def sin(self):
+        """
+        Computes the sine, :math:`\\sin(a) + b \\cos(a)\\epsilon`
+        """
+
+        return ComplexDual(cmath.sin(self.real), self.dual * cmath.cos(self.real))
+
+
+    def cos(self):
+        """
+        Computes the cosine, :math:`\\cos(a) - b \\sin(a)\\epsilon`
+        """
+
+        return ComplexDual(cmath.cos(self.real), -self.dual * cmath.sin(self.real))
+
+
+    def tan(self):
+        """
+        Computes the tangent, :math:`\\tan(a) + b \\sec^{2}(a)\\epsilon`
+
+
+        Raises
+        ------
+        ZeroDivisionError
+            If the cosine of the real part is zero.
+        """
+
+        # sec^2 = 1 + tan^2 = 1 / cos^2, so the check is the same as |cos(a)| <= 1e-8
+        new_real = cmath.tan(self.real)
+        sec2 = 1 + new_real * new_real
+        if abs(sec2) >= 1e16 and get_domain_policy() != "off":
+            return _domain_error(ZeroDivisionError, "tangent is non-defined when real component = pi/2 + n*pi")
+        return ComplexDual(new_real, self.dual * sec2)
+
+
+    def sinh(self):
+        """
+        Computes the hyperbolic sine, :math:`\\sinh(a) + b \\cosh(a)\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the result overflows.
+        """
+
+        # cmath raises OverflowError for a large real part, which is reported as for Dual
+        try:
+            return ComplexDual(cmath.sinh(self.real), self.dual * cmath.cosh(self.real))
+        except OverflowError:
+            return _domain_error(ValueError, "hyperbolic sine overflows for real component {}".format(self.real))
+
+
+    def cosh(self):
+        """
+        Computes the hyperbolic cosine, :math:`\\cosh(a) + b \\sinh(a)\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the result overflows.
+        """
+
+        try:
+            return ComplexDual(cmath.cosh(self.real), self.dual * cmath.sinh(self.real))
+        except OverflowError:
+            return _domain_error(ValueError, "hyperbolic cosine overflows for real component {}".format(self.real))
+
+
+    def tanh(self):
+        """
+        Computes the hyperbolic tangent, :math:`\\tanh(a) + b (1 - \\tanh^{2}(a))\\epsilon`
+        """
+
+        new_real = cmath.tanh(self.real)
+        return ComplexDual(new_real, self.dual * (1 - new_real * new_real))
+
+
+    def sqrt(self):
+        """
+        Computes the principal square root, :math:`\\sqrt{a} + \\frac{b}{2\\sqrt{a}}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part is zero, where the derivative is undefined.
+        """
+
+        if self.real == 0 and get_domain_policy() != "off":
+            return _domain_error(ValueError, "Square root is undefined for a zero real part")
+        new_real = cmath.sqrt(self.real)
+        return ComplexDual(new_real, self.dual / (2 * new_real))
+
+
+    def exp(self):
+        """
+        Computes the exponential, :math:`e^{a} + b e^{a}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the result overflows.
+        """
+
+        try:
+            new_real = cmath.exp(self.real)
+        except OverflowError:
+            return _domain_error(ValueError, "exponential overflows for real component {}".format(self.real))
+        return ComplexDual(new_real, self.dual * new_real)
+
+
+    def log(self):
+        """
+        Computes the principal natural logarithm, :math:`\\log(a) + \\frac{b}{a}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part is zero.
+        """
+
+        if self.real == 0 and get_domain_policy() != "off":
+            return _domain_error(ValueError, "Natural Logarithm is not defined for a zero real part")
+        return ComplexDual(cmath.log(self.real), self.dual / self.real)
+
+
+    def log10(self):
+        """
+        Computes the principal base 10 logarithm, :math:`\\log_{10}(a) + \\frac{b}{a\\ln(10)}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part is zero.
+        """
+
+        if self.real == 0 and get_domain_policy() != "off":
+            return _domain_error(ValueError, "Logarithm is not defined for a zero real part")
+        return ComplexDual(cmath.log10(self.real), self.dual / (self.real * math.log(10)))
+
+
+    def log2(self):
+        """
+        Computes the principal base 2 logarithm, :math:`\\log_{2}(a) + \\frac{b}{a\\ln(2)}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part is zero.
+        """
+
+        if self.real == 0 and get_domain_policy() != "off":
+            return _domain_error(ValueError, "Logarithm is not defined for a zero real part")
+        return ComplexDual(cmath.log(self.real) / math.log(2), self.dual / (self.real * math.log(2)))
+
+
+    def log1p(self):
+        """
+        Computes :math:`\\log(1 + a) + \\frac{b}{1 + a}\\epsilon`, accurately for small real parts
+
+
+        Raises
+        ------
+        ValueError
+            If the real part is -1.
+        """
+
+        if self.real == -1 and get_domain_policy() != "off":
+            return _domain_error(ValueError, "log1p is not defined for a real part of -1")
+        u = 1 + self.real
+        # log(u) a / (u - 1) cancels the rounding error of 1 + a, as cmath has no log1p
+        new_real = self.real if u == 1 else cmath.log(u) * self.real / (u - 1)
+        return ComplexDual(new_real, self.dual / u)
+
+
+    def expm1(self):
+        """
+        Computes :math:`(e^{a} - 1) + b e^{a}\\epsilon`, accurately for small real parts
+
+
+        Raises
+        ------
+        ValueError
+            If the result overflows.
+        """
+
+        x, y = self.real.real, self.real.imag
+        # e^(x + iy) - 1 = (e^x - 1) cos(y) - 2 sin^2(y / 2) + i e^x sin(y), which does not cancel for small x and y
+        try:
+            new_real = complex(math.expm1(x) * math.cos(y) - 2 * math.sin(y / 2) ** 2, math.exp(x) * math.sin(y))
+        except OverflowError:
+            return _domain_error(ValueError, "exponential overflows for real component {}".format(self.real))
+        return ComplexDual(new_real, self.dual * (new_real + 1))
+
+
+    def arcsin(self):
+        """
+        Computes the principal inverse sine, :math:`\\arcsin(a) + \\frac{b}{\\sqrt{1 - a^2}}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part is -1 or 1, the branch points.
+        """
+
+        if (self.real == 1 or self.real == -1) and get_domain_policy() != "off":
+            return _domain_error(ValueError, "inverse sine is not differentiable for real parts of -1 and 1")
+        return ComplexDual(cmath.asin(self.real), self.dual / cmath.sqrt((1 - self.real) * (1 + self.real)))
+
+
+    def arccos(self):
+        """
+        Computes the principal inverse cosine, :math:`\\arccos(a) - \\frac{b}{\\sqrt{1 - a^2}}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part is -1 or 1, the branch points.
+        """
+
+        if (self.real == 1 or self.real == -1) and get_domain_policy() != "off":
+            return _domain_error(ValueError, "inverse cosine is not differentiable for real parts of -1 and 1")
+        return ComplexDual(cmath.acos(self.real), -self.dual / cmath.sqrt((1 - self.real) * (1 + self.real)))
+
+
+    def arctan(self):
+        """
+        Computes the principal inverse tangent, :math:`\\arctan(a) + \\frac{b}{1 + a^2}\\epsilon`
+
+
+        Raises
+        ------
+        ValueError
+            If the real part is i or -i, the poles.
+        """
+
+        if (self.real == 1j or self.real == -1j) and get_domain_policy() != "off":
+            return _domain_error(ValueError, "inverse tangent is not defined for real parts of i and -i")
+        return ComplexDual(cmath.atan(self.real), self.dual / (1 + self.real * self.real))
+
+
+
+def _domain_error(error, message):
+    """
+    Handles an operation evaluated outside of its domain according to the domain policy, as for Dual
+    """
+
+    if get_domain_policy() == "raise":
+        raise error(message)
+    return ComplexDual(complex("nan+nanj"), complex("nan+nanj"))
+
+
+
+def _as_complex_dual(value):
+    """
+    Converts an operand to a ComplexDual, returning None for unsupported types
+    """
+
+    if isinstance(value, ComplexDual):
+        return value
+    if isinstance(value, (int, float, complex)):
+        return ComplexDual(value, 0)
+    if isinstance(value, _DUAL_TYPES):
+        return ComplexDual(value.real, value.dual)
+    return None
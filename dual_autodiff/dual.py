@@ -1,7 +1,14 @@
-import numpy as np
+import contextvars
 import math
 
 
+# how operations respond to points outside their domain, one of "raise", "nan", "mask" or "off". It is set through
+# dual_autodiff.settings, and as a context variable each thread and asyncio task may use its own policy. The variable is
+# only read once an operation has found an invalid point, so valid inputs never pay for the lookup. When both backends
+# are loaded dual_autodiff.backends makes them share the variable of the python backend.
+_DOMAIN_POLICY = contextvars.ContextVar("domain_policy", default="raise")
+
+
 class Dual:
     """
     A class used to represent a Dual number, which has the form 
@@ -67,7 +74,7 @@ class Dual:
         -------- 
         >>> d = Dual(2.0, 1.0)
         >>> print(d)
-        Dual(2.0, 1.0)
+        Dual(real = 2.0, dual = 1.0)
         """
 
         # checks that the inputs in intialisation are valid 
@@ -77,18 +84,22 @@ class Dual:
             raise TypeError("dual component must be either a float or an integer")
         
 
-        # Check that real and dual components are not nan, as these are technically floats
-        if np.isnan(real):
-            raise ValueError("real component cannot be nan")
-        if np.isnan(dual):
-            raise ValueError("dual component cannot be nan")
-        
-        # check that real and dual components are not infinite, this is to ensure no ambiguity as for some functions infinity has
-        # undefined action
-        if np.isinf(real):
-            raise ValueError("real component cannot be inf")
-        if np.isinf(dual):
-            raise ValueError("dual component cannot be inf")
+        # non finite components are only accepted when the domain policy marks invalid points with nan instead of raising,
+        # checking finiteness first keeps the common case to two calls
+        if not (math.isfinite(real) and math.isfinite(dual)) and _DOMAIN_POLICY.get() == "raise":
+
+            # Check that real and dual components are not nan, as these are technically floats
+            if math.isnan(real):
+                raise ValueError("real component cannot be nan")
+            if math.isnan(dual):
+                raise ValueError("dual component cannot be nan")
+
+            # check that real and dual components are not infinite, this is to ensure no ambiguity as for some functions
+            # infinity has undefined action
+            if math.isinf(real):
+                raise ValueError("real component cannot be inf")
+            if math.isinf(dual):
+                raise ValueError("dual component cannot be inf")
 
 
         self.real = real
@@ -118,7 +129,57 @@ class Dual:
 
     
         return "Dual(real = {}, dual = {})".format(self.real, self.dual)
-    
+
+
+    def __repr__(self):
+        """
+        Returns the Dual object as an expression which recreates it, so containers of dual numbers print their values
+
+
+        Returns
+        --------
+        Str
+            The class name and the representations of the components, as Dual(x, y)
+
+
+        Examples
+        --------
+        >>> [Dual(2, 3), Dual(0.5, -1)]
+        [Dual(2, 3), Dual(0.5, -1)]
+        """
+
+        return "{}({!r}, {!r})".format(type(self).__name__, self.real, self.dual)
+
+
+    def __format__(self, format_spec):
+        """
+        Formats the Dual object like __str__, with `format_spec` applied to both components, so dual numbers can be used
+        in f-strings and str.format with float format specifications
+
+
+        Parameters
+        ----------
+        format_spec : str
+            A float format specification such as ``".3f"`` or ``"10.4e"``, an empty specification gives the same string
+            as __str__
+
+
+        Returns
+        --------
+        Str
+            The formatted dual number
+
+
+        Examples
+        --------
+        >>> "{:.3f}".format(Dual(2, 1 / 3))
+        'Dual(real = 2.000, dual = 0.333)'
+        """
+
+        if not format_spec:
+            return self.__str__()
+        return "Dual(real = {0:{2}}, dual = {1:{2}})".format(self.real, self.dual, format_spec)
+
 
     def __add__(self, other):
         """
@@ -168,8 +229,10 @@ class Dual:
             new_real = self.real + other
             return(Dual(new_real, self.dual))
         
+        # other types such as DualArray and ComplexDual are left to their reflected method, and Python raises a
+        # TypeError if there is none
         else:
-            raise TypeError("Unsupported type for addition {}".format(type(other)))
+            return NotImplemented
         
 
 
@@ -209,7 +272,7 @@ class Dual:
             return Dual(other + self.real, self.dual)
 
         else:
-            raise TypeError("Unsupported type for addition {}".format(type(other)))
+            return NotImplemented
 
 
     
@@ -260,7 +323,7 @@ class Dual:
             return Dual(new_real, self.dual)
         
         else:
-            raise TypeError("Unsupported type for subtraction {}".format(type(other)))
+            return NotImplemented
         
 
     def __rsub__(self, other):
@@ -298,7 +361,7 @@ class Dual:
             return Dual(other-self.real, -self.dual)
 
         else:
-            raise TypeError("Unsupported type for subtraction {}".format(type(other)))
+            return NotImplemented
     
 
     def __mul__(self, other):
@@ -350,7 +413,7 @@ class Dual:
             return Dual(self.real*other, self.dual*other)
         
         else:
-            raise TypeError("Unsupported type for multiplication {}".format(type(other)))
+            return NotImplemented
         
 
     def __rmul__(self,other):
@@ -393,7 +456,7 @@ class Dual:
             return(Dual(self.real*other, self.dual*other))
                    
         else:
-            raise TypeError("Unsupported type for multiplication {}".format(type(other)))
+            return NotImplemented
                    
 
     
@@ -446,8 +509,8 @@ class Dual:
         if isinstance(other, Dual):
 
             #checks if the real component of divisor is zero.
-            if other.real ==0:
-                raise ZeroDivisionError("The real part of the divisor is 0, division is not defined")
+            if other.real ==0 and _DOMAIN_POLICY.get() != "off":
+                return _domain_error(ZeroDivisionError, "The real part of the divisor is 0, division is not defined")
 
             new_real = self.real/other.real
             new_dual = ((self.dual * other.real - self.real*other.dual)/other.real**2)
@@ -455,13 +518,13 @@ class Dual:
 
         # checks if the division is a scalar
         elif isinstance(other, (int, float)):
-            if other==0:
-                 raise ZeroDivisionError("Division by 0 is not defined")
+            if other==0 and _DOMAIN_POLICY.get() != "off":
+                return _domain_error(ZeroDivisionError, "Division by 0 is not defined")
 
             return Dual(self.real / other, self.dual / other)
         
         else:
-            raise TypeError("Unsupported type for division {}".format(type(other)))
+            return NotImplemented
 
 
     def __rtruediv__(self,other):
@@ -503,8 +566,8 @@ class Dual:
         """
 
         # checks if real part of dual in denominator is zero, if so then the division is not defined
-        if self.real == 0:
-            raise ZeroDivisionError("Division by a dual number with a zero real part is undefined.")
+        if self.real == 0 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ZeroDivisionError, "Division by a dual number with a zero real part is undefined.")
 
         # checks if the numerator is a scaler value such that divison is defined
         elif isinstance(other, (int, float)):
@@ -513,7 +576,7 @@ class Dual:
             return (Dual(new_real, new_dual))
         
         else:
-            raise TypeError("Unsupported type for division {}".format(type(other)))
+            return NotImplemented
 
 
 
@@ -578,9 +641,9 @@ class Dual:
         """
 
 
-        #checks our power is a dual, int or float
+        # other types are left to their reflected operator, and Python raises a TypeError if there is none
         if not isinstance(power, (Dual, int, float)):
-            raise TypeError("can only raise Dual to Dual, int or float")
+            return NotImplemented
 
         # if our power is a scalar we convert it to a dual object, with no dual component
         if isinstance(power, (int,float)):
@@ -598,27 +661,30 @@ class Dual:
 
             # lets consider some edge cases
             # there is a more compact way to write these edge cases, however I believe for better readibility its easier if i break
-            # them down as to be more explicit
+            # them down as to be more explicit. Every edge case has a non positive base, so a positive base only needs the
+            # one comparison before using the general form, and the "off" domain policy skips them all
 
-            # 1) when real base is 0 raised to 0, we get a 0^0 error
-            if self.real == 0 and power.real ==0:
-                raise ValueError("0^0 is not defined")
-            
-            # 2) if a<0 and our power is fraction we get an error
-            if self.real<0 and type(power.real) is not int:
-                raise ValueError("cannot raise negative numbers to fractional powers")
-            
-            # 3) if real base is 0 and scaler power is 1, we end up wuth 0^0 in dual component 
-            if self.real==0 and power.real ==1:
-                raise ValueError("0^0 is not defined and is present in dual component")
-            
-            # 4) if base is 0 and power is negative we get an error in the dual 
-            if self.real ==0 and power.real<0:
-                raise ValueError("cannot raise 0 to negative exponents")
+            if self.real <= 0 and _DOMAIN_POLICY.get() != "off":
+
+                # 1) when real base is 0 raised to 0, we get a 0^0 error
+                if self.real == 0 and power.real ==0:
+                    return _domain_error(ValueError, "0^0 is not defined")
+
+                # 2) if a<0 and our power is fraction we get an error
+                if self.real<0 and type(power.real) is not int:
+                    return _domain_error(ValueError, "cannot raise negative numbers to fractional powers")
 
-            # 5) if base is 0 and power is between 0 and 1 then in our dual part we end up raisng to to a fractional power
-            if self.real ==0 and 0<power.real<1:
-                raise ValueError("cannot raise 0 to negative exponents, present in Dual component of result") 
+                # 3) if real base is 0 and scaler power is 1, we end up wuth 0^0 in dual component
+                if self.real==0 and power.real ==1:
+                    return _domain_error(ValueError, "0^0 is not defined and is present in dual component")
+
+                # 4) if base is 0 and power is negative we get an error in the dual
+                if self.real ==0 and power.real<0:
+                    return _domain_error(ValueError, "cannot raise 0 to negative exponents")
+
+                # 5) if base is 0 and power is between 0 and 1 then in our dual part we end up raisng to to a fractional power
+                if self.real ==0 and 0<power.real<1:
+                    return _domain_error(ValueError, "cannot raise 0 to negative exponents, present in Dual component of result")
             
             # if no edge cases then may use general form 
             new_real = self.real ** power.real
@@ -632,13 +698,13 @@ class Dual:
             # lets handle some edge cases
 
             #1) if my real base is negative or zero and i have a dual component (handled by the above if) then i have a negative log or zero log
-            if self.real<=0:
-                raise ValueError("Cannot raise negtive or 0 real dual to a dual with non zero dual component")
+            if self.real<=0 and _DOMAIN_POLICY.get() != "off":
+                return _domain_error(ValueError, "Cannot raise negtive or 0 real dual to a dual with non zero dual component")
             
 
             # edge cases handled use general formuala 
             new_real = self.real ** power.real
-            new_dual = (self.real ** power.real) * (power.dual * np.log(self.real) + (power.real * self.dual) / self.real)
+            new_dual = (self.real ** power.real) * (power.dual * math.log(self.real) + (power.real * self.dual) / self.real)
 
             return Dual(new_real, new_dual)
         
@@ -679,6 +745,8 @@ class Dual:
 
         # to ensure correctness and consistancy with other method, i may turn our scalar base into a dual number with a zero dual
         #componet
+        if not isinstance(other, (int, float)):
+            return NotImplemented
         base = Dual(other, 0)
 
         return base**self
@@ -702,12 +770,8 @@ class Dual:
         Returns
         -------
         Bool
-            whether the 2 objects are equal
-
-        Raises
-        ------
-        TypeError
-            If comparing to a non int, float or Dual type
+            whether the 2 objects are equal, other types are left to their reflected method and otherwise compare
+            unequal
 
         Notes
         -----
@@ -719,11 +783,11 @@ class Dual:
         >>> d1 = Dual(3.0, 0.0)
         >>> d2 = Dual(3.0, 2)
         >>> d1 == d2
-        False 
+        False
 
         >>> d3 = Dual(3.0, 0.0)
         >>> d3 == 3.0
-        True  
+        True
         
         """
         
@@ -735,8 +799,9 @@ class Dual:
         # and thus succumb to floating point precision, the equality checks if the 2 numbers are close with some tolerence
         if isinstance(other, Dual):
             return math.isclose(self.real, other.real, rel_tol = 1e-12) and math.isclose(self.dual, other.dual, rel_tol = 1e-12)
+        # as for the arithmetic operators, Python then tries the reflected method and falls back to identity
         else:
-            raise TypeError("invalid object for comparison {}".format(type(other)))
+            return NotImplemented
         
 
         
@@ -757,13 +822,7 @@ class Dual:
         Returns
         -------
         bool
-            whether the 2 objects are equal
-
-
-        Raises
-        ------
-        TypeError
-            If comparing to a non int, float or Dual type
+            whether the 2 objects are equal, other types are left to Python and compare unequal
 
         Notes
         -----
@@ -776,7 +835,7 @@ class Dual:
         >>> d1 = Dual(3.0, 0.0)
         >>> x = 3
         >>> x == d1
-        True  
+        True
         
         """
 
@@ -785,7 +844,86 @@ class Dual:
             other = Dual(other, 0)
             return other == self
         else:
-            raise TypeError("invalid object for comparison {}".format(type(other)))
+            return NotImplemented
+
+
+
+    def __lt__(self, other):
+        """
+        Method for ordering dual numbers, a dual number is less than another if its real part is smaller
+
+        Ordering only looks at the real parts (the dual parts are ignored), so a branch such as ``if x > 0`` takes the
+        same path as the undifferentiated code and the derivative returned is the derivative of the branch taken.
+        Unlike ``==`` no tolerance is used, as a branch must be decided exactly.
+
+
+        Parameters
+        ----------
+        other : int or float or dual
+            The object to be compared to
+
+        Returns
+        -------
+        bool
+            whether the real part of self is less than the real part of other
+
+        Raises
+        ------
+        TypeError
+            If comparing to a non int, float or Dual type
+
+
+        Examples
+        --------
+        >>> Dual(1, 5) < Dual(2, -1)
+        True
+
+        >>> x = Dual(-2, 1)
+        >>> y = x if x > 0 else -x
+        >>> print(y)
+        Dual(real = 2, dual = -1)
+        """
+
+        other = _real_part(other)
+        if other is None:
+            return NotImplemented
+        return self.real < other
+
+
+
+    def __le__(self, other):
+        """
+        Whether the real part of self is less than or equal to the real part of other, see :meth:`__lt__`
+        """
+
+        other = _real_part(other)
+        if other is None:
+            return NotImplemented
+        return self.real <= other
+
+
+
+    def __gt__(self, other):
+        """
+        Whether the real part of self is greater than the real part of other, see :meth:`__lt__`
+        """
+
+        other = _real_part(other)
+        if other is None:
+            return NotImplemented
+        return self.real > other
+
+
+
+    def __ge__(self, other):
+        """
+        Whether the real part of self is greater than or equal to the real part of other, see :meth:`__lt__`
+        """
+
+        other = _real_part(other)
+        if other is None:
+            return NotImplemented
+        return self.real >= other
 
 
     def sin(self):
@@ -805,14 +943,14 @@ class Dual:
 
         Examples
         --------
-        >>> d = Dual(np.pi, 2)
+        >>> d = Dual(math.pi, 2)
         >>> d.sin()
-        Dual(0, -2)
+        Dual(1.2246467991473532e-16, -2.0)
             
         """
 
-        new_real = np.sin(self.real) 
-        new_dual = self.dual * np.cos(self.real)
+        new_real = math.sin(self.real) 
+        new_dual = self.dual * math.cos(self.real)
 
         return Dual(new_real, new_dual)
     
@@ -833,14 +971,14 @@ class Dual:
 
         Examples
         --------
-        >>> d = Dual(np.pi, 1)
+        >>> d = Dual(math.pi, 1)
         >>> d.cos()
-        Dual(-1, 0)
+        Dual(-1.0, -1.2246467991473532e-16)
             
         """
 
-        new_real = np.cos(self.real) 
-        new_dual = -self.dual * np.sin(self.real)
+        new_real = math.cos(self.real) 
+        new_dual = -self.dual * math.sin(self.real)
 
         return Dual(new_real, new_dual)
     
@@ -877,18 +1015,22 @@ class Dual:
 
         Examples
         --------
-        >>> d = Dual(np.pi / 4, 2)
+        >>> d = Dual(math.pi / 4, 2)
         >>> d.tan()
-        Dual(1.0, 4.0)
+        Dual(0.9999999999999999, 3.9999999999999996)
         
         """
 
-        # Use np.isclose to check if our cos of real part is zero due to floating point precision
-        if np.isclose(np.cos(self.real), 0):
-            raise ZeroDivisionError("tangent is non-defined when real component = pi/2 + n*pi")
+        # the tangent is computed once and reused for the derivative, sec^2 = 1 + tan^2
+        new_real = math.tan(self.real)
+        sec2 = 1 + new_real * new_real
 
-        else:
-            return self.sin()/self.cos()
+        # sec^2 = 1/cos^2, so this is the same as checking |cos(a)| <= 1e-8 (the tolerance used by np.isclose) without
+        # a second trigonometric call
+        if sec2 >= 1e16 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ZeroDivisionError, "tangent is non-defined when real component = pi/2 + n*pi")
+
+        return Dual(new_real, self.dual * sec2)
     
 
     def sinh(self):
@@ -914,8 +1056,12 @@ class Dual:
 
         """
 
-        new_real = np.sinh(self.real)
-        new_dual = self.dual * np.cosh(self.real)
+        # math raises OverflowError where numpy would return inf, both are reported as a ValueError like an infinite component
+        try:
+            new_real = math.sinh(self.real)
+            new_dual = self.dual * math.cosh(self.real)
+        except OverflowError:
+            return _domain_error(ValueError, "hyperbolic sine overflows for real component {}".format(self.real))
 
         return Dual(new_real, new_dual)
     
@@ -936,12 +1082,15 @@ class Dual:
         
             
         >>> d = Dual(0.0, 1.0)
-        >>> result = d.cosh()
+        >>> d.cosh()
         Dual(1.0, 0.0)
         """
 
-        new_real = np.cosh(self.real)
-        new_dual = self.dual * np.sinh(self.real)
+        try:
+            new_real = math.cosh(self.real)
+            new_dual = self.dual * math.sinh(self.real)
+        except OverflowError:
+            return _domain_error(ValueError, "hyperbolic cosine overflows for real component {}".format(self.real))
 
         return Dual(new_real, new_dual)
     
@@ -957,7 +1106,10 @@ class Dual:
         or also as 
             
         .. math::
-            \\tan(a + b\epsilon) = \\tan(x) +b sech^{2}\epsilon
+            \\tanh(a + b\epsilon) = \\tanh(a) + b (1 - \\tanh^{2}(a))\epsilon
+
+        The result is finite for every real part, unlike the quotient of sinh and cosh which overflows for
+        :math:`|a| > 710`.
 
 
         Returns
@@ -966,11 +1118,12 @@ class Dual:
             The hyperbolic tangent of the dual number.
 
         >>> d = Dual(0.0, 1.0)
-        >>> result = d.tanh()
+        >>> d.tanh()
         Dual(0.0, 1.0)
         """
-    
-        return self.sinh()/self.cosh()
+
+        new_real = math.tanh(self.real)
+        return Dual(new_real, self.dual * _sech2(self.real, new_real))
     
 
     def sqrt(self):
@@ -1001,14 +1154,14 @@ class Dual:
         Dual(2.0, 0.5)
         """
         # checks if real is less than 0 in which case the square root is not defined
-        if self.real <=0:
-            raise ValueError("Square root is undefined for a non positive real part")
+        if self.real <=0 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "Square root is undefined for a non positive real part")
             
         
         #calculates the real and dual part of the squre root
         else:
-            new_real = np.sqrt(self.real)
-            new_dual = self.dual/(2*np.sqrt(self.real))
+            new_real = math.sqrt(self.real)
+            new_dual = self.dual/(2*math.sqrt(self.real))
             return Dual(new_real, new_dual)
 
 
@@ -1033,8 +1186,11 @@ class Dual:
         Dual(1.0, 3.0)
         """
 
-        new_real = np.exp(self.real)
-        new_dual = self.dual * np.exp(self.real)
+        try:
+            new_real = math.exp(self.real)
+        except OverflowError:
+            return _domain_error(ValueError, "exponential overflows for real component {}".format(self.real))
+        new_dual = self.dual * new_real
 
         return Dual(new_real, new_dual)
 
@@ -1068,10 +1224,10 @@ class Dual:
         """
         
         #checks real part, if less than 0 then logarithm undefined
-        if self.real<= 0:
-            raise ValueError("Natural Logarithm is not defined for non-positive real parts")
+        if self.real<= 0 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "Natural Logarithm is not defined for non-positive real parts")
         
-        new_real = np.log(self.real)
+        new_real = math.log(self.real)
         new_dual = self.dual/self.real
 
         return Dual(new_real, new_dual)
@@ -1079,3 +1235,658 @@ class Dual:
 
 
 
+
+
+    def arcsin(self):
+        """
+        Computes the inverse sine of a dual number.
+
+        .. math::
+            \\arcsin(a + b\\epsilon) = \\arcsin(a) + \\frac{b}{\\sqrt{1 - a^2}}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The inverse sine of the dual number.
+
+        Raises
+        ------
+        ValueError
+            If the real part is not strictly between -1 and 1, where the derivative is undefined.
+
+        Examples
+        --------
+        >>> Dual(0, 2).arcsin()
+        Dual(0.0, 2.0)
+        """
+
+        if not -1 < self.real < 1 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "inverse sine is only differentiable for real parts strictly between -1 and 1")
+
+        # (1 - a)(1 + a) is more accurate than 1 - a^2 close to the end points
+        return Dual(math.asin(self.real), self.dual / math.sqrt((1 - self.real) * (1 + self.real)))
+
+
+    def arccos(self):
+        """
+        Computes the inverse cosine of a dual number.
+
+        .. math::
+            \\arccos(a + b\\epsilon) = \\arccos(a) - \\frac{b}{\\sqrt{1 - a^2}}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The inverse cosine of the dual number.
+
+        Raises
+        ------
+        ValueError
+            If the real part is not strictly between -1 and 1, where the derivative is undefined.
+
+        Examples
+        --------
+        >>> Dual(0, 2).arccos()
+        Dual(1.5707963267948966, -2.0)
+        """
+
+        if not -1 < self.real < 1 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "inverse cosine is only differentiable for real parts strictly between -1 and 1")
+
+        return Dual(math.acos(self.real), -self.dual / math.sqrt((1 - self.real) * (1 + self.real)))
+
+
+    def arctan(self):
+        """
+        Computes the inverse tangent of a dual number.
+
+        .. math::
+            \\arctan(a + b\\epsilon) = \\arctan(a) + \\frac{b}{1 + a^2}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The inverse tangent of the dual number.
+
+        Examples
+        --------
+        >>> Dual(1, 2).arctan()
+        Dual(0.7853981633974483, 1.0)
+        """
+
+        return Dual(math.atan(self.real), self.dual / (1 + self.real * self.real))
+
+
+    def arctan2(self, other):
+        """
+        Computes the quadrant aware inverse tangent of self / other, where self is the y coordinate and other the x
+        coordinate.
+
+        .. math::
+            \\mathrm{arctan2}(y + b\\epsilon, x + d\\epsilon) = \\mathrm{arctan2}(y, x) + \\frac{xb - yd}{x^2 + y^2}\\epsilon
+
+        Parameters
+        ----------
+        other : Dual, int, float
+            The x coordinate
+
+        Returns
+        -------
+        Dual
+            The angle of the point (other, self).
+
+        Raises
+        ------
+        ValueError
+            If both coordinates are zero, where the angle is undefined.
+        TypeError
+            If other is not a Dual, int or float.
+
+        Examples
+        --------
+        >>> Dual(1, 1).arctan2(Dual(1, 0))
+        Dual(0.7853981633974483, 0.5)
+        """
+
+        if isinstance(other, (int, float)):
+            other = Dual(other, 0)
+        if not isinstance(other, Dual):
+            raise TypeError("Unsupported type for arctan2 {}".format(type(other)))
+
+        r2 = self.real * self.real + other.real * other.real
+        if r2 == 0 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "arctan2 is not defined when both real parts are 0")
+
+        return Dual(math.atan2(self.real, other.real), (other.real * self.dual - self.real * other.dual) / r2)
+
+
+    def hypot(self, other):
+        """
+        Computes the euclidean norm :math:`\\sqrt{a^2 + c^2}` of self and other without intermediate overflow.
+
+        .. math::
+            \\mathrm{hypot}(a + b\\epsilon, c + d\\epsilon) = \\mathrm{hypot}(a, c) + \\frac{ab + cd}{\\mathrm{hypot}(a, c)}\\epsilon
+
+        Parameters
+        ----------
+        other : Dual, int, float
+            The second coordinate
+
+        Returns
+        -------
+        Dual
+            The norm of the two dual numbers.
+
+        Raises
+        ------
+        ValueError
+            If both real parts are zero, where the derivative is undefined.
+        TypeError
+            If other is not a Dual, int or float.
+
+        Examples
+        --------
+        >>> Dual(3, 1).hypot(Dual(4, 0))
+        Dual(5.0, 0.6)
+        """
+
+        if isinstance(other, (int, float)):
+            other = Dual(other, 0)
+        if not isinstance(other, Dual):
+            raise TypeError("Unsupported type for hypot {}".format(type(other)))
+
+        new_real = math.hypot(self.real, other.real)
+        if new_real == 0 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "hypot is not differentiable when both real parts are 0")
+
+        return Dual(new_real, (self.real * self.dual + other.real * other.dual) / new_real)
+
+
+    def __abs__(self):
+        """
+        Computes the absolute value of a dual number.
+
+        .. math::
+            |a + b\\epsilon| = |a| + \\mathrm{sign}(a) b\\epsilon
+
+        Returns
+        -------
+        Dual
+            The absolute value of the dual number.
+
+        Raises
+        ------
+        ValueError
+            If the real part is zero, where the derivative is undefined.
+
+        Examples
+        --------
+        >>> abs(Dual(-2, 3))
+        Dual(2, -3)
+        """
+
+        if self.real == 0 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "absolute value is not differentiable for a zero real part")
+
+        if self.real < 0:
+            return Dual(-self.real, -self.dual)
+        return Dual(self.real, self.dual)
+
+
+    def cbrt(self):
+        """
+        Computes the real cube root of a dual number.
+
+        .. math::
+            \\sqrt[3]{a + b\\epsilon} = \\sqrt[3]{a} + \\frac{b}{3\\sqrt[3]{a}^2}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The cube root of the dual number.
+
+        Raises
+        ------
+        ValueError
+            If the real part is zero, where the derivative is undefined.
+
+        Examples
+        --------
+        >>> Dual(-8, 3).cbrt()
+        Dual(-2.0, 0.25)
+        """
+
+        if self.real == 0 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "cube root is not differentiable for a zero real part")
+
+        new_real = math.copysign(abs(self.real) ** (1 / 3), self.real)
+        return Dual(new_real, self.dual / (3 * new_real * new_real))
+
+
+    def log1p(self):
+        """
+        Computes :math:`\\log(1 + x)`, accurately for small real parts.
+
+        .. math::
+            \\log(1 + a + b\\epsilon) = \\log(1 + a) + \\frac{b}{1 + a}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The logarithm of one plus the dual number.
+
+        Raises
+        ------
+        ValueError
+            If the real part is not greater than -1.
+
+        Examples
+        --------
+        >>> Dual(0, 2).log1p()
+        Dual(0.0, 2.0)
+        """
+
+        if self.real <= -1 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "log1p is not defined for real parts less than or equal to -1")
+
+        return Dual(math.log1p(self.real), self.dual / (1 + self.real))
+
+
+    def expm1(self):
+        """
+        Computes :math:`e^{x} - 1`, accurately for small real parts.
+
+        .. math::
+            e^{a + b\\epsilon} - 1 = (e^{a} - 1) + b e^{a}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The exponential of the dual number minus one.
+
+        Examples
+        --------
+        >>> Dual(0, 2).expm1()
+        Dual(0.0, 2.0)
+        """
+
+        try:
+            new_real = math.expm1(self.real)
+        except OverflowError:
+            return _domain_error(ValueError, "exponential overflows for real component {}".format(self.real))
+
+        # e^a is recovered from e^a - 1 rather than computing the exponential a second time
+        return Dual(new_real, self.dual * (new_real + 1))
+
+
+    def log10(self):
+        """
+        Computes the base 10 logarithm of a dual number.
+
+        .. math::
+            \\log_{10}(a + b\\epsilon) = \\log_{10}(a) + \\frac{b}{a\\ln(10)}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The base 10 logarithm of the dual number.
+
+        Raises
+        ------
+        ValueError
+            If the real part of the Dual number is non-positive.
+
+        Examples
+        --------
+        >>> Dual(10, 1).log10()
+        Dual(1.0, 0.043429448190325175)
+        """
+
+        if self.real <= 0 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "Logarithm is not defined for non-positive real parts")
+
+        return Dual(math.log10(self.real), self.dual / (self.real * _LN10))
+
+
+    def log2(self):
+        """
+        Computes the base 2 logarithm of a dual number.
+
+        .. math::
+            \\log_{2}(a + b\\epsilon) = \\log_{2}(a) + \\frac{b}{a\\ln(2)}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The base 2 logarithm of the dual number.
+
+        Raises
+        ------
+        ValueError
+            If the real part of the Dual number is non-positive.
+
+        Examples
+        --------
+        >>> Dual(2, 1).log2()
+        Dual(1.0, 0.7213475204444817)
+        """
+
+        if self.real <= 0 and _DOMAIN_POLICY.get() != "off":
+            return _domain_error(ValueError, "Logarithm is not defined for non-positive real parts")
+
+        return Dual(math.log2(self.real), self.dual / (self.real * _LN2))
+
+
+    def erf(self):
+        """
+        Computes the error function of a dual number.
+
+        .. math::
+            \\mathrm{erf}(a + b\\epsilon) = \\mathrm{erf}(a) + \\frac{2b}{\\sqrt{\\pi}} e^{-a^2}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The error function of the dual number.
+
+        Examples
+        --------
+        >>> Dual(0, 1).erf()
+        Dual(0.0, 1.1283791670955126)
+        """
+
+        return Dual(math.erf(self.real), self.dual * _TWO_OVER_SQRT_PI * math.exp(-self.real * self.real))
+
+
+    def erfc(self):
+        """
+        Computes the complementary error function of a dual number, accurately for large real parts.
+
+        .. math::
+            \\mathrm{erfc}(a + b\\epsilon) = \\mathrm{erfc}(a) - \\frac{2b}{\\sqrt{\\pi}} e^{-a^2}\\epsilon
+
+        Returns
+        -------
+        Dual
+            The complementary error function of the dual number.
+
+        Examples
+        --------
+        >>> Dual(0, 1).erfc()
+        Dual(1.0, -1.1283791670955126)
+        """
+
+        return Dual(math.erfc(self.real), -self.dual * _TWO_OVER_SQRT_PI * math.exp(-self.real * self.real))
+
+
+    def sigmoid(self):
+        """
+        Computes the logistic sigmoid of a dual number.
+
+        .. math::
+            \\sigma(a + b\\epsilon) = \\sigma(a) + b\\sigma(a)(1 - \\sigma(a))\\epsilon, \\quad \\sigma(a) = \\frac{1}{1 + e^{-a}}
+
+        The exponential is only ever taken of a non-positive number so the result never overflows.
+
+        Returns
+        -------
+        Dual
+            The sigmoid of the dual number.
+
+        Examples
+        --------
+        >>> Dual(0, 1).sigmoid()
+        Dual(0.5, 0.25)
+        """
+
+        new_real = _sigmoid(self.real)
+        return Dual(new_real, self.dual * new_real * (1 - new_real))
+
+
+    def softplus(self):
+        """
+        Computes the softplus function :math:`\\log(1 + e^{x})` of a dual number, whose derivative is the sigmoid.
+
+        .. math::
+            \\mathrm{softplus}(a + b\\epsilon) = \\log(1 + e^{a}) + b\\sigma(a)\\epsilon
+
+        It is evaluated as :math:`\\max(a, 0) + \\log(1 + e^{-|a|})` so the result never overflows.
+
+        Returns
+        -------
+        Dual
+            The softplus of the dual number.
+
+        Examples
+        --------
+        >>> Dual(0, 1).softplus()
+        Dual(0.6931471805599453, 0.5)
+        """
+
+        new_real = max(self.real, 0) + math.log1p(math.exp(-abs(self.real)))
+        return Dual(new_real, self.dual * _sigmoid(self.real))
+
+
+
+class MutableDual(Dual):
+    """
+    A Dual number which the augmented assignment operators ``+=``, ``-=``, ``*=`` and ``/=`` update in place.
+
+    Augmenting a Dual builds and validates a new Dual every time, so an accumulation loop such as ``acc += term``
+    allocates a dual number per iteration. A MutableDual instead updates its own components, and the components are
+    not checked again, so accumulation and time stepping loops run without allocating. All other operations behave
+    exactly as for Dual and return a new (immutable) Dual. Augmenting by any other operand, such as a numpy scalar or a
+    DualArray, falls back to the binary operator, so the name is rebound to the new result as it would be for a Dual.
+
+    A MutableDual should not be shared where it may be changed unexpectedly, and it is not hashable.
+
+    Examples
+    --------
+    >>> acc = MutableDual(0, 0)
+    >>> x = Dual(2, 1)
+    >>> for k in range(3):
+    ...     acc += x * k
+    >>> acc.real, acc.dual
+    (6, 3)
+    """
+
+    __hash__ = None
+
+
+    def __iadd__(self, other):
+        """
+        Adds a dual number or a scalar to this dual number in place
+
+        Parameters
+        ----------
+        other : Dual, int, float
+            The (dual) number to add
+
+        Returns
+        -------
+        MutableDual
+            This dual number, updated
+
+        """
+
+        if isinstance(other, Dual):
+            self.real += other.real
+            self.dual += other.dual
+        elif isinstance(other, (int, float)):
+            self.real += other
+        # other operands are left to __add__ and the reflected methods, which return a new object
+        else:
+            return NotImplemented
+        return self
+
+
+    def __isub__(self, other):
+        """
+        Subtracts a dual number or a scalar from this dual number in place
+
+        Parameters
+        ----------
+        other : Dual, int, float
+            The (dual) number to subtract
+
+        Returns
+        -------
+        MutableDual
+            This dual number, updated
+
+        """
+
+        if isinstance(other, Dual):
+            self.real -= other.real
+            self.dual -= other.dual
+        elif isinstance(other, (int, float)):
+            self.real -= other
+        else:
+            return NotImplemented
+        return self
+
+
+    def __imul__(self, other):
+        """
+        Multiplies this dual number by a dual number or a scalar in place, following
+
+        .. math::
+            (a + b\\epsilon)(c + d\\epsilon) = ac + (ad + bc)\\epsilon
+
+        Parameters
+        ----------
+        other : Dual, int, float
+            The (dual) number to multiply by
+
+        Returns
+        -------
+        MutableDual
+            This dual number, updated
+
+        """
+
+        if isinstance(other, Dual):
+            # the dual part uses the original real part, so it is updated first
+            self.dual = self.real * other.dual + self.dual * other.real
+            self.real *= other.real
+        elif isinstance(other, (int, float)):
+            self.real *= other
+            self.dual *= other
+        else:
+            return NotImplemented
+        return self
+
+
+    def __itruediv__(self, other):
+        """
+        Divides this dual number by a dual number or a scalar in place, following
+
+        .. math::
+            \\frac{a + b\\epsilon}{c + d\\epsilon} = \\frac{a}{c} + \\frac{bc - ad}{c^2}\\epsilon
+
+        Parameters
+        ----------
+        other : Dual, int, float
+            The (dual) number to divide by
+
+        Returns
+        -------
+        MutableDual
+            This dual number, updated
+
+        Raises
+        ------
+        ZeroDivisionError
+            If the real part of the divisor is zero, under the default domain policy. Under the "nan" and "mask"
+            policies both components become nan instead.
+        """
+
+        if isinstance(other, Dual):
+            divisor = other.real
+        elif isinstance(other, (int, float)):
+            divisor = other
+        else:
+            return NotImplemented
+
+        if divisor == 0 and _DOMAIN_POLICY.get() != "off":
+            invalid = _domain_error(ZeroDivisionError, "The real part of the divisor is 0, division is not defined")
+            self.real, self.dual = invalid.real, invalid.dual
+            return self
+
+        # (bc - ad) / c^2 = (b - (a / c) d) / c, so the real part is divided first and reused
+        self.real /= divisor
+        if isinstance(other, Dual):
+            self.dual -= self.real * other.dual
+        self.dual /= divisor
+        return self
+
+
+    def freeze(self):
+        """
+        Returns the current value as an immutable Dual
+
+        Returns
+        -------
+        Dual
+            A Dual with the same components
+        """
+
+        return Dual(self.real, self.dual)
+
+
+
+def _real_part(other):
+    """
+    The real part of the right hand side of an ordering comparison, or None for unsupported types so that the reflected
+    comparison of the other operand is tried (and Python raises a TypeError if there is none)
+    """
+
+    if isinstance(other, Dual):
+        return other.real
+    if isinstance(other, (int, float)):
+        return other
+    return None
+
+
+
+def _domain_error(error, message):
+    """
+    Handles an operation evaluated outside of its domain according to the domain policy, raising `error` under the
+    "raise" policy and otherwise returning a Dual with nan components to mark the point as invalid
+    """
+
+    if _DOMAIN_POLICY.get() == "raise":
+        raise error(message)
+    return Dual(math.nan, math.nan)
+
+
+
+# constants used by the derivatives of the logarithms and error functions
+_LN2 = math.log(2)
+_LN10 = math.log(10)
+_TWO_OVER_SQRT_PI = 2 / math.sqrt(math.pi)
+
+
+
+def _sech2(x, t):
+    """
+    The derivative of tanh at `x`, given t = tanh(x). For small |x| this is 1 - t^2, but as t rounds to 1 that loses
+    all relative precision, so larger |x| use the equivalent 4e^{-2|x|} / (1 + e^{-2|x|})^2 which underflows gracefully.
+    """
+
+    if abs(x) < 1:
+        return (1 - t) * (1 + t)
+    e = math.exp(-2 * abs(x))
+    return 4 * e / ((1 + e) * (1 + e))
+
+
+
+def _sigmoid(x):
+    """
+    Numerically stable logistic sigmoid of a float, shared by Dual.sigmoid and Dual.softplus
+    """
+
+    if x >= 0:
+        return 1 / (1 + math.exp(-x))
+    e = math.exp(x)
+    return e / (1 + e)
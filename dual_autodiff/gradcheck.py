@@ -0,0 +1,242 @@
+import numpy as np
+
+from dual_autodiff.array import DualArray, _planes
+from dual_autodiff.policy import domain_policy
+
+
+# verifies derivatives computed with dual numbers against finite difference estimates over whole arrays of points. The
+# function is evaluated on DualArrays, so checking thousands of points costs three vectorised evaluations rather than a
+# Python loop of scalar evaluations.
+
+
+# step sizes relative to max(1, |x|). The central difference balances truncation against rounding error at the cube root
+# of the machine epsilon, whilst the complex step has no subtraction and so no rounding error to balance.
+_STEPS = {"central": np.finfo(np.float64).eps ** (1 / 3), "complex": 1e-20}
+
+# default (rtol, atol) of each method. The truncation error of a central difference grows with the third derivative and
+# so is only small relative to the function, whilst the complex step is accurate to a few rounding errors.
+_TOLERANCES = {"central": (1e-5, 1e-6), "complex": (1e-10, 1e-12)}
+
+
+class GradCheck:
+    """
+    The result of :func:`check_grad`, comparing dual derivatives with finite difference estimates point by point.
+
+    A GradCheck is truthy when every point passes, so ``assert check_grad(f, xs)`` may be used as a guard in tests, and
+    converting it to a string gives a table of the worst points.
+
+
+    Attributes
+    ----------
+    points : numpy.ndarray
+        The points the derivatives were checked at
+    derivative : numpy.ndarray
+        The derivatives computed with dual numbers
+    estimate : numpy.ndarray
+        The finite difference estimates of the derivatives
+    error : numpy.ndarray
+        The relative error :math:`|d - e| / \\max(|d|, |e|)` of each derivative, which is 0 where both are 0 and inf
+        where either is not finite
+    passed : numpy.ndarray
+        Whether each derivative agrees with its estimate, ``|d - e| <= atol + rtol * |e|``
+    method : str
+        The finite difference method used, ``"central"`` or ``"complex"``
+
+
+    Examples
+    --------
+    >>> result = check_grad(lambda x: (x * x).sin(), np.linspace(0, 1, 1000))
+    >>> bool(result)
+    True
+    """
+
+    def __init__(self, points, derivative, estimate, error, passed, method):
+        self.points = points
+        self.derivative = derivative
+        self.estimate = estimate
+        self.error = error
+        self.passed = passed
+        self.method = method
+
+
+    @property
+    def max_error(self):
+        """
+        The largest relative error over all points, 0 when there are no points
+        """
+        return float(self.error.max()) if self.error.size else 0.0
+
+
+    @property
+    def failures(self):
+        """
+        The indices of the points which failed, as a tuple of index arrays like :func:`numpy.nonzero`
+        """
+        return np.nonzero(~self.passed)
+
+
+    def worst(self, n=10):
+        """
+        Returns the points with the largest relative errors
+
+
+        Parameters
+        ----------
+        n : int
+            The number of points to return
+
+
+        Returns
+        -------
+        list of tuple
+            ``(index, point, derivative, estimate, error)`` for the `n` largest errors, largest first
+        """
+
+        order = np.argsort(self.error, axis=None, kind="stable")[::-1][:n]
+        result = []
+        for flat in order:
+            index = np.unravel_index(flat, self.error.shape)
+            result.append((index, float(self.points[index]), float(self.derivative[index]), float(self.estimate[index]),
+                           float(self.error[index])))
+        return result
+
+
+    def report(self, n=10):
+        """
+        Returns a summary and a table of the `n` worst points as a string
+
+
+        Parameters
+        ----------
+        n : int
+            The number of points to include
+
+
+        Returns
+        -------
+        str
+            The formatted report
+        """
+
+        failed = int(np.count_nonzero(~self.passed))
+        lines = ["{} of {} points failed ({} method), max relative error {:.3e}".format(
+            failed, self.passed.size, self.method, self.max_error)]
+        lines.append("{:<12} {:>14} {:>14} {:>14} {:>10}".format("index", "point", "derivative", "estimate", "error"))
+        for index, point, derivative, estimate, error in self.worst(n):
+            index = ",".join(str(int(i)) for i in index)
+            lines.append("{:<12} {:>14.6g} {:>14.6g} {:>14.6g} {:>10.3e}".format(index, point, derivative, estimate,
+                                                                                   error))
+        return "\n".join(lines)
+
+
+    def __bool__(self):
+        return bool(self.passed.all())
+
+
+    def __str__(self):
+        return self.report()
+
+
+
+def _evaluate(f, real, dual, shape):
+    """
+    Evaluates `f` on a DualArray and returns the real and dual planes of the result, broadcast to `shape`
+    """
+
+    real, dual = _planes(f(DualArray(real, dual)))
+    if real is None:
+        raise TypeError("f must return a DualArray, dual number or number")
+    dual = np.zeros_like(real) if dual is None else dual
+    return np.broadcast_to(real, shape), np.broadcast_to(dual, shape)
+
+
+
+def check_grad(f, xs, method="central", h=None, rtol=None, atol=None):
+    """
+    Checks the derivatives of an elementwise function computed with dual numbers against finite differences
+
+    `f` is called with a DualArray of all the points at once, and must act elementwise (each element of its result
+    depends only on the corresponding point), as do functions built from the operators and methods of DualArray. The
+    derivatives are compared with either
+
+    - ``"central"`` differences, :math:`(f(x + h) - f(x - h)) / 2h`, which need only real arithmetic, or
+    - the ``"complex"`` step, :math:`\\mathrm{Im} f(x + ih) / h`, which is accurate to machine precision but needs `f`
+      to be holomorphic, so functions using ``abs``, comparisons or other real only operations raise a TypeError.
+
+    Every evaluation uses the ``"nan"`` domain policy with numpy's floating point warnings silenced, so points outside
+    the domain of `f` fail the check rather than stopping it.
+
+
+    Parameters
+    ----------
+    f : callable
+        The function to check, taking and returning a DualArray
+    xs : array_like
+        The real points to check the derivative at, of any shape
+    method : str
+        The finite difference method, ``"central"`` or ``"complex"``
+    h : float or array_like, optional
+        The step size, by default scaled with ``max(1, |x|)`` for each point
+    rtol : float, optional
+        The relative tolerance of the comparison, by default 1e-5 for central differences and 1e-10 for the complex step
+    atol : float, optional
+        The absolute tolerance of the comparison, by default 1e-6 for central differences and 1e-12 for the complex
+        step
+
+
+    Returns
+    -------
+    GradCheck
+        The derivatives, estimates and errors at every point
+
+
+    Raises
+    ------
+    ValueError
+        If `method` is not supported or `xs` is not real.
+    TypeError
+        If `f` does not return dual numbers or numbers.
+
+
+    Examples
+    --------
+    >>> result = check_grad(lambda x: x.exp() / x, np.linspace(1, 5, 10000), method="complex")
+    >>> result.max_error < 1e-12
+    True
+    """
+
+    if method not in _STEPS:
+        raise ValueError("method must be 'central' or 'complex', not {}".format(method))
+    xs = np.asarray(xs)
+    if xs.dtype.kind not in "iuf":
+        raise ValueError("can only check derivatives at real points, not {}".format(xs.dtype))
+    xs = xs.astype(np.float64)
+    if h is None:
+        h = _STEPS[method] * np.maximum(1, np.abs(xs))
+    default_rtol, default_atol = _TOLERANCES[method]
+    rtol = default_rtol if rtol is None else rtol
+    atol = default_atol if atol is None else atol
+
+    with domain_policy("nan"), np.errstate(all="ignore"):
+        _, derivative = _evaluate(f, xs, 1.0, xs.shape)
+        if method == "central":
+            # the steps actually taken, which differ from 2h by the rounding of x + h and x - h
+            up, down = xs + h, xs - h
+            upper, _ = _evaluate(f, up, 0.0, xs.shape)
+            lower, _ = _evaluate(f, down, 0.0, xs.shape)
+            estimate = (upper - lower) / (up - down)
+        else:
+            value, _ = _evaluate(f, xs + 1j * np.asarray(h), 0.0, xs.shape)
+            estimate = np.imag(value) / h
+
+    derivative = np.real(derivative)
+    estimate = np.broadcast_to(estimate, xs.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        difference = np.abs(derivative - estimate)
+        scale = np.maximum(np.abs(derivative), np.abs(estimate))
+        error = np.where(difference == 0, 0.0, difference / scale)
+    finite = np.isfinite(derivative) & np.isfinite(estimate)
+    error = np.where(finite, error, np.inf)
+    passed = finite & (difference <= atol + rtol * np.abs(estimate))
+
+    return GradCheck(xs, derivative, estimate, error, passed, method)
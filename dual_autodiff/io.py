@@ -0,0 +1,383 @@
+import json
+
+import numpy as np
+
+from dual_autodiff.array import DualArray
+
+
+# the two layouts a DualArray can be stored in, a struct column with real and dual fields or a pair of float columns
+LAYOUTS = ("struct", "columns")
+
+# key of the schema metadata recording the shape of each stored array, arrays are stored flattened
+_SHAPES_KEY = b"dual_autodiff.shapes"
+
+# plane precisions which arrow can store
+_ARROW_TYPES = (np.float16, np.float32, np.float64)
+
+
+
+def _pyarrow():
+    """
+    Imports pyarrow, which is only needed by this module, raising an ImportError which explains how to install it
+    """
+
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("reading and writing arrow or parquet files needs pyarrow, install it with pip install pyarrow")
+    return pyarrow
+
+
+
+def _check_plane(plane):
+    """
+    Raises a TypeError for planes which arrow cannot store
+    """
+
+    if plane.dtype.type not in _ARROW_TYPES:
+        raise TypeError("cannot store a plane of dtype {}, arrow supports float16, float32 and float64".format(
+            plane.dtype))
+
+
+
+def to_arrow(arrays, layout="struct"):
+    """
+    Converts DualArrays into a :class:`pyarrow.Table` without copying the planes
+
+
+    Parameters
+    ----------
+    arrays : DualArray or dict
+        The array to convert, stored under the name ``"x"``, or a mapping from column names to DualArrays of the same
+        size
+    layout : str
+        ``"struct"`` stores each array as one struct column with ``real`` and ``dual`` fields, ``"columns"`` stores it as
+        the two float columns ``<name>.real`` and ``<name>.dual``
+
+
+    Returns
+    -------
+    pyarrow.Table
+        The table, with the shape of each array recorded in the schema metadata
+
+
+    Raises
+    ------
+    ValueError
+        If `layout` is not a known layout.
+    TypeError
+        If a plane is complex or long double, which arrow cannot store.
+
+
+    Examples
+    --------
+    >>> x = DualArray([1.0, 2.0], 1)
+    >>> to_arrow({"x": x, "y": x.exp()}).column_names
+    ['x', 'y']
+    """
+
+    pa = _pyarrow()
+    if layout not in LAYOUTS:
+        raise ValueError("unknown layout {}, expected one of 'struct', 'columns'".format(layout))
+    if isinstance(arrays, DualArray):
+        arrays = {"x": arrays}
+
+    columns = {}
+    shapes = {}
+    for name, array in arrays.items():
+        if not isinstance(array, DualArray):
+            raise TypeError("can only store DualArrays, not {}".format(type(array)))
+        _check_plane(array.real)
+        _check_plane(array.dual)
+
+        # ravel is a view for the contiguous planes DualArray operations produce, and pa.array wraps the numpy buffer
+        real = pa.array(np.ravel(array.real))
+        dual = pa.array(np.ravel(array.dual))
+        if layout == "struct":
+            columns[name] = pa.StructArray.from_arrays([real, dual], names=["real", "dual"])
+        else:
+            columns[name + ".real"] = real
+            columns[name + ".dual"] = dual
+        shapes[name] = list(array.shape)
+
+    table = pa.table(columns)
+    return table.replace_schema_metadata({_SHAPES_KEY: json.dumps(shapes).encode()})
+
+
+
+def _dual_columns(schema):
+    """
+    Finds the dual arrays stored in a schema, returning a dict from each name to the struct column holding it or to
+    the pair of columns holding its planes
+    """
+
+    pa = _pyarrow()
+    found = {}
+    for field in schema:
+        if pa.types.is_struct(field.type) and sorted(f.name for f in field.type) == ["dual", "real"]:
+            found[field.name] = field.name
+        elif field.name.endswith(".real") and field.name[:-5] + ".dual" in schema.names:
+            found[field.name[:-5]] = (field.name, field.name[:-5] + ".dual")
+    return found
+
+
+
+def _column(schema, name):
+    """
+    Returns where the dual array `name` is stored in `schema`, defaulting to the only dual array in the schema
+    """
+
+    found = _dual_columns(schema)
+    if name is None:
+        if len(found) != 1:
+            raise ValueError("the data holds {} dual arrays ({}), choose one with name".format(
+                len(found), ", ".join(found)))
+        name = next(iter(found))
+    if name not in found:
+        raise KeyError("no dual array named {}".format(name))
+    return name, found[name]
+
+
+
+def _planes(data, column):
+    """
+    Extracts the real and dual planes of a dual array from a table or record batch as numpy arrays, which share memory
+    with the arrow buffers whenever the data is held in a single chunk
+    """
+
+    if isinstance(column, tuple):
+        return _to_numpy(data.column(column[0])), _to_numpy(data.column(column[1]))
+    values = data.column(column)
+    if hasattr(values, "combine_chunks"):
+        values = values.combine_chunks()
+    return _to_numpy(values.field("real")), _to_numpy(values.field("dual"))
+
+
+
+def _to_numpy(values):
+    """
+    Converts an arrow array or chunked array of floats to numpy, without a copy for a single chunk without nulls
+    """
+
+    if hasattr(values, "num_chunks"):
+        if values.num_chunks == 1:
+            values = values.chunk(0)
+        else:
+            return np.concatenate([chunk.to_numpy(zero_copy_only=False) for chunk in values.chunks])
+    return values.to_numpy(zero_copy_only=values.null_count == 0)
+
+
+
+def from_arrow(data, name=None):
+    """
+    Converts a dual array stored in a :class:`pyarrow.Table` or :class:`pyarrow.RecordBatch` back into a DualArray
+
+    The planes of the result share memory with the arrow data when each column is held in a single chunk, which is the
+    case for tables read from memory mapped IPC files written by :func:`write_ipc`.
+
+
+    Parameters
+    ----------
+    data : pyarrow.Table or pyarrow.RecordBatch
+        The data, in either layout written by :func:`to_arrow`
+    name : str, optional
+        The name of the dual array to read, which may be left out if the data holds only one
+
+
+    Returns
+    -------
+    DualArray
+        The dual array, with its original shape when the data holds all of it
+
+
+    Raises
+    ------
+    KeyError
+        If there is no dual array called `name`.
+    ValueError
+        If `name` is not given and the data holds more than one dual array.
+    """
+
+    name, column = _column(data.schema, name)
+    real, dual = _planes(data, column)
+
+    shapes = json.loads((data.schema.metadata or {}).get(_SHAPES_KEY, b"{}"))
+    shape = shapes.get(name)
+    if shape is not None and int(np.prod(shape)) == real.size:
+        real = real.reshape(shape)
+        dual = dual.reshape(shape)
+    return DualArray._new(real, dual)
+
+
+
+def write_ipc(path, arrays, layout="struct", chunk_size=None):
+    """
+    Writes DualArrays to an Arrow IPC (Feather version 2) file
+
+
+    Parameters
+    ----------
+    path : str
+        The file to write
+    arrays : DualArray or dict
+        The arrays to store, see :func:`to_arrow`
+    layout : str
+        ``"struct"`` or ``"columns"``, see :func:`to_arrow`
+    chunk_size : int, optional
+        The number of elements in each record batch, which is the unit :func:`iter_ipc` reads. Defaults to a single
+        batch.
+    """
+
+    pa = _pyarrow()
+    table = to_arrow(arrays, layout)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=chunk_size)
+
+
+
+def read_ipc(path, name=None):
+    """
+    Reads a dual array from an Arrow IPC file, memory mapping it so the planes are not copied
+
+
+    Parameters
+    ----------
+    path : str
+        The file to read
+    name : str, optional
+        The dual array to read, see :func:`from_arrow`
+
+
+    Returns
+    -------
+    DualArray
+        The dual array, backed by the memory mapped file when it was written as a single batch
+    """
+
+    pa = _pyarrow()
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return from_arrow(table, name)
+
+
+
+def iter_ipc(path, name=None):
+    """
+    Reads a dual array from an Arrow IPC file one record batch at a time, so files larger than memory can be processed
+
+
+    Parameters
+    ----------
+    path : str
+        The file to read
+    name : str, optional
+        The dual array to read, see :func:`from_arrow`
+
+
+    Yields
+    ------
+    DualArray
+        One dimensional arrays holding consecutive elements of the (flattened) stored array
+    """
+
+    pa = _pyarrow()
+    with pa.memory_map(str(path), "r") as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield _flat(reader.get_batch(i), name)
+
+
+
+def _flat(batch, name):
+    """
+    Converts one record batch to a one dimensional DualArray
+    """
+
+    _, column = _column(batch.schema, name)
+    return DualArray._new(*_planes(batch, column))
+
+
+
+def write_parquet(path, arrays, layout="struct", chunk_size=None, compression="snappy"):
+    """
+    Writes DualArrays to a Parquet file
+
+
+    Parameters
+    ----------
+    path : str
+        The file to write
+    arrays : DualArray or dict
+        The arrays to store, see :func:`to_arrow`
+    layout : str
+        ``"struct"`` or ``"columns"``, see :func:`to_arrow`
+    chunk_size : int, optional
+        The number of elements in each row group
+    compression : str
+        The compression codec, see :func:`pyarrow.parquet.write_table`
+    """
+
+    _pyarrow()
+    import pyarrow.parquet as pq
+
+    pq.write_table(to_arrow(arrays, layout), str(path), row_group_size=chunk_size, compression=compression)
+
+
+
+def read_parquet(path, name=None):
+    """
+    Reads a dual array from a Parquet file
+
+
+    Parameters
+    ----------
+    path : str
+        The file to read
+    name : str, optional
+        The dual array to read, see :func:`from_arrow`
+
+
+    Returns
+    -------
+    DualArray
+        The dual array
+    """
+
+    _pyarrow()
+    import pyarrow.parquet as pq
+
+    return from_arrow(pq.read_table(str(path)), name)
+
+
+
+def iter_parquet(path, name=None, chunk_size=65536):
+    """
+    Reads a dual array from a Parquet file a chunk at a time, so files larger than memory can be processed
+
+
+    Parameters
+    ----------
+    path : str
+        The file to read
+    name : str, optional
+        The dual array to read, see :func:`from_arrow`
+    chunk_size : int
+        The largest number of elements in each chunk
+
+
+    Yields
+    ------
+    DualArray
+        One dimensional arrays holding consecutive elements of the (flattened) stored array
+    """
+
+    _pyarrow()
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(str(path))
+    # only the columns of the requested array are read from disk
+    _, column = _column(parquet.schema_arrow, name)
+    columns = list(column) if isinstance(column, tuple) else [column]
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+        yield DualArray._new(*_planes(batch, column))
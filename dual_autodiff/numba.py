@@ -0,0 +1,498 @@
+import math
+import operator
+
+from dual_autodiff import backends, dual
+from dual_autodiff.dual import Dual
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+# Teaches numba about dual numbers so that functions compiled with numba.njit can take, create and return them. Inside
+# compiled code a dual number is an unboxed struct of two float64s, so loops over dual numbers run at native speed
+# without allocating Python objects. The arithmetic, ordering and elementary functions of Dual are implemented with
+# the same formulas as dual.py.
+#
+# Compiled code cannot read the domain policy (a context variable), so invalid points always raise the exception of the
+# "raise" policy. Components are stored as float64, so like ComplexDual, complex dual numbers are not supported.
+
+
+# whether numba is installed, without it jit leaves functions uncompiled and they run on the Dual class
+AVAILABLE = numba is not None
+
+# the Dual classes numba accepts as arguments, the python class and the class of the selected backend
+_DUAL_CLASSES = tuple({Dual, backends.Dual})
+
+
+
+def jit(function=None, **options):
+    """
+    Compiles a function with :func:`numba.njit` when numba is installed, so it can take and return dual numbers, and
+    otherwise returns it unchanged so the same code runs in Python on the Dual class
+
+    May be used as ``@jit`` or ``@jit(cache=True, ...)``.
+
+
+    Parameters
+    ----------
+    function : callable
+        The function to compile
+    **options
+        Options passed to :func:`numba.njit`, ignored when numba is not installed
+
+
+    Returns
+    -------
+    callable
+        The compiled function, or `function` itself when numba is not installed
+
+
+    Examples
+    --------
+    >>> @jit
+    ... def f(x):
+    ...     return (x * x).sin() + 2 * x
+    >>> f(Dual(1.0, 1.0)).dual
+    3.0806046117362795
+    """
+
+    if function is None:
+        return lambda f: jit(f, **options)
+    if numba is None:
+        return function
+    return numba.njit(**options)(function)
+
+
+
+def _register():
+    """
+    Registers the numba type of dual numbers and its implementations, returning the type
+    """
+
+    from numba import types
+    from numba.core import cgutils
+    from numba.extending import (NativeValue, box, lower_builtin, make_attribute_wrapper, models, overload,
+                                 overload_method, register_model, type_callable, typeof_impl, unbox)
+
+    class DualType(types.Type):
+        """
+        The numba type of a dual number
+        """
+
+        def __init__(self):
+            super().__init__(name="Dual")
+
+    dual_type = DualType()
+
+    @register_model(DualType)
+    class DualModel(models.StructModel):
+        def __init__(self, dmm, fe_type):
+            super().__init__(dmm, fe_type, [("real", types.float64), ("dual", types.float64)])
+
+    make_attribute_wrapper(DualType, "real", "real")
+    make_attribute_wrapper(DualType, "dual", "dual")
+
+    def is_scalar(t):
+        return isinstance(t, (types.Integer, types.Float, types.Boolean))
+
+    # construction with Dual(real, dual), for each of the Dual classes
+    for cls in _DUAL_CLASSES:
+        typeof_impl.register(cls)(lambda value, context: dual_type)
+
+        @type_callable(cls)
+        def type_dual(context):
+            def typer(real, dual):
+                if is_scalar(real) and is_scalar(dual):
+                    return dual_type
+            return typer
+
+        @lower_builtin(cls, types.Number, types.Number)
+        def lower_dual(context, builder, sig, args):
+            result = cgutils.create_struct_proxy(sig.return_type)(context, builder)
+            result.real = context.cast(builder, args[0], sig.args[0], types.float64)
+            result.dual = context.cast(builder, args[1], sig.args[1], types.float64)
+            return result._getvalue()
+
+    @unbox(DualType)
+    def unbox_dual(typ, obj, c):
+        real = c.pyapi.object_getattr_string(obj, "real")
+        dual = c.pyapi.object_getattr_string(obj, "dual")
+        result = cgutils.create_struct_proxy(typ)(c.context, c.builder)
+        result.real = c.pyapi.float_as_double(real)
+        result.dual = c.pyapi.float_as_double(dual)
+        c.pyapi.decref(real)
+        c.pyapi.decref(dual)
+        is_error = cgutils.is_not_null(c.builder, c.pyapi.err_occurred())
+        return NativeValue(result._getvalue(), is_error=is_error)
+
+    @box(DualType)
+    def box_dual(typ, val, c):
+        # dual numbers leave compiled code as instances of the Dual class of the selected backend
+        value = cgutils.create_struct_proxy(typ)(c.context, c.builder, value=val)
+        real = c.pyapi.float_from_double(value.real)
+        dual = c.pyapi.float_from_double(value.dual)
+        cls = c.pyapi.unserialize(c.pyapi.serialize_object(backends.Dual))
+        result = c.pyapi.call_function_objargs(cls, (real, dual))
+        c.pyapi.decref(real)
+        c.pyapi.decref(dual)
+        c.pyapi.decref(cls)
+        return result
+
+    # arithmetic, each operator takes two dual numbers or a dual number and a scalar on either side
+
+    @overload(operator.add)
+    def dual_add(a, b):
+        if isinstance(a, DualType) and isinstance(b, DualType):
+            return lambda a, b: Dual(a.real + b.real, a.dual + b.dual)
+        if isinstance(a, DualType) and is_scalar(b):
+            return lambda a, b: Dual(a.real + b, a.dual)
+        if is_scalar(a) and isinstance(b, DualType):
+            return lambda a, b: Dual(a + b.real, b.dual)
+
+    @overload(operator.sub)
+    def dual_sub(a, b):
+        if isinstance(a, DualType) and isinstance(b, DualType):
+            return lambda a, b: Dual(a.real - b.real, a.dual - b.dual)
+        if isinstance(a, DualType) and is_scalar(b):
+            return lambda a, b: Dual(a.real - b, a.dual)
+        if is_scalar(a) and isinstance(b, DualType):
+            return lambda a, b: Dual(a - b.real, -b.dual)
+
+    @overload(operator.mul)
+    def dual_mul(a, b):
+        if isinstance(a, DualType) and isinstance(b, DualType):
+            return lambda a, b: Dual(a.real * b.real, a.real * b.dual + a.dual * b.real)
+        if isinstance(a, DualType) and is_scalar(b):
+            return lambda a, b: Dual(a.real * b, a.dual * b)
+        if is_scalar(a) and isinstance(b, DualType):
+            return lambda a, b: Dual(a * b.real, a * b.dual)
+
+    @overload(operator.truediv)
+    def dual_truediv(a, b):
+        if isinstance(a, DualType) and isinstance(b, DualType):
+            def impl(a, b):
+                if b.real == 0:
+                    raise ZeroDivisionError("The real part of the divisor is 0, division is not defined")
+                return Dual(a.real / b.real, (a.dual * b.real - a.real * b.dual) / b.real ** 2)
+            return impl
+        if isinstance(a, DualType) and is_scalar(b):
+            def impl(a, b):
+                if b == 0:
+                    raise ZeroDivisionError("Division by 0 is not defined")
+                return Dual(a.real / b, a.dual / b)
+            return impl
+        if is_scalar(a) and isinstance(b, DualType):
+            def impl(a, b):
+                if b.real == 0:
+                    raise ZeroDivisionError("Division by a dual number with a zero real part is undefined.")
+                return Dual(a / b.real, -a * b.dual / b.real ** 2)
+            return impl
+
+    # dual numbers are values in compiled code, so the augmented assignments rebind to a new dual number
+    for op, implementation in [(operator.iadd, dual_add), (operator.isub, dual_sub), (operator.imul, dual_mul),
+                               (operator.itruediv, dual_truediv)]:
+        overload(op)(implementation)
+
+    @overload(operator.neg)
+    def dual_neg(a):
+        if isinstance(a, DualType):
+            return lambda a: Dual(-a.real, -a.dual)
+
+    @overload(abs)
+    def dual_abs(a):
+        if isinstance(a, DualType):
+            def impl(a):
+                if a.real == 0:
+                    raise ValueError("absolute value is not differentiable for a zero real part")
+                if a.real < 0:
+                    return Dual(-a.real, -a.dual)
+                return a
+            return impl
+
+    @numba.njit
+    def power(base, p, p_dual, integer):
+        # the same edge cases as Dual.__pow__, every one has a non positive base
+        if base.real <= 0:
+            if p_dual != 0:
+                raise ValueError("Cannot raise negtive or 0 real dual to a dual with non zero dual component")
+            if base.real == 0 and p == 0:
+                raise ValueError("0^0 is not defined")
+            if base.real < 0 and not integer:
+                raise ValueError("cannot raise negative numbers to fractional powers")
+            if base.real == 0 and p == 1:
+                raise ValueError("0^0 is not defined and is present in dual component")
+            if base.real == 0 and p < 0:
+                raise ValueError("cannot raise 0 to negative exponents")
+            if base.real == 0 and 0 < p < 1:
+                raise ValueError("cannot raise 0 to negative exponents, present in Dual component of result")
+        new_real = base.real ** p
+        if p_dual == 0:
+            return Dual(new_real, p * base.dual * base.real ** (p - 1))
+        return Dual(new_real, new_real * (p_dual * math.log(base.real) + p * base.dual / base.real))
+
+    @overload(operator.pow)
+    def dual_pow(a, b):
+        if isinstance(a, DualType) and isinstance(b, DualType):
+            return lambda a, b: power(a, b.real, b.dual, False)
+        if isinstance(a, DualType) and isinstance(b, types.Integer):
+            return lambda a, b: power(a, float(b), 0.0, True)
+        if isinstance(a, DualType) and is_scalar(b):
+            return lambda a, b: power(a, float(b), 0.0, False)
+        if is_scalar(a) and isinstance(b, DualType):
+            return lambda a, b: power(Dual(a, 0.0), b.real, b.dual, False)
+
+    # ordering compares the real parts, as Dual does
+    for op in (operator.lt, operator.le, operator.gt, operator.ge):
+        _overload_ordering(overload, op, DualType, is_scalar)
+
+    # elementary functions, the methods of Dual
+
+    sech2 = numba.njit(dual._sech2)
+    sigmoid = numba.njit(dual._sigmoid)
+
+    def method(name):
+        return overload_method(DualType, name)
+
+    @method("sin")
+    def dual_sin(x):
+        return lambda x: Dual(math.sin(x.real), x.dual * math.cos(x.real))
+
+    @method("cos")
+    def dual_cos(x):
+        return lambda x: Dual(math.cos(x.real), -x.dual * math.sin(x.real))
+
+    @method("tan")
+    def dual_tan(x):
+        def impl(x):
+            new_real = math.tan(x.real)
+            sec2 = 1 + new_real * new_real
+            if sec2 >= 1e16:
+                raise ZeroDivisionError("tangent is non-defined when real component = pi/2 + n*pi")
+            return Dual(new_real, x.dual * sec2)
+        return impl
+
+    @method("sinh")
+    def dual_sinh(x):
+        def impl(x):
+            new_real = math.sinh(x.real)
+            if math.isinf(new_real):
+                raise ValueError("hyperbolic sine overflows")
+            return Dual(new_real, x.dual * math.cosh(x.real))
+        return impl
+
+    @method("cosh")
+    def dual_cosh(x):
+        def impl(x):
+            new_real = math.cosh(x.real)
+            if math.isinf(new_real):
+                raise ValueError("hyperbolic cosine overflows")
+            return Dual(new_real, x.dual * math.sinh(x.real))
+        return impl
+
+    @method("tanh")
+    def dual_tanh(x):
+        def impl(x):
+            new_real = math.tanh(x.real)
+            return Dual(new_real, x.dual * sech2(x.real, new_real))
+        return impl
+
+    @method("sqrt")
+    def dual_sqrt(x):
+        def impl(x):
+            if x.real <= 0:
+                raise ValueError("Square root is undefined for a non positive real part")
+            new_real = math.sqrt(x.real)
+            return Dual(new_real, x.dual / (2 * new_real))
+        return impl
+
+    @method("exp")
+    def dual_exp(x):
+        def impl(x):
+            new_real = math.exp(x.real)
+            if math.isinf(new_real):
+                raise ValueError("exponential overflows")
+            return Dual(new_real, x.dual * new_real)
+        return impl
+
+    @method("log")
+    def dual_log(x):
+        def impl(x):
+            if x.real <= 0:
+                raise ValueError("Natural Logarithm is not defined for non-positive real parts")
+            return Dual(math.log(x.real), x.dual / x.real)
+        return impl
+
+    @method("arcsin")
+    def dual_arcsin(x):
+        def impl(x):
+            if not -1 < x.real < 1:
+                raise ValueError("inverse sine is only differentiable for real parts strictly between -1 and 1")
+            return Dual(math.asin(x.real), x.dual / math.sqrt((1 - x.real) * (1 + x.real)))
+        return impl
+
+    @method("arccos")
+    def dual_arccos(x):
+        def impl(x):
+            if not -1 < x.real < 1:
+                raise ValueError("inverse cosine is only differentiable for real parts strictly between -1 and 1")
+            return Dual(math.acos(x.real), -x.dual / math.sqrt((1 - x.real) * (1 + x.real)))
+        return impl
+
+    @method("arctan")
+    def dual_arctan(x):
+        return lambda x: Dual(math.atan(x.real), x.dual / (1 + x.real * x.real))
+
+    @method("arctan2")
+    def dual_arctan2(y, x):
+        if isinstance(x, DualType):
+            def impl(y, x):
+                r2 = y.real * y.real + x.real * x.real
+                if r2 == 0:
+                    raise ValueError("arctan2 is not defined when both real parts are 0")
+                return Dual(math.atan2(y.real, x.real), (x.real * y.dual - y.real * x.dual) / r2)
+            return impl
+        if is_scalar(x):
+            return lambda y, x: y.arctan2(Dual(x, 0.0))
+
+    @method("hypot")
+    def dual_hypot(a, b):
+        if isinstance(b, DualType):
+            def impl(a, b):
+                new_real = math.hypot(a.real, b.real)
+                if new_real == 0:
+                    raise ValueError("hypot is not differentiable when both real parts are 0")
+                return Dual(new_real, (a.real * a.dual + b.real * b.dual) / new_real)
+            return impl
+        if is_scalar(b):
+            return lambda a, b: a.hypot(Dual(b, 0.0))
+
+    @method("cbrt")
+    def dual_cbrt(x):
+        def impl(x):
+            if x.real == 0:
+                raise ValueError("cube root is not differentiable for a zero real part")
+            new_real = math.copysign(abs(x.real) ** (1 / 3), x.real)
+            return Dual(new_real, x.dual / (3 * new_real * new_real))
+        return impl
+
+    @method("log1p")
+    def dual_log1p(x):
+        def impl(x):
+            if x.real <= -1:
+                raise ValueError("log1p is not defined for real parts less than or equal to -1")
+            return Dual(math.log1p(x.real), x.dual / (1 + x.real))
+        return impl
+
+    @method("expm1")
+    def dual_expm1(x):
+        def impl(x):
+            new_real = math.expm1(x.real)
+            if math.isinf(new_real):
+                raise ValueError("exponential overflows")
+            return Dual(new_real, x.dual * (new_real + 1))
+        return impl
+
+    @method("log10")
+    def dual_log10(x):
+        def impl(x):
+            if x.real <= 0:
+                raise ValueError("Logarithm is not defined for non-positive real parts")
+            return Dual(math.log10(x.real), x.dual / (x.real * dual._LN10))
+        return impl
+
+    @method("log2")
+    def dual_log2(x):
+        def impl(x):
+            if x.real <= 0:
+                raise ValueError("Logarithm is not defined for non-positive real parts")
+            return Dual(math.log2(x.real), x.dual / (x.real * dual._LN2))
+        return impl
+
+    @method("erf")
+    def dual_erf(x):
+        return lambda x: Dual(math.erf(x.real), x.dual * dual._TWO_OVER_SQRT_PI * math.exp(-x.real * x.real))
+
+    @method("erfc")
+    def dual_erfc(x):
+        return lambda x: Dual(math.erfc(x.real), -x.dual * dual._TWO_OVER_SQRT_PI * math.exp(-x.real * x.real))
+
+    @method("sigmoid")
+    def dual_sigmoid(x):
+        def impl(x):
+            new_real = sigmoid(x.real)
+            return Dual(new_real, x.dual * new_real * (1 - new_real))
+        return impl
+
+    @method("softplus")
+    def dual_softplus(x):
+        def impl(x):
+            new_real = max(x.real, 0.0) + math.log1p(math.exp(-abs(x.real)))
+            return Dual(new_real, x.dual * sigmoid(x.real))
+        return impl
+
+    # functions registered with dual_autodiff.primitive, including those registered after this module is imported
+    from dual_autodiff import primitives
+
+    def register_primitive(p):
+        _overload_primitive(overload, p, DualType, is_scalar)
+
+    for p in list(primitives._REGISTRY.values()):
+        register_primitive(p)
+    primitives._HOOKS.append(register_primitive)
+
+    return dual_type
+
+
+
+def _overload_ordering(overload, op, DualType, is_scalar):
+    """
+    Registers an ordering comparison `op` of dual numbers, which compares the real parts
+    """
+
+    @overload(op)
+    def dual_ordering(a, b):
+        if isinstance(a, DualType) and isinstance(b, DualType):
+            return lambda a, b: op(a.real, b.real)
+        if isinstance(a, DualType) and is_scalar(b):
+            return lambda a, b: op(a.real, b)
+        if is_scalar(a) and isinstance(b, DualType):
+            return lambda a, b: op(a, b.real)
+
+
+
+def _overload_primitive(overload, p, DualType, is_scalar):
+    """
+    Registers the registered function of the Primitive `p` for dual numbers and scalars, compiling its value, derivative
+    and domain functions
+    """
+
+    from numba.core.dispatcher import Dispatcher
+
+    def compiled(function):
+        return function if isinstance(function, Dispatcher) else numba.njit(function)
+
+    value = compiled(p.value)
+    derivative = compiled(p.derivative)
+    domain = None if p.domain is None else compiled(p.domain)
+    message = p._message
+
+    @overload(p.function)
+    def dual_primitive(x):
+        if isinstance(x, DualType):
+            if domain is None:
+                return lambda x: Dual(value(x.real), x.dual * derivative(x.real))
+            def impl(x):
+                if not domain(x.real):
+                    raise ValueError(message)
+                return Dual(value(x.real), x.dual * derivative(x.real))
+            return impl
+        if is_scalar(x):
+            return lambda x: value(x)
+
+
+
+# the numba type of dual numbers, for declaring typed containers such as numba.typed.List.empty_list(dual_type), or
+# None when numba is not installed
+dual_type = _register() if AVAILABLE else None
@@ -0,0 +1,387 @@
+import numpy as np
+
+from dual_autodiff.array import DualArray, _planes
+
+
+# integrators for ordinary differential equations dy/dt = f(t, y, *args) whose state is a DualArray. Dual parts in the
+# initial state or the parameters are carried through every stage, so each solution comes with its forward
+# sensitivities from the same pass, and a batch of trajectories (a family of initial states or parameters held along
+# trailing axes of the state) is integrated at once with shared steps.
+
+
+# Dormand-Prince 5(4) coefficients, the nodes, the stage matrix, the fifth order weights and the difference between the
+# fifth and fourth order weights which estimates the local error
+_C = (0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1)
+_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_E = (71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+
+
+def _state(value):
+    """
+    Converts a state or a derivative returned by f to a DualArray. Sequences are stacked along a new first axis, after
+    broadcasting their items together, so f may return a list of its components.
+    """
+
+    if isinstance(value, DualArray):
+        return value
+    if isinstance(value, (list, tuple)):
+        parts = [_state(v) for v in value]
+        reals = np.broadcast_arrays(*[p.real for p in parts])
+        duals = np.broadcast_arrays(*[np.broadcast_to(p.dual, p.real.shape) for p in parts])
+        return DualArray._new(np.stack(reals), np.stack(duals))
+
+    real, dual = _planes(value)
+    if real is None:
+        raise TypeError("a state must be a DualArray, Dual, number, array or a sequence of them, not {}".format(
+            type(value)))
+    return DualArray(real, 0 if dual is None else dual)
+
+
+
+def _start(f, t, y0, args):
+    """
+    Builds a copy of the initial state and its derivative. The state is broadcast to the shape of the derivative, so a
+    batch of parameters gives a batch of trajectories from a single initial state.
+    """
+
+    y = _state(y0)
+    dy = _state(f(t, y, *args))
+    shape = np.broadcast_shapes(y.shape, dy.shape)
+    y = DualArray._new(np.array(np.broadcast_to(y.real, shape)), np.array(np.broadcast_to(y.dual, shape)))
+    return y, _broadcast(dy, shape)
+
+
+
+def _broadcast(dy, shape):
+    """
+    Broadcasts a derivative which does not depend on every axis of the state to the shape of the state
+    """
+
+    if dy.shape == shape:
+        return dy
+    return DualArray._new(np.broadcast_to(dy.real, shape), np.broadcast_to(dy.dual, shape))
+
+
+
+def _derivative(f, t, y, args):
+    """
+    Evaluates the right hand side as a DualArray shaped like the state
+    """
+
+    return _broadcast(_state(f(t, y, *args)), y.shape)
+
+
+
+def _trajectory(n, y):
+    """
+    Allocates the planes holding `n` states shaped like `y`
+    """
+
+    return np.empty((n,) + y.shape, dtype=y.real.dtype), np.empty((n,) + y.shape, dtype=y.dual.dtype)
+
+
+
+def rk4(f, t, y0, args=(), substeps=1):
+    """
+    Integrates :math:`\\frac{dy}{dt} = f(t, y, *args)` with the classical fourth order Runge-Kutta method on a fixed grid
+
+    The state is a :class:`~dual_autodiff.array.DualArray`, so the dual parts of the initial state and of the
+    parameters in `args` are propagated with the solution: the dual part of the result is the derivative of the
+    solution in the seeded direction, exact up to the error of the method. This replaces finite difference
+    sensitivities, which need an extra integration per parameter and lose half their digits to cancellation.
+
+
+    Parameters
+    ----------
+    f : callable
+        The right hand side ``f(t, y, *args)``, where `y` is a DualArray holding the state. It returns the derivative
+        as a DualArray, a Dual, a number or a list of components (which are stacked along the first axis).
+    t : array_like
+        Increasing times at which the solution is returned, starting with the initial time
+    y0 : DualArray, Dual, array_like or list
+        The initial state. Components may be listed along the first axis and a batch of trajectories along further
+        axes, every trajectory takes the same steps. The state is broadcast to the shape of the derivative, so
+        DualArray parameters give one trajectory per parameter value.
+    args : tuple, optional
+        Extra arguments passed to `f`, typically parameters given as Dual numbers or DualArrays to differentiate with
+        respect to them
+    substeps : int, optional
+        The number of equal steps taken between consecutive times in `t`, defaults to 1
+
+
+    Returns
+    -------
+    DualArray
+        The solution at each time in `t`, with shape ``(len(t),) + y0.shape``
+
+
+    Examples
+    --------
+    The sensitivity of :math:`y' = -ky`, :math:`y(0) = 1` to :math:`k` at :math:`k = 2`
+
+    >>> from dual_autodiff import Dual
+    >>> y = rk4(lambda t, y, k: -k * y, np.linspace(0, 1, 101), 1.0, args=(Dual(2, 1),))
+    >>> round(float(y[-1].dual), 7)              # d/dk exp(-kt) = -t exp(-kt) at t = 1
+    -0.1353353
+    """
+
+    t = np.asarray(t, dtype=float)
+    if t.ndim != 1 or len(t) == 0:
+        raise ValueError("t must be a one dimensional array of times")
+    if substeps < 1:
+        raise ValueError("substeps must be at least 1")
+
+    # the state is a copy, as it is updated in place
+    y, k1 = _start(f, t[0], y0, args)
+    real, dual = _trajectory(len(t), y)
+    real[0] = y.real
+    dual[0] = y.dual
+
+    for i in range(1, len(t)):
+        h = (t[i] - t[i - 1]) / substeps
+        for j in range(substeps):
+            s = t[i - 1] + j * h
+            if k1 is None:
+                k1 = _derivative(f, s, y, args)
+            k2 = _derivative(f, s + h / 2, y + k1 * (h / 2), args)
+            k3 = _derivative(f, s + h / 2, y + k2 * (h / 2), args)
+            k4 = _derivative(f, s + h, y + k3 * h, args)
+
+            # the stages may be arrays f keeps hold of, so only the state is updated in place
+            y = _add(y, (k1 + k4 + (k2 + k3) * 2) * (h / 6))
+            k1 = None
+        real[i] = y.real
+        dual[i] = y.dual
+    return DualArray._new(real, dual)
+
+
+
+def _add(y, step):
+    """
+    Adds a step to the state, in place when the state is already in the precision of the result
+    """
+
+    if np.can_cast(step.real.dtype, y.real.dtype, "same_kind") and np.can_cast(step.dual.dtype, y.dual.dtype,
+                                                                                  "same_kind"):
+        y += step
+        return y
+    return y + step
+
+
+
+def _error_norm(error, y, y_new, rtol, atol):
+    """
+    The root mean square of the local error estimate relative to the tolerances, over both planes so that the
+    sensitivities are controlled as well as the solution. Lanes which are nan (points outside the domain of f under
+    the "nan" or "mask" policies) are ignored so they do not stall the other trajectories.
+    """
+
+    ratios = []
+    for plane, old, new in ((error.real, y.real, y_new.real), (error.dual, y.dual, y_new.dual)):
+        scale = atol + rtol * np.maximum(np.abs(old), np.abs(new))
+        ratios.append(np.ravel(np.abs(plane) / scale))
+    ratios = np.concatenate(ratios)
+    ratios = ratios[~np.isnan(ratios)]
+    if ratios.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(ratios * ratios)))
+
+
+
+def rk45(f, t_span, y0, args=(), t_eval=None, rtol=1e-6, atol=1e-9, first_step=None, max_steps=100000):
+    """
+    Integrates :math:`\\frac{dy}{dt} = f(t, y, *args)` with the adaptive Dormand-Prince 5(4) Runge-Kutta method
+
+    As for :func:`rk4` the state is a DualArray and the dual parts of the initial state and parameters are carried
+    through every stage, giving forward sensitivities in the same pass. The local error is controlled in both the real
+    and the dual planes, so the sensitivities meet the tolerances as well as the solution. The step size is a plain
+    float chosen from the error estimate and is shared by every trajectory in a batch.
+
+
+    Parameters
+    ----------
+    f : callable
+        The right hand side ``f(t, y, *args)``, see :func:`rk4`
+    t_span : tuple of float
+        The initial and final times ``(t0, t1)``, with ``t1 > t0``
+    y0 : DualArray, Dual, array_like or list
+        The initial state, see :func:`rk4`
+    args : tuple, optional
+        Extra arguments passed to `f`
+    t_eval : array_like, optional
+        Increasing times within `t_span` at which to return the solution. The steps are shortened to land on each of
+        them. Defaults to every accepted step.
+    rtol, atol : float, optional
+        The relative and absolute tolerances of the local error
+    first_step : float, optional
+        The size of the first step tried, defaults to a hundredth of the interval
+    max_steps : int, optional
+        The largest number of steps (accepted or rejected) before giving up
+
+
+    Returns
+    -------
+    t : numpy.ndarray
+        The times of the solution, `t_eval` if given
+    y : DualArray
+        The solution at each time, with shape ``(len(t),) + y0.shape``
+
+
+    Raises
+    ------
+    ValueError
+        If `t_span` is empty or `t_eval` is not increasing and within it.
+    RuntimeError
+        If the integration needs more than `max_steps` steps.
+    """
+
+    t0, t1 = map(float, t_span)
+    if not t1 > t0:
+        raise ValueError("t_span must be increasing, got {}".format(t_span))
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=float)
+        if t_eval.ndim != 1 or np.any(np.diff(t_eval) <= 0) or (t_eval.size and (t_eval[0] < t0 or t_eval[-1] > t1)):
+            raise ValueError("t_eval must be increasing and within t_span")
+
+    y, dy = _start(f, t0, y0, args)
+    times, reals, duals = [], [], []
+
+    def record(t, y):
+        times.append(t)
+        reals.append(y.real.copy())
+        duals.append(y.dual.copy())
+
+    # the outputs still to be reached, with the end of the interval as the last stop
+    stops = list(t_eval) if t_eval is not None else []
+    if t_eval is None:
+        record(t0, y)
+    else:
+        while stops and stops[0] == t0:
+            record(stops.pop(0), y)
+    if not stops or stops[-1] != t1:
+        stops.append(t1)
+
+    t = t0
+    h = (t1 - t0) / 100 if first_step is None else float(first_step)
+    k = [dy] + [None] * 6
+    for _ in range(max_steps):
+        if not stops:
+            break
+        stop = stops[0]
+        # steps are shortened to land on the next stop, and stretched slightly to avoid a tiny final step
+        step = stop - t if t + 1.01 * h >= stop else h
+
+        for i in range(1, 7):
+            increment = k[0] * (_A[i][0] * step)
+            for a, ki in zip(_A[i][1:], k[1:i]):
+                if a:
+                    increment += ki * (a * step)
+            y_new = y + increment
+            k[i] = _derivative(f, t + _C[i] * step, y_new, args)
+        # the last stage is evaluated at the fifth order solution y_new, so it is the first stage of the next step
+
+        error = k[0] * (_E[0] * step)
+        for e, ki in zip(_E[1:], k[1:]):
+            if e:
+                error += ki * (e * step)
+        norm = _error_norm(error, y, y_new, rtol, atol)
+
+        if norm <= 1:
+            reached = step == stop - t
+            t = stop if reached else t + step
+            y = y_new
+            k[0] = k[6]
+            if reached:
+                stops.pop(0)
+            if reached or t_eval is None:
+                record(t, y)
+        # the usual safety factor, and limits on how quickly the step may change
+        factor = 5.0 if norm == 0 else min(5.0, max(0.2, 0.9 * norm ** -0.2))
+        h = step * factor
+        if t + h == t:
+            raise RuntimeError("rk45 step size underflowed at t = {}".format(t))
+    else:
+        if stops:
+            raise RuntimeError("rk45 did not reach t = {} within {} steps".format(t1, max_steps))
+
+    if t_eval is not None:
+        # the end of the interval is always a stop, but only an output when requested
+        keep = len(t_eval)
+        times, reals, duals = times[:keep], reals[:keep], duals[:keep]
+    return np.array(times), DualArray._new(np.stack(reals), np.stack(duals))
+
+
+
+def sensitivities(f, t, y0, params, method="rk45", **options):
+    """
+    Integrates with each parameter seeded in turn and returns the solution together with its Jacobian with respect to
+    the parameters, from a single vectorised integration
+
+    A trailing batch axis of length ``len(params)`` is added to the state, and parameter :math:`j` carries a unit dual
+    part in lane :math:`j` only, so lane :math:`j` of the dual plane of the solution is
+    :math:`\\partial y / \\partial p_j`.
+
+
+    Parameters
+    ----------
+    f : callable
+        The right hand side ``f(t, y, *params)``. Each parameter arrives as a DualArray of shape ``(len(params),)``,
+        so f must broadcast its components against that batch axis, as ``y[i]`` does.
+    t : array_like or tuple
+        The times of the solution for ``method="rk4"``, or the ``t_span`` for ``method="rk45"``
+    y0 : array_like
+        The initial state, real numbers with the components along the first axis
+    params : sequence of float
+        The values of the parameters
+    method : str, optional
+        ``"rk45"`` (the default) or ``"rk4"``
+    **options
+        Further arguments of :func:`rk45` or :func:`rk4`
+
+
+    Returns
+    -------
+    t : numpy.ndarray
+        The times of the solution
+    y : numpy.ndarray
+        The solution, with shape ``(len(t),) + y0.shape``
+    jacobian : numpy.ndarray
+        The derivatives of the solution with respect to the parameters, with shape
+        ``(len(t),) + y0.shape + (len(params),)``
+
+
+    Examples
+    --------
+    >>> def oscillator(t, y, k):
+    ...     return [y[1], -k * y[0]]
+    >>> t, y, jac = sensitivities(oscillator, (0, 1), [1.0, 0.0], [4.0], t_eval=[1.0])
+    >>> round(float(jac[-1, 0, 0]), 4)     # d/dk cos(sqrt(k) t) = -t sin(sqrt(k) t) / (2 sqrt(k)) at t = 1
+    -0.2273
+    """
+
+    params = [float(p) for p in params]
+    n = len(params)
+    seeds = np.eye(n)
+    seeded = tuple(DualArray(np.full(n, p), seeds[j]) for j, p in enumerate(params))
+
+    y0 = np.asarray(y0, dtype=float)
+    start = DualArray(np.repeat(y0[..., np.newaxis], n, axis=-1), 0)
+
+    if method == "rk45":
+        times, y = rk45(f, t, start, args=seeded, **options)
+    elif method == "rk4":
+        times = np.asarray(t, dtype=float)
+        y = rk4(f, times, start, args=seeded, **options)
+    else:
+        raise ValueError("unknown method {}, expected 'rk45' or 'rk4'".format(method))
+    # every lane holds the same solution, only the seeded directions differ
+    return times, y.real[..., 0], y.dual
@@ -0,0 +1,142 @@
+import enum
+from contextlib import contextmanager
+
+from dual_autodiff import dual
+from dual_autodiff.settings import DOMAIN_POLICIES, config, set_config
+
+
+
+class ErrorCode(enum.IntEnum):
+    """
+    The reason an element of a :class:`~dual_autodiff.array.DualArray` is invalid, as recorded in its
+    :attr:`~dual_autodiff.array.DualArray.errors` under the ``"mask"`` domain policy
+
+    An element keeps the code of the first rule it broke, so an element computed from an invalid element carries the
+    code of the original failure. An element combining several invalid elements, such as the result of a reduction,
+    keeps the code of the first operand to be invalid, and along an axis the code of the first invalid element in
+    index order.
+    """
+
+    # the element is valid
+    OK = 0
+    # a nan or infinite component was given when the array was built
+    NON_FINITE = 1
+    # division by a dual number with a zero real part
+    ZERO_DIVISION = 2
+    # the logarithm of a non-positive real part (log, log10, log2 and log1p)
+    LOG_DOMAIN = 3
+    # the square root of a non-positive real part
+    SQRT_DOMAIN = 4
+    # 0 raised to the power 0, in the real part or in the derivative of 0^1
+    ZERO_TO_ZERO = 5
+    # a negative base raised to a fractional power or to a power with a dual part
+    NEGATIVE_BASE = 6
+    # 0 raised to a negative, fractional or non-integer complex power or to a power with a dual part
+    ZERO_BASE = 7
+    # the tangent at a pole, pi/2 + n*pi
+    TAN_POLE = 8
+    # arcsin or arccos of a real part outside of (-1, 1)
+    INVERSE_TRIG_DOMAIN = 9
+    # abs, cbrt, hypot, arctan2 or norm where they are not differentiable
+    NOT_DIFFERENTIABLE = 10
+    # a result of exp, expm1, sinh or cosh which overflows
+    OVERFLOW = 11
+    # a real part outside the domain of a function registered with dual_autodiff.primitive
+    PRIMITIVE_DOMAIN = 12
+
+
+
+def get_domain_policy():
+    """
+    Returns the domain policy currently in use
+
+
+    Returns
+    -------
+    str
+        One of ``"raise"``, ``"nan"``, ``"mask"`` or ``"off"``
+    """
+
+    return dual._DOMAIN_POLICY.get()
+
+
+
+def set_domain_policy(policy):
+    """
+    Sets how operations on dual numbers respond to points outside of their domain, such as the logarithm of a negative
+    number or a division by zero
+
+    - ``"raise"`` (the default) raises the exception documented by the operation.
+    - ``"nan"`` gives a result with nan components for the invalid points and carries on, so one bad point in a batch
+      does not abort the whole run.
+    - ``"mask"`` behaves like ``"nan"`` and additionally records the invalid elements of a
+      :class:`~dual_autodiff.array.DualArray` in its ``mask``, which is propagated through later operations, along with
+      an :class:`ErrorCode` for each element in its ``errors`` saying which rule failed. A scalar dual number has a
+      single element, so for scalars it is the same as ``"nan"``.
+    - ``"off"`` skips the domain checks entirely. This is the fastest, but invalid points give whatever the underlying
+      :mod:`math` or numpy function gives, which may be an exception, an infinity or nan.
+
+    The policy applies to :class:`~dual_autodiff.dual.Dual` on every backend, to
+    :class:`~dual_autodiff.complex_dual.ComplexDual` and to :class:`~dual_autodiff.array.DualArray`. It is part of
+    the settings of :func:`~dual_autodiff.settings.config`, so it only changes the policy of the current thread or
+    asyncio task.
+
+
+    Parameters
+    ----------
+    policy : str
+        One of ``"raise"``, ``"nan"``, ``"mask"`` or ``"off"``
+
+
+    Returns
+    -------
+    str
+        The previous policy
+
+
+    Raises
+    ------
+    ValueError
+        If `policy` is not a known policy.
+
+
+    Examples
+    --------
+    >>> from dual_autodiff import Dual
+    >>> previous = set_domain_policy("nan")
+    >>> Dual(-1, 1).log()
+    Dual(nan, nan)
+    >>> set_domain_policy(previous)
+    'nan'
+    """
+
+    return set_config(domain=policy).domain
+
+
+
+@contextmanager
+def domain_policy(policy):
+    """
+    Context manager which uses a domain policy within its body and restores the previous policy on exit, see
+    :func:`set_domain_policy`
+
+
+    Parameters
+    ----------
+    policy : str
+        One of ``"raise"``, ``"nan"``, ``"mask"`` or ``"off"``
+
+
+    Examples
+    --------
+    >>> from dual_autodiff import DualArray
+    >>> with domain_policy("mask"):
+    ...     y = DualArray([-1.0, 1.0], 1).log()
+    >>> y.mask
+    array([ True, False])
+    >>> ErrorCode(y.errors[0])
+    <ErrorCode.LOG_DOMAIN: 3>
+    """
+
+    with config(domain=policy):
+        yield
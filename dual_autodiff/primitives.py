@@ -0,0 +1,257 @@
+import functools
+import math
+import sys
+
+from dual_autodiff.policy import get_domain_policy
+from dual_autodiff.settings import get_config
+
+
+# user defined elementary functions. A primitive is given by its value and its derivative as functions of a real number
+# (and optionally as vectorised numpy functions), from which the first order rule f(a + b eps) = f(a) + b f'(a) eps is
+# applied to scalar dual numbers, DualArrays and, through the numba extension, dual numbers in compiled code. This is
+# faster and more accurate than composing a special function from the built in ones. Like the reductions, the scalar
+# path never imports numpy.
+
+
+# the registered primitives by name
+_REGISTRY = {}
+
+# functions called with each Primitive as it is registered, the numba extension adds one to compile them
+_HOOKS = []
+
+
+
+class Primitive:
+    """
+    The definition of a function registered with :func:`primitive`, available as the ``primitive`` attribute of the
+    registered function
+
+
+    Attributes
+    ----------
+    name : str
+        The name the function is registered under
+    function : callable
+        The registered function, which applies the primitive to numbers, dual numbers and arrays
+    value : callable
+        The value of the function at a real (or complex) number
+    derivative : callable
+        The derivative of the function at a real (or complex) number
+    vectorised : callable
+        The value of the function at every element of a numpy array
+    vectorised_derivative : callable
+        The derivative of the function at every element of a numpy array
+    domain : callable or None
+        Returns whether the function is differentiable at a real part, elementwise for arrays, or None if it is
+        differentiable everywhere
+    """
+
+    def __init__(self, name, value, derivative, vectorised, vectorised_derivative, domain):
+        self.name = name
+        self.function = None
+        self.value = value
+        self.derivative = derivative
+        self.vectorised = vectorised
+        self.vectorised_derivative = vectorised_derivative
+        self.domain = domain
+        self._message = "{} is not defined for this real part".format(name)
+
+
+    def __repr__(self):
+        return "Primitive({!r})".format(self.name)
+
+
+    def apply(self, x):
+        """
+        Evaluates the primitive at a number, dual number, numpy array or DualArray
+        """
+
+        if isinstance(x, (int, float, complex)):
+            return self.value(x)
+        if _is_dual_array(x):
+            return self._apply_array(x)
+        if hasattr(x, "real") and hasattr(x, "dual"):
+            return self._apply_scalar(x)
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(x, (numpy.ndarray, numpy.generic)):
+            return self.vectorised(x)
+        raise TypeError("{} can only be applied to numbers, dual numbers and arrays, not {}".format(self.name, type(x)))
+
+
+    def _apply_scalar(self, x):
+        """
+        Applies the first order rule to a scalar dual number
+        """
+
+        if isinstance(x.real, complex) or isinstance(x.dual, complex):
+            from dual_autodiff.complex_dual import ComplexDual
+            cls = ComplexDual
+        else:
+            cls = get_config().Dual
+        if self.domain is not None and get_domain_policy() != "off" and not self.domain(x.real):
+            if get_domain_policy() == "raise":
+                raise ValueError(self._message)
+            return cls(math.nan, math.nan)
+        return cls(self.value(x.real), x.dual * self.derivative(x.real))
+
+
+    def _apply_array(self, x):
+        """
+        Applies the first order rule to every element of a DualArray with the vectorised functions
+        """
+
+        import numpy as np
+        from dual_autodiff.array import _check_domain
+        from dual_autodiff.policy import ErrorCode
+
+        invalid = None
+        if self.domain is not None and get_domain_policy() != "off":
+            invalid = _check_domain(~np.asarray(self.domain(x.real), dtype=bool), ValueError, self._message,
+                                    ErrorCode.PRIMITIVE_DOMAIN)
+        # the functions are only evaluated at the valid elements, as they may raise outside of the domain
+        valid = None if invalid is None else np.broadcast_to(invalid == 0, x.shape)
+        new_real = _evaluate(self.vectorised, x.real, valid)
+        new_dual = x.dual * _evaluate(self.vectorised_derivative, x.real, valid)
+        return x._unary(new_real, new_dual, invalid)
+
+
+
+def _is_dual_array(values):
+    """
+    Whether `values` is a DualArray, without importing the array module (and numpy) if it has not been used
+    """
+
+    array = sys.modules.get("dual_autodiff.array")
+    return array is not None and isinstance(values, array.DualArray)
+
+
+
+def _evaluate(function, real, valid):
+    """
+    Evaluates a vectorised function at the `valid` elements of `real` (or every element if None), with nan elsewhere
+    """
+
+    import numpy as np
+
+    if valid is None:
+        return np.asarray(function(real))
+    values = np.asarray(function(real[valid]))
+    result = np.full(real.shape, np.nan, dtype=values.dtype if values.dtype.kind in "fc" else np.float64)
+    result[valid] = values
+    return result
+
+
+
+def _vectorise(function):
+    """
+    Applies a scalar function to every element of a numpy array, for primitives registered without a vectorised form
+    """
+
+    import numpy as np
+
+    def vectorised(values):
+        values = np.asarray(values)
+        result = np.frompyfunc(function, 1, 1)(values)
+        return np.asarray(result, dtype=complex if values.dtype.kind == "c" else float)
+    return vectorised
+
+
+
+def primitive(derivative, vectorised=None, vectorised_derivative=None, domain=None, name=None):
+    """
+    Decorator registering a function of one real number as a primitive, so that it can be applied to dual numbers
+
+    The decorated function gives the value and `derivative` its derivative. The registered function takes a number,
+    a :class:`~dual_autodiff.dual.Dual` (or :class:`~dual_autodiff.complex_dual.ComplexDual`), a numpy array or a
+    :class:`~dual_autodiff.array.DualArray` and applies :math:`f(a + b\\epsilon) = f(a) + b f'(a)\\epsilon`. Arrays
+    use the `vectorised` and `vectorised_derivative` functions, such as numpy ufuncs, when they are given and otherwise
+    call the scalar functions for each element, which is much slower. Functions compiled with
+    :func:`dual_autodiff.numba.jit` can call the registered function on dual numbers too, in which case the scalar
+    functions must themselves be compilable by numba.
+
+    Points where `domain` is false follow the domain policy like the built in functions, raising a ValueError by
+    default or giving nan (recorded as ``ErrorCode.PRIMITIVE_DOMAIN`` in the ``errors`` of a DualArray under the
+    ``"mask"`` policy). Compiled code always raises. Registering a function with the name of an existing primitive
+    replaces it.
+
+
+    Parameters
+    ----------
+    derivative : callable
+        The derivative of the function at a real number
+    vectorised : callable, optional
+        The value of the function at every element of a numpy array
+    vectorised_derivative : callable, optional
+        The derivative of the function at every element of a numpy array
+    domain : callable, optional
+        Returns whether the function is differentiable at a real part, applied elementwise to numpy arrays, defaults to
+        everywhere
+    name : str, optional
+        The name to register the function under, defaults to the name of the decorated function
+
+
+    Returns
+    -------
+    callable
+        A decorator returning the registered function, whose ``primitive`` attribute is its :class:`Primitive`
+
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from dual_autodiff import Dual, DualArray
+    >>> @primitive(derivative=lambda x: -2 * x * math.exp(-x * x), vectorised=lambda x: np.exp(-x * x),
+    ...            vectorised_derivative=lambda x: -2 * x * np.exp(-x * x))
+    ... def gaussian(x):
+    ...     return math.exp(-x * x)
+    >>> gaussian(Dual(1.0, 1.0))
+    Dual(0.36787944117144233, -0.7357588823428847)
+    >>> gaussian(DualArray([0.5, 1.0], 1)).dual
+    array([-0.77880078, -0.73575888])
+    """
+
+    def register(value):
+        p = Primitive(name or value.__name__, value, derivative, vectorised, vectorised_derivative, domain)
+        if p.vectorised is None:
+            p.vectorised = _vectorise(value)
+        if p.vectorised_derivative is None:
+            p.vectorised_derivative = _vectorise(derivative)
+
+        @functools.wraps(value)
+        def function(x):
+            return p.apply(x)
+
+        function.primitive = p
+        p.function = function
+        _REGISTRY[p.name] = p
+        for hook in _HOOKS:
+            hook(p)
+        return function
+
+    return register
+
+
+
+def get_primitive(name):
+    """
+    Returns the function registered as the primitive `name`
+
+
+    Raises
+    ------
+    KeyError
+        If no primitive is registered under `name`.
+    """
+
+    if name not in _REGISTRY:
+        raise KeyError("no primitive is registered as {!r}".format(name))
+    return _REGISTRY[name].function
+
+
+
+def registered():
+    """
+    Returns the names of the registered primitives
+    """
+
+    return sorted(_REGISTRY)
@@ -0,0 +1,253 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from dual_autodiff.backends import Dual
+
+
+# profiles that are currently collecting, every instrumented call is recorded into each of them
+_active = []
+
+# the original (un-instrumented) attributes of each instrumented class, restored once the last profile exits
+_originals = {}
+
+# per thread stack used to work out how much of a call's time was spent in nested instrumented calls
+_local = threading.local()
+
+# dunder methods that are never instrumented, either because they are called by the interpreter for bookkeeping or because
+# wrapping them would change the behaviour of the class
+_SKIPPED = {"__new__", "__init_subclass__", "__subclasshook__", "__class_getitem__", "__getattribute__", "__getattr__",
+            "__setattr__", "__delattr__", "__dir__", "__reduce__", "__reduce_ex__", "__sizeof__", "__hash__"}
+
+
+class Profile:
+    """
+    Call counts and timings collected for the operations of a dual number class while profiling is enabled.
+
+    Times are recorded with :func:`time.perf_counter`. The *total* time of an operation includes the time spent in any
+    instrumented operation it calls (for example ``__rpow__`` calls ``__pow__``), whilst the *own* time
+    excludes it, so summing own times never double counts.
+
+
+    Attributes
+    ----------
+    calls : dict
+        Number of calls made to each operation, keyed by ``"Class.method"``
+    total_time : dict
+        Inclusive time in seconds spent in each operation
+    own_time : dict
+        Exclusive time in seconds spent in each operation
+
+
+    Examples
+    --------
+    >>> from dual_autodiff import Dual
+    >>> with profile() as p:
+    ...     y = Dual(1, 1).sin() * 2
+    >>> p.calls["Dual.sin"]
+    1
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.total_time = {}
+        self.own_time = {}
+
+
+    def _record(self, key, total, own):
+        """
+        Adds a single call of the operation `key` to the profile
+        """
+
+        self.calls[key] = self.calls.get(key, 0) + 1
+        self.total_time[key] = self.total_time.get(key, 0.0) + total
+        self.own_time[key] = self.own_time.get(key, 0.0) + own
+
+
+    def top(self, n=10, by="own"):
+        """
+        Returns the operations which dominate the profile
+
+
+        Parameters
+        ----------
+        n : int
+            The number of operations to return
+        by : str
+            What to sort by, one of ``"own"``, ``"total"`` or ``"calls"``
+
+
+        Returns
+        -------
+        list of tuple
+            ``(name, calls, total_time, own_time)`` for the `n` largest operations, largest first
+
+
+        Raises
+        ------
+        ValueError
+            If `by` is not one of the supported keys.
+        """
+
+        if by == "own":
+            key = self.own_time.get
+        elif by == "total":
+            key = self.total_time.get
+        elif by == "calls":
+            key = self.calls.get
+        else:
+            raise ValueError("can only sort by 'own', 'total' or 'calls', not {}".format(by))
+
+        names = sorted(self.calls, key=key, reverse=True)[:n]
+        return [(name, self.calls[name], self.total_time[name], self.own_time[name]) for name in names]
+
+
+    def report(self, n=10, by="own"):
+        """
+        Returns a table of the top `n` operations as a string
+
+
+        Parameters
+        ----------
+        n : int
+            The number of operations to include
+        by : str
+            What to sort by, one of ``"own"``, ``"total"`` or ``"calls"``
+
+
+        Returns
+        -------
+        str
+            The formatted table
+        """
+
+        lines = ["{:<24} {:>10} {:>12} {:>12}".format("operation", "calls", "total (s)", "own (s)")]
+        for name, calls, total, own in self.top(n, by):
+            lines.append("{:<24} {:>10d} {:>12.6f} {:>12.6f}".format(name, calls, total, own))
+        return "\n".join(lines)
+
+
+    def __str__(self):
+        return self.report()
+
+
+
+def _instrument(cls, name, func):
+    """
+    Wraps a single method of `cls` so that calls to it are recorded into every active profile
+    """
+
+    key = "{}.{}".format(cls.__name__, name)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+
+        # the slot at the top of the stack accumulates the time spent in instrumented calls made by this call
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            for p in _active:
+                p._record(key, elapsed, elapsed - nested)
+
+    return wrapper
+
+
+
+def _install(cls):
+    """
+    Replaces the methods of `cls` with instrumented versions, remembering the originals
+    """
+
+    originals = {}
+    for name, attr in list(vars(cls).items()):
+        if name in _SKIPPED or not callable(attr):
+            continue
+        # only instrument public methods and the special methods that implement operators and construction
+        if name.startswith("_") and not (name.startswith("__") and name.endswith("__")):
+            continue
+        originals[name] = attr
+        setattr(cls, name, _instrument(cls, name, attr))
+    _originals[cls] = originals
+
+
+
+def _uninstall(cls):
+    """
+    Restores the original methods of `cls`
+    """
+
+    for name, attr in _originals.pop(cls).items():
+        setattr(cls, name, attr)
+
+
+
+@contextmanager
+def profile(*classes):
+    """
+    Context manager which counts and times every operation performed on dual numbers within its body
+
+    Profiling works by swapping the methods of the profiled classes for instrumented versions on entry and restoring the
+    originals on exit. Outside of a ``with profile()`` block the classes are untouched, so leaving this available costs
+    nothing. Profiles may be nested, in which case each records the calls made within its own block.
+
+
+    Parameters
+    ----------
+    *classes : type
+        The classes to instrument, defaults to the :class:`Dual` class of the selected backend (``dual_autodiff.Dual``)
+
+
+    Yields
+    ------
+    Profile
+        The profile which calls are recorded into
+
+
+    Notes
+    -----
+    - Instrumentation replaces methods on the class itself, so calls made by other threads while the block is active are
+      also recorded.
+    - Construction is recorded under ``"Dual.__init__"``.
+
+
+    Examples
+    --------
+    >>> from dual_autodiff import Dual
+    >>> with profile() as p:
+    ...     x = Dual(0.5, 1)
+    ...     y = (x * x).sin() + x.log()
+    >>> print(p.report(3))                  # doctest: +SKIP
+    operation                     calls    total (s)      own (s)
+    Dual.__add__                      1     0.000012     0.000012
+    Dual.__mul__                      1     0.000011     0.000010
+    Dual.__init__                     5     0.000009     0.000009
+    """
+
+    if not classes:
+        classes = (Dual,)
+
+    p = Profile()
+    installed = []
+    for cls in classes:
+        if cls not in _originals:
+            _install(cls)
+            installed.append(cls)
+    _active.append(p)
+
+    try:
+        yield p
+    finally:
+        _active.remove(p)
+        # only the profile that instrumented a class restores it, so outer profiles keep recording
+        for cls in installed:
+            _uninstall(cls)
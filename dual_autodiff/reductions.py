@@ -0,0 +1,248 @@
+import math
+import sys
+
+from dual_autodiff.policy import get_domain_policy
+from dual_autodiff.settings import get_config
+
+
+# reductions over iterables of dual numbers. Both planes are summed with math.fsum, which is correctly rounded, so the
+# results are more accurate than folding __add__ over the items and no intermediate dual numbers are built. numpy is
+# only used (through DualArray) when a DualArray is reduced, so these functions keep the scalar core free of numpy.
+
+
+
+def _is_dual_array(values):
+    """
+    Whether `values` is a DualArray, without importing the array module (and numpy) if it has not been used
+    """
+
+    array = sys.modules.get("dual_autodiff.array")
+    return array is not None and isinstance(values, array.DualArray)
+
+
+
+def _split(values):
+    """
+    Splits an iterable of dual numbers and scalars into the class of the result and lists of real and dual parts
+    """
+
+    cls = get_config().Dual
+    reals = []
+    duals = []
+    for value in values:
+        if isinstance(value, (int, float)):
+            reals.append(value)
+            duals.append(0)
+        elif hasattr(value, "real") and hasattr(value, "dual"):
+            cls = type(value)
+            reals.append(value.real)
+            duals.append(value.dual)
+        else:
+            raise TypeError("can only reduce dual numbers and scalars, not {}".format(type(value)))
+    return cls, reals, duals
+
+
+
+def _fsum(values):
+    """
+    Compensated sum of real or complex numbers
+    """
+
+    if any(isinstance(v, complex) for v in values):
+        return complex(math.fsum(v.real for v in values), math.fsum(v.imag for v in values))
+    return math.fsum(values)
+
+
+
+def _domain_error(cls, error, message):
+    """
+    Handles a reduction evaluated outside of its domain according to the domain policy
+    """
+
+    if get_domain_policy() == "raise":
+        raise error(message)
+    return cls(math.nan, math.nan)
+
+
+
+def sum(values, axis=None):
+    """
+    Sums dual numbers, :math:`\\sum_i a_i + (\\sum_i b_i)\\epsilon`
+
+
+    Parameters
+    ----------
+    values : iterable or DualArray
+        Dual numbers and scalars, or a DualArray
+    axis : int or tuple of int, optional
+        For a DualArray, the axes to sum over, defaults to every axis
+
+
+    Returns
+    -------
+    Dual or DualArray
+        The sum
+
+
+    Examples
+    --------
+    >>> from dual_autodiff import Dual
+    >>> sum([Dual(0.1, 1), Dual(0.2, 2), 0.3])
+    Dual(0.6, 3.0)
+    """
+
+    if _is_dual_array(values):
+        return values.sum(axis)
+    cls, reals, duals = _split(values)
+    return cls(_fsum(reals), _fsum(duals))
+
+
+
+def prod(values, axis=None):
+    """
+    Multiplies dual numbers, :math:`\\prod_i a_i + (\\sum_i b_i \\prod_{j \\neq i} a_j)\\epsilon`
+
+    The products of the other real parts are formed from prefix and suffix products, so the derivative is exact when
+    some real parts are zero.
+
+
+    Parameters
+    ----------
+    values : iterable or DualArray
+        Dual numbers and scalars, or a DualArray
+    axis : int or tuple of int, optional
+        For a DualArray, the axis or axes to multiply along, defaults to every axis
+
+
+    Returns
+    -------
+    Dual or DualArray
+        The product
+    """
+
+    if _is_dual_array(values):
+        return values.prod(axis)
+    cls, reals, duals = _split(values)
+
+    # suffix[i] is the product of the real parts after i, and the prefix product is accumulated on the way forwards
+    suffix = [1] * (len(reals) + 1)
+    for i in range(len(reals) - 1, -1, -1):
+        suffix[i] = suffix[i + 1] * reals[i]
+
+    prefix = 1
+    terms = []
+    for i, d in enumerate(duals):
+        terms.append(d * prefix * suffix[i + 1])
+        prefix *= reals[i]
+    return cls(suffix[0], _fsum(terms))
+
+
+
+def mean(values, axis=None):
+    """
+    Averages dual numbers, the mean of the real parts and of the dual parts
+
+
+    Parameters
+    ----------
+    values : iterable or DualArray
+        Dual numbers and scalars, or a DualArray
+    axis : int or tuple of int, optional
+        For a DualArray, the axes to average over, defaults to every axis
+
+
+    Returns
+    -------
+    Dual or DualArray
+        The mean
+
+
+    Raises
+    ------
+    ValueError
+        If there are no values.
+    """
+
+    if _is_dual_array(values):
+        return values.mean(axis)
+    cls, reals, duals = _split(values)
+    if not reals:
+        raise ValueError("the mean of no values is not defined")
+    return cls(_fsum(reals) / len(reals), _fsum(duals) / len(duals))
+
+
+
+def norm(values, axis=None):
+    """
+    The Euclidean norm of dual numbers, :math:`\\sqrt{\\sum_i a_i^2} + \\frac{\\sum_i a_i b_i}{\\sqrt{\\sum_i a_i^2}}\\epsilon`,
+    computed without intermediate overflow or underflow
+
+
+    Parameters
+    ----------
+    values : iterable or DualArray
+        Dual numbers and scalars with real components, or a DualArray
+    axis : int or tuple of int, optional
+        For a DualArray, the axes to take the norm over, defaults to every axis
+
+
+    Returns
+    -------
+    Dual or DualArray
+        The norm
+
+
+    Raises
+    ------
+    ValueError
+        If every real part is zero, where the norm is not differentiable.
+    """
+
+    if _is_dual_array(values):
+        return values.norm(axis)
+    cls, reals, duals = _split(values)
+
+    new_real = math.hypot(*reals)
+    if new_real == 0 and get_domain_policy() != "off":
+        return _domain_error(cls, ValueError, "norm is not differentiable when every real part is 0")
+    return cls(new_real, math.fsum(a * b for a, b in zip(reals, duals)) / new_real)
+
+
+
+def logsumexp(values, axis=None):
+    """
+    Computes :math:`\\log\\sum_i e^{a_i}` without overflow, the derivative is the softmax weighted sum of the dual parts
+    :math:`\\sum_i \\frac{e^{a_i}}{\\sum_j e^{a_j}} b_i \\epsilon`
+
+
+    Parameters
+    ----------
+    values : iterable or DualArray
+        Dual numbers and scalars with real components, or a DualArray
+    axis : int or tuple of int, optional
+        For a DualArray, the axes to reduce over, defaults to every axis
+
+
+    Returns
+    -------
+    Dual or DualArray
+        The log of the sum of exponentials
+
+
+    Raises
+    ------
+    ValueError
+        If there are no values.
+    """
+
+    if _is_dual_array(values):
+        return values.logsumexp(axis)
+    cls, reals, duals = _split(values)
+    if not reals:
+        raise ValueError("logsumexp of no values is not defined")
+
+    # shifting by the largest real part keeps every exponential in [0, 1]
+    shift = max(reals)
+    weights = [math.exp(a - shift) for a in reals]
+    total = math.fsum(weights)
+    return cls(shift + math.log(total), math.fsum(w * b for w, b in zip(weights, duals)) / total)
@@ -0,0 +1,186 @@
+import contextvars
+from contextlib import contextmanager
+
+from dual_autodiff import backends, dual
+
+
+# the ways operations can respond to a point outside of their domain
+DOMAIN_POLICIES = ("raise", "nan", "mask", "off")
+
+
+
+class Config:
+    """
+    The settings used by dual number operations in the current context, see :func:`config`
+
+    Settings are held in a :class:`contextvars.ContextVar`, so each thread and each asyncio task sees its own settings
+    and changing them in one never affects another. A new thread starts with the defaults.
+
+
+    Attributes
+    ----------
+    check : bool
+        Whether DualArray construction checks its inputs are finite, defaults to True
+    domain : str
+        The domain policy, see :func:`~dual_autodiff.policy.set_domain_policy`
+    dtype : numpy.dtype or None
+        The precision of DualArrays constructed without an explicit dtype, None keeps the precision of the input
+    backend : str
+        The backend whose Dual class is returned by array indexing and reductions
+    Dual : type
+        The Dual class of `backend`
+    """
+
+    __slots__ = ("check", "domain", "dtype", "backend", "Dual")
+
+    def __init__(self, check, domain, dtype, backend, Dual):
+        self.check = check
+        self.domain = domain
+        self.dtype = dtype
+        self.backend = backend
+        self.Dual = Dual
+
+
+    def __repr__(self):
+        return "Config(check={!r}, domain={!r}, dtype={!r}, backend={!r})".format(
+            self.check, self.domain, self.dtype, self.backend)
+
+
+
+_CONFIG = contextvars.ContextVar("config", default=Config(True, "raise", None, backends.BACKEND, backends.Dual))
+
+
+
+def get_config():
+    """
+    Returns the settings of the current context
+
+    Batched operations read the settings once when they start, so for the lowest overhead read them once outside of a
+    loop rather than on every iteration.
+
+
+    Returns
+    -------
+    Config
+        The current settings
+    """
+
+    return _CONFIG.get()
+
+
+
+def _updated(check=None, domain=None, dtype=None, backend=None):
+    """
+    A copy of the current settings with the settings which are not None changed
+    """
+
+    current = _CONFIG.get()
+
+    if domain is None:
+        domain = current.domain
+    elif domain not in DOMAIN_POLICIES:
+        raise ValueError("unknown domain policy {}, expected one of {}".format(
+            domain, ", ".join("'{}'".format(p) for p in DOMAIN_POLICIES)))
+
+    if dtype is None:
+        dtype = current.dtype
+    else:
+        # imported here so that the settings, like the scalar Dual class, do not need numpy
+        from dual_autodiff.array import _plane_dtype
+        dtype = _plane_dtype(dtype)
+
+    if backend is None:
+        backend, Dual = current.backend, current.Dual
+    else:
+        backend = backends.resolve_backend(backend)
+        Dual = backends.load_backend(backend)
+
+    return Config(current.check if check is None else bool(check), domain, dtype, backend, Dual)
+
+
+
+def set_config(check=None, domain=None, dtype=None, backend=None):
+    """
+    Changes settings for the rest of the current context (thread or asyncio task), settings left as None are kept
+
+    Prefer the :func:`config` context manager, which restores the previous settings.
+
+
+    Parameters
+    ----------
+    check, domain, dtype, backend
+        See :func:`config`
+
+
+    Returns
+    -------
+    Config
+        The previous settings
+    """
+
+    previous = _CONFIG.get()
+    updated = _updated(check, domain, dtype, backend)
+    _CONFIG.set(updated)
+    dual._DOMAIN_POLICY.set(updated.domain)
+    return previous
+
+
+
+@contextmanager
+def config(check=None, domain=None, dtype=None, backend=None):
+    """
+    Context manager which changes the settings of dual number operations within its body
+
+    Settings are local to the current thread or asyncio task, so work running in a thread pool can use different
+    settings in each thread. Settings left as None keep their current value, and the previous settings are restored on
+    exit.
+
+
+    Parameters
+    ----------
+    check : bool, optional
+        Whether DualArray construction checks that its inputs are finite. Turning the check off saves a pass over the
+        data when the inputs are known to be valid.
+    domain : str, optional
+        The domain policy, one of ``"raise"``, ``"nan"``, ``"mask"`` or ``"off"``, see
+        :func:`~dual_autodiff.policy.set_domain_policy`
+    dtype : numpy.dtype, optional
+        The precision of DualArrays constructed without an explicit dtype
+    backend : str, optional
+        ``"auto"``, ``"cython"`` or ``"python"``, the backend whose Dual class is returned by array indexing and
+        reductions
+
+
+    Yields
+    ------
+    Config
+        The settings in use within the block
+
+
+    Raises
+    ------
+    ValueError
+        If `domain` or `backend` is not known.
+    ImportError
+        If the requested backend is not available.
+
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from dual_autodiff import DualArray
+    >>> with config(check=False, dtype=np.float32):
+    ...     x = DualArray([1, 2, 3], 1)
+    >>> x.dtype
+    dtype('float32')
+    """
+
+    updated = _updated(check, domain, dtype, backend)
+    token = _CONFIG.set(updated)
+    # the scalar Dual class reads the policy from its own context variable, which is kept in step with the settings
+    domain_token = dual._DOMAIN_POLICY.set(updated.domain)
+    try:
+        yield updated
+    finally:
+        dual._DOMAIN_POLICY.reset(domain_token)
+        _CONFIG.reset(token)
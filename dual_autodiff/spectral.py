@@ -0,0 +1,267 @@
+import math
+
+import numpy as np
+
+from dual_autodiff.array import _DUAL_TYPES, DualArray, _first_code, _merge_masks, _planes
+from dual_autodiff.complex_dual import ComplexDual
+
+
+# Fourier transforms and convolution of DualArrays. The transforms are linear, so the transform of a + b eps is
+# F(a) + F(b) eps and differentiating through a spectrum costs one numpy FFT of each plane. Convolution is bilinear, so
+# its dual part follows the product rule, conv(a, d) + conv(b, c) for (a + b eps) * (c + d eps).
+
+
+# convolution is computed directly while the work n * m is below this multiple of the FFT work L log2(L), measured for
+# numpy's convolve and pocketfft on float64 planes
+_FFT_THRESHOLD = 20
+
+_MODES = ("full", "same", "valid")
+
+
+
+def _as_dual_array(x, name):
+    """
+    Converts the argument of a transform to a DualArray, sequences of dual numbers are converted with from_duals and
+    numbers or arrays of numbers get a zero dual part
+    """
+
+    if isinstance(x, DualArray):
+        return x
+    if isinstance(x, (list, tuple)) and any(isinstance(v, _DUAL_TYPES + (ComplexDual,)) for v in x):
+        return DualArray.from_duals(x)
+    real, dual = _planes(x if isinstance(x, _DUAL_TYPES + (ComplexDual,)) else np.asarray(x))
+    if real is None:
+        raise TypeError("{} takes a DualArray, a sequence of dual numbers or an array of numbers, not {}".format(
+            name, type(x)))
+    return DualArray(real, 0 if dual is None else dual)
+
+
+
+def _transform(function, x, n, axis, norm, name):
+    """
+    Applies the numpy FFT `function` to both planes of `x`. Every output along `axis` depends on every input, so under
+    the "mask" policy a transform with an invalid element is marked with the code of its first invalid element.
+    """
+
+    x = _as_dual_array(x, name)
+    if x.ndim == 0:
+        raise ValueError("{} needs at least one dimension".format(name))
+    result = DualArray._new(function(x.real, n=n, axis=axis, norm=norm), function(x.dual, n=n, axis=axis, norm=norm))
+    invalid = None if x._mask is None else np.expand_dims(_first_code(x._mask, axis), axis)
+    return _merge_masks(result, invalid)
+
+
+
+def fft(x, n=None, axis=-1, norm=None):
+    """
+    Computes the discrete Fourier transform of dual numbers along an axis, see :func:`numpy.fft.fft`
+
+    The transform is linear, so the dual part of the result is the transform of the dual part and the derivative of a
+    spectrum costs a second FFT.
+
+
+    Parameters
+    ----------
+    x : DualArray, sequence of Dual or array_like
+        The dual numbers to transform, numbers have a zero dual part
+    n : int, optional
+        Length of the transformed axis, the input is cropped or padded with zeros to fit
+    axis : int
+        The axis to transform, the last by default
+    norm : str, optional
+        The normalisation, ``"backward"``, ``"ortho"`` or ``"forward"`` as for numpy
+
+
+    Returns
+    -------
+    DualArray
+        The transform, with complex planes
+
+
+    Examples
+    --------
+    >>> x = DualArray(np.cos(np.linspace(0, 2 * np.pi, 8, endpoint=False)), 1)
+    >>> fft(x).dual
+    array([8.+0.j, 0.+0.j, 0.+0.j, 0.+0.j, 0.+0.j, 0.+0.j, 0.+0.j, 0.+0.j])
+    """
+
+    return _transform(np.fft.fft, x, n, axis, norm, "fft")
+
+
+
+def ifft(x, n=None, axis=-1, norm=None):
+    """
+    Computes the inverse discrete Fourier transform of dual numbers along an axis, see :func:`numpy.fft.ifft` and
+    :func:`fft` for the parameters
+
+
+    Returns
+    -------
+    DualArray
+        The inverse transform, with complex planes
+    """
+
+    return _transform(np.fft.ifft, x, n, axis, norm, "ifft")
+
+
+
+def rfft(x, n=None, axis=-1, norm=None):
+    """
+    Computes the discrete Fourier transform of real dual numbers along an axis, keeping the non-negative frequencies,
+    see :func:`numpy.fft.rfft` and :func:`fft` for the parameters
+
+
+    Returns
+    -------
+    DualArray
+        The transform, with complex planes and ``n // 2 + 1`` elements along `axis`
+
+
+    Raises
+    ------
+    TypeError
+        If `x` has complex planes.
+    """
+
+    x = _as_dual_array(x, "rfft")
+    x._require_real("rfft")
+    return _transform(np.fft.rfft, x, n, axis, norm, "rfft")
+
+
+
+def irfft(x, n=None, axis=-1, norm=None):
+    """
+    Computes the inverse of :func:`rfft`, see :func:`numpy.fft.irfft` and :func:`fft` for the parameters
+
+
+    Returns
+    -------
+    DualArray
+        The inverse transform, with real planes and `n` elements along `axis` (``2 * (m - 1)`` for `m` input elements
+        by default)
+    """
+
+    return _transform(np.fft.irfft, x, n, axis, norm, "irfft")
+
+
+
+def _fast_length(n):
+    """
+    The smallest length of at least n whose only prime factors are 2, 3 and 5, which pocketfft transforms quickly
+    """
+
+    best = 1 << (n - 1).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            length = power35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+
+def _fft_convolve(planes, length, is_complex):
+    """
+    The full convolutions of each pair of planes in `planes`, summed, computed by multiplying their transforms
+    """
+
+    size = _fast_length(length)
+    if is_complex:
+        forward, inverse = np.fft.fft, np.fft.ifft
+    else:
+        forward, inverse = np.fft.rfft, np.fft.irfft
+    spectrum = sum(forward(u, size) * forward(v, size) for u, v in planes)
+    return inverse(spectrum, size)[:length]
+
+
+
+def convolve(a, v, mode="full", method="auto"):
+    """
+    Computes the discrete linear convolution of two one dimensional sequences of dual numbers, see
+    :func:`numpy.convolve`
+
+    The dual part follows the product rule, :math:`(a + b\\epsilon) * (c + d\\epsilon) = a * c + (a * d + b * c)
+    \\epsilon`, so a filter with a constant kernel costs two convolutions and a kernel with a dual part three. Long
+    sequences are convolved by multiplying their Fourier transforms, which takes :math:`O(L \\log L)` operations for
+    :math:`L = n + m - 1` rather than the :math:`O(nm)` of direct convolution, but has a rounding error relative to
+    the largest values rather than to each value. Under the ``"mask"`` policy an invalid element of either sequence
+    marks the whole result.
+
+
+    Parameters
+    ----------
+    a, v : DualArray, sequence of Dual or array_like
+        The one dimensional sequences, numbers have a zero dual part
+    mode : str
+        ``"full"``, ``"same"`` or ``"valid"``, the part of the convolution returned as for numpy
+    method : str
+        ``"direct"`` for :func:`numpy.convolve`, ``"fft"`` to multiply Fourier transforms, or ``"auto"`` (the
+        default) to choose the faster for the lengths of `a` and `v`
+
+
+    Returns
+    -------
+    DualArray
+        The convolution
+
+
+    Raises
+    ------
+    ValueError
+        If either sequence is empty or not one dimensional, or `mode` or `method` is not known.
+
+
+    Examples
+    --------
+    >>> x = DualArray([1.0, 2.0, 3.0], [1.0, 0.0, 0.0])
+    >>> y = convolve(x, [0.5, 0.5])
+    >>> y.real, y.dual
+    (array([0.5, 1.5, 2.5, 1.5]), array([0.5, 0.5, 0. , 0. ]))
+    """
+
+    if mode not in _MODES:
+        raise ValueError("mode must be one of {}, not {!r}".format(", ".join(_MODES), mode))
+    if method not in ("auto", "direct", "fft"):
+        raise ValueError("method must be one of auto, direct, fft, not {!r}".format(method))
+    a = _as_dual_array(a, "convolve")
+    v = _as_dual_array(v, "convolve")
+    if a.ndim != 1 or v.ndim != 1 or a.size == 0 or v.size == 0:
+        raise ValueError("convolve takes two non-empty one dimensional sequences, not shapes {} and {}".format(
+            a.shape, v.shape))
+
+    n, m = a.size, v.size
+    length = n + m - 1
+    if method == "auto":
+        method = "fft" if n * m > _FFT_THRESHOLD * length * math.log2(length + 1) else "direct"
+
+    # the dual part of a constant sequence needs no convolution
+    dual_planes = [(a.real, v.dual)] if np.any(v.dual) else []
+    if np.any(a.dual):
+        dual_planes.append((a.dual, v.real))
+    is_complex = a.is_complex or v.is_complex
+    if method == "direct":
+        new_real = np.convolve(a.real, v.real)
+        new_dual = sum(np.convolve(p, q) for p, q in dual_planes) if dual_planes else None
+    else:
+        new_real = _fft_convolve([(a.real, v.real)], length, is_complex)
+        new_dual = _fft_convolve(dual_planes, length, is_complex) if dual_planes else None
+    if new_dual is None:
+        new_dual = np.zeros(length, np.result_type(a.dual, v.dual, new_real))
+
+    # crops the full convolution as numpy does
+    if mode == "same":
+        start, stop = (min(n, m) - 1) // 2, (min(n, m) - 1) // 2 + max(n, m)
+    elif mode == "valid":
+        start, stop = min(n, m) - 1, max(n, m)
+    else:
+        start, stop = 0, length
+    result = DualArray._new(new_real[start:stop], new_dual[start:stop])
+
+    # an invalid element marks the whole result, as the transforms of the fft method spread its nan to every element
+    codes = [_first_code(x._mask) for x in (a, v) if x._mask is not None and x._mask.any()]
+    return _merge_masks(result, codes[0] if codes else None)
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from dual_autodiff.array import DualArray, _planes
+
+
+# chunked evaluation of a function over a large grid of points, optionally checkpointed to a directory so that an
+# interrupted sweep restarts where it left off. Each completed chunk is saved as the real and dual planes of its result in
+# an uncompressed .npz file (plain numpy arrays, nothing is pickled), and progress.json records which chunks are done
+# together with a fingerprint of the inputs. Both are written to a temporary file and then renamed over the old one, so
+# an interruption at any point leaves either the previous or the new state on disk.
+
+
+# the version of the checkpoint layout, written to progress.json
+_VERSION = 1
+
+
+
+def _fingerprint(real, dual, chunk_size):
+    """
+    A digest of the points and the chunking, so a checkpoint is only resumed by a sweep over the same inputs
+    """
+
+    digest = hashlib.sha256()
+    for plane in (real, dual):
+        plane = np.ascontiguousarray(plane)
+        digest.update("{}{}".format(plane.dtype.str, plane.shape).encode())
+        digest.update(plane.data)
+    digest.update(str(chunk_size).encode())
+    return digest.hexdigest()
+
+
+
+def _replace(path, write):
+    """
+    Writes a file by calling `write` with a temporary binary file and renaming it to `path` once it is complete
+    """
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        write(file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+
+def _chunk_path(directory, index):
+    return os.path.join(directory, "chunk_{:06d}.npz".format(index))
+
+
+
+def _load_progress(directory, metadata):
+    """
+    Returns the chunks already completed in a checkpoint directory, checking it belongs to the same sweep
+    """
+
+    path = os.path.join(directory, "progress.json")
+    if not os.path.exists(path):
+        return set()
+    with open(path) as file:
+        progress = json.load(file)
+    for key, value in metadata.items():
+        if progress.get(key) != value:
+            raise ValueError("the checkpoint in {} is for a different sweep, its {} does not match".format(directory, key))
+    # a chunk only counts as done if its file was also completed
+    return {i for i in progress["done"] if os.path.exists(_chunk_path(directory, i))}
+
+
+
+def _save_progress(directory, metadata, done):
+    """
+    Records the completed chunks in progress.json
+    """
+
+    progress = dict(metadata, done=sorted(done))
+    _replace(os.path.join(directory, "progress.json"), lambda file: file.write(json.dumps(progress).encode()))
+
+
+
+def sweep(f, xs, chunk_size=65536, checkpoint=None):
+    """
+    Evaluates an elementwise function over a large array of points a chunk at a time, optionally checkpointing every
+    completed chunk so that an interrupted sweep can be resumed
+
+    With a `checkpoint` directory the real and dual planes of each chunk's result are saved as soon as it is computed,
+    together with progress metadata. Calling sweep again with the same function, points and chunk size loads the
+    completed chunks from disk instead of evaluating them, so a restarted run continues from the first unfinished chunk.
+    The saved planes are plain numpy arrays, no Dual objects are built or pickled. The checkpoint files are left in
+    place once the sweep completes, and may be deleted.
+
+    Invalid points are kept as nan in the saved planes, the mask of a result is not saved.
+
+
+    Parameters
+    ----------
+    f : callable
+        The function to evaluate, taking a one dimensional DualArray of points and returning a DualArray of the same
+        length (or anything that broadcasts to it)
+    xs : array_like or DualArray
+        The points, of any shape. Real points are seeded with a dual part of 1, a DualArray is used as it is
+    chunk_size : int
+        The number of points evaluated in each call to `f`
+    checkpoint : str or path, optional
+        A directory to save completed chunks to and resume from, created if it does not exist
+
+
+    Returns
+    -------
+    DualArray
+        The results, with the shape of `xs`
+
+
+    Raises
+    ------
+    ValueError
+        If the checkpoint directory belongs to a sweep over different points or chunks, or `f` does not return one
+        result per point.
+    TypeError
+        If `f` does not return dual numbers or numbers.
+
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as checkpoint:
+    ...     y = sweep(lambda x: (x * x).sin(), np.linspace(0, 1, 10**6), checkpoint=checkpoint)
+    >>> y.shape
+    (1000000,)
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive, not {}".format(chunk_size))
+    if isinstance(xs, DualArray):
+        real, dual = xs.real, np.broadcast_to(xs.dual, xs.shape)
+    else:
+        real = np.asarray(xs)
+        if real.dtype.kind not in "iuf":
+            raise TypeError("can only sweep over real points or a DualArray, not {}".format(real.dtype))
+        dual = np.ones_like(real, dtype=np.result_type(real, np.float64))
+    shape = real.shape
+    real, dual = real.reshape(-1), dual.reshape(-1)
+    size = real.size
+    chunks = -(-size // chunk_size)
+
+    done = set()
+    if checkpoint is not None:
+        checkpoint = os.fspath(checkpoint)
+        os.makedirs(checkpoint, exist_ok=True)
+        metadata = {"version": _VERSION, "shape": list(shape), "chunk_size": chunk_size, "chunks": chunks,
+                    "fingerprint": _fingerprint(real, dual, chunk_size)}
+        done = _load_progress(checkpoint, metadata)
+
+    results = [None] * chunks
+    for i in range(chunks):
+        if i in done:
+            continue
+        start, stop = i * chunk_size, min(size, (i + 1) * chunk_size)
+        new_real, new_dual = _planes(f(DualArray(real[start:stop], dual[start:stop])))
+        if new_real is None:
+            raise TypeError("f must return a DualArray, dual number or number")
+        new_dual = np.zeros_like(new_real) if new_dual is None else new_dual
+        try:
+            new_real = np.broadcast_to(new_real, (stop - start,))
+            new_dual = np.broadcast_to(new_dual, (stop - start,))
+        except ValueError:
+            raise ValueError("f must return one result per point, got shape {} for {} points".format(
+                np.shape(new_real), stop - start)) from None
+
+        if checkpoint is None:
+            results[i] = new_real, new_dual
+        else:
+            _replace(_chunk_path(checkpoint, i), lambda file: np.savez(file, real=new_real, dual=new_dual))
+            done.add(i)
+            _save_progress(checkpoint, metadata, done)
+
+    for i in range(chunks):
+        if results[i] is None:
+            with np.load(_chunk_path(checkpoint, i), allow_pickle=False) as data:
+                results[i] = data["real"], data["dual"]
+    if not results:
+        return DualArray(np.zeros(shape), 0)
+    new_real = np.concatenate([r for r, _ in results]).reshape(shape)
+    new_dual = np.concatenate([d for _, d in results]).reshape(shape)
+    return DualArray._new(new_real, new_dual)
@@ -0,0 +1,1052 @@
+import math
+
+import numpy as np
+
+from dual_autodiff.array import _check_domain, _either, _error_functions, _sigmoid
+from dual_autodiff.dual import _LN2, _LN10, _TWO_OVER_SQRT_PI
+from dual_autodiff.policy import ErrorCode, get_domain_policy
+
+
+# truncated Taylor polynomials, the arbitrary order generalisation of dual numbers. The coefficients of a polynomial are
+# stored along the first axis of a numpy array and any further axes hold a batch of points, so every recurrence below
+# loops over the order only and acts on whole batches at once.
+#
+# Each elementary function u = f(a) is propagated with the recurrence obtained by matching coefficients in a
+# differential equation it satisfies, such as u' = u a' for the exponential. Writing a_k and u_k for the coefficients,
+# u' = g a' gives
+#
+#     k u_k = sum_{j=1}^{k} j a_j g_{k-j}
+#
+# so the coefficients of order K cost O(K^2) operations per point rather than the exponential cost of nesting first
+# order dual numbers.
+
+
+
+def _weighted(a, g, k, stop=None):
+    """
+    The convolution sum_{j=1}^{stop} j a_j g_{k-j} of two coefficient arrays, with `stop` defaulting to `k`
+    """
+
+    stop = k if stop is None else stop
+    j = np.arange(1, stop + 1).reshape((stop,) + (1,) * (a.ndim - 1))
+    return np.sum(j * a[1:stop + 1] * g[k - stop:k][::-1], axis=0)
+
+
+
+def _product(a, b):
+    """
+    The Cauchy product of two coefficient arrays of the same order, the coefficients of the product of the polynomials
+    """
+
+    shape = np.broadcast_shapes(a.shape[1:], b.shape[1:])
+    result = np.empty((len(a),) + shape, np.result_type(a, b))
+    for k in range(len(a)):
+        result[k] = np.sum(a[:k + 1] * b[k::-1], axis=0)
+    return result
+
+
+
+def _integral(a, g, u0):
+    """
+    The coefficients of u with u' = g a' and u(0) = u0, for coefficients `g` which are already known
+    """
+
+    u = np.empty(np.broadcast_shapes(a.shape, g.shape), np.result_type(a, g))
+    u[0] = u0
+    for k in range(1, len(u)):
+        u[k] = _weighted(a, g, k) / k
+    return u
+
+
+
+def _quotient_integral(a, h, u0):
+    """
+    The coefficients of u with u' = a' / h and u(0) = u0, from h u' = a'
+    """
+
+    u = np.empty(np.broadcast_shapes(a.shape, h.shape), np.result_type(a, h))
+    u[0] = u0
+    for k in range(1, len(u)):
+        u[k] = (k * a[k] - _weighted(u, h, k, k - 1)) / (k * h[0])
+    return u
+
+
+
+def _sqrt(a, u0):
+    """
+    The coefficients of the square root of `a`, given its value `u0`, from u u = a
+    """
+
+    u = np.empty_like(a)
+    u[0] = u0
+    for k in range(1, len(u)):
+        u[k] = (a[k] - np.sum(u[1:k] * u[k - 1:0:-1], axis=0)) / (2 * u0)
+    return u
+
+
+
+def _exp(a):
+    """
+    The coefficients of the exponential of `a`, from u' = u a'
+    """
+
+    u = np.empty_like(a)
+    u[0] = np.exp(a[0])
+    for k in range(1, len(u)):
+        u[k] = _weighted(a, u, k) / k
+    return u
+
+
+
+def _power(a, p):
+    """
+    The coefficients of `a` raised to a scalar power `p`, from a u' = p a' u, which needs a non zero value a_0
+    """
+
+    u = np.empty_like(a)
+    u[0] = np.power(a[0], p)
+    return _fill_power(a, u, p)
+
+
+
+class Taylor:
+    """
+    A truncated Taylor polynomial of order K, which generalises dual numbers to derivatives of any order.
+
+    A dual number :math:`a + b\\epsilon` with :math:`\\epsilon^2 = 0` carries a value and a first derivative. A Taylor
+    polynomial instead carries the coefficients
+
+    .. math::
+        u_k = \\frac{u^{(k)}(x)}{k!}, \\quad k = 0, \\ldots, K
+
+    with :math:`\\epsilon^{K+1} = 0`, so evaluating a function on :meth:`Taylor.variable(x, K) <variable>` gives all of
+    its derivatives up to order K at x in one pass. The operators and elementary functions of
+    :class:`~dual_autodiff.dual.Dual` propagate the coefficients with convolution recurrences, costing :math:`O(K^2)`
+    per point.
+
+    The coefficients are stored along the first axis of a numpy array and any further axes hold a batch of points, so
+    like :class:`~dual_autodiff.array.DualArray` a whole batch is evaluated at numpy speed. Polynomials of different
+    orders may be combined, the result is truncated to the lower order. The domain policy applies as for DualArray,
+    invalid points raise or, under the ``"nan"`` and ``"mask"`` policies, have every coefficient set to nan.
+
+
+    Attributes
+    -----------
+    coefficients : numpy.ndarray
+        The Taylor coefficients, of shape ``(order + 1,) + shape``
+
+
+    Examples
+    --------
+    >>> x = Taylor.variable(0.5, 4)
+    >>> (x.sin() * x).derivatives()
+    array([ 0.23971277,  0.91821682,  1.51545235, -1.8770679 , -3.27061748])
+
+    >>> x = Taylor.variable(np.linspace(0, 1, 1000), 6)
+    >>> x.exp().derivative(6).shape
+    (1000,)
+    """
+
+    # makes numpy hand operations between ndarrays and Taylor polynomials to the polynomial
+    __array_priority__ = 1000
+
+
+    def __init__(self, coefficients):
+        """
+        Initialises the Taylor polynomial
+
+
+        Parameters
+        ----------
+        coefficients : array_like
+            The coefficients :math:`u_k = u^{(k)} / k!`, along the first axis, with a batch of points on any further axes
+
+
+        Raises
+        ------
+        TypeError
+            If the coefficients are not real numbers.
+        ValueError
+            If there are no coefficients, or any are nan or infinite under the ``"raise"`` domain policy.
+        """
+
+        coefficients = np.asarray(coefficients)
+        if coefficients.dtype.kind not in "iuf":
+            raise TypeError("coefficients must be real numbers, not {}".format(coefficients.dtype))
+        if coefficients.ndim == 0 or len(coefficients) == 0:
+            raise ValueError("a Taylor polynomial needs at least one coefficient")
+        if coefficients.dtype.kind != "f":
+            coefficients = coefficients.astype(np.float64)
+        if get_domain_policy() == "raise" and not np.all(np.isfinite(coefficients)):
+            raise ValueError("coefficients cannot be nan or inf")
+        self.coefficients = coefficients
+
+
+    @classmethod
+    def _new(cls, coefficients):
+        """
+        Builds a polynomial from computed coefficients without checking them again
+        """
+
+        result = cls.__new__(cls)
+        result.coefficients = coefficients
+        return result
+
+
+    @classmethod
+    def variable(cls, x, order, seed=1):
+        """
+        The polynomial of the independent variable at the points `x`, :math:`x + s\\epsilon`
+
+
+        Parameters
+        ----------
+        x : float or array_like
+            The points to expand about
+        order : int
+            The highest order of derivative to carry
+        seed : float or array_like
+            The first order coefficient, the derivative of the variable with respect to the expansion parameter
+
+
+        Returns
+        -------
+        Taylor
+            The polynomial of order `order`
+        """
+
+        x = np.asarray(x)
+        if x.dtype.kind not in "iuf":
+            raise TypeError("can only expand about real points, not {}".format(x.dtype))
+        if order < 0:
+            raise ValueError("the order must be non negative, not {}".format(order))
+        coefficients = np.zeros((order + 1,) + x.shape, x.dtype if x.dtype.kind == "f" else np.float64)
+        coefficients[0] = x
+        if order >= 1:
+            coefficients[1] = seed
+        return cls(coefficients)
+
+
+    @classmethod
+    def constant(cls, x, order):
+        """
+        The polynomial of a constant, whose derivatives are all zero
+
+
+        Parameters
+        ----------
+        x : float or array_like
+            The values of the constant
+        order : int
+            The order of the polynomial
+
+
+        Returns
+        -------
+        Taylor
+            The polynomial of order `order`
+        """
+
+        return cls.variable(x, order, seed=0)
+
+
+    @property
+    def order(self):
+        """
+        The order K of the polynomial, the highest derivative it carries
+        """
+        return len(self.coefficients) - 1
+
+
+    @property
+    def shape(self):
+        """
+        The shape of the batch of points
+        """
+        return self.coefficients.shape[1:]
+
+
+    @property
+    def value(self):
+        """
+        The values at the points, the zeroth coefficient
+        """
+        return self.coefficients[0]
+
+
+    def derivative(self, k):
+        """
+        Returns the derivative of order `k`, :math:`k! u_k`
+
+
+        Parameters
+        ----------
+        k : int
+            The order of the derivative, at most :attr:`order`
+
+
+        Returns
+        -------
+        numpy.ndarray or float
+            The derivatives at every point
+
+
+        Raises
+        ------
+        ValueError
+            If `k` is negative or greater than the order.
+        """
+
+        if not 0 <= k <= self.order:
+            raise ValueError("can only return derivatives of order 0 to {}, not {}".format(self.order, k))
+        return self.coefficients[k] * math.factorial(k)
+
+
+    def derivatives(self):
+        """
+        Returns every derivative, of orders 0 to :attr:`order`, along the first axis
+        """
+
+        factorials = np.array([math.factorial(k) for k in range(self.order + 1)], np.float64)
+        return self.coefficients * factorials.reshape((-1,) + (1,) * len(self.shape))
+
+
+    def __getitem__(self, index):
+        """
+        Indexes the batch of points, returning the polynomials at the selected points
+        """
+
+        if not isinstance(index, tuple):
+            index = (index,)
+        return Taylor._new(self.coefficients[(slice(None),) + index])
+
+
+    def __repr__(self):
+        return "Taylor(coefficients={!r})".format(self.coefficients)
+
+
+    def __str__(self):
+        return "Taylor(coefficients = {})".format(self.coefficients)
+
+
+    def _coefficients(self, other):
+        """
+        The coefficients of an operand, as a constant polynomial of the same order for a scalar or an array, or None for
+        unsupported types
+        """
+
+        if isinstance(other, Taylor):
+            return other.coefficients
+        if isinstance(other, (int, float, np.integer, np.floating)) or (
+                isinstance(other, np.ndarray) and other.dtype.kind in "iuf"):
+            other = np.asarray(other, np.result_type(self.coefficients, other))
+            coefficients = np.zeros((self.order + 1,) + other.shape, other.dtype)
+            coefficients[0] = other
+            return coefficients
+        return None
+
+
+    def _operands(self, other):
+        """
+        The coefficients of self and another operand, truncated to the lower of their orders, or None for unsupported
+        types
+        """
+
+        b = self._coefficients(other)
+        if b is None:
+            return None, None
+        order = min(len(self.coefficients), len(b))
+        return _align(self.coefficients[:order], b[:order])
+
+
+    def __add__(self, other):
+        """
+        Adds a Taylor polynomial, array or scalar, coefficient by coefficient
+        """
+
+        a, b = self._operands(other)
+        if a is None:
+            raise TypeError("Unsupported type for addition {}".format(type(other)))
+        return Taylor._new(a + b)
+
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+
+    def __sub__(self, other):
+        """
+        Subtracts a Taylor polynomial, array or scalar, coefficient by coefficient
+        """
+
+        a, b = self._operands(other)
+        if a is None:
+            raise TypeError("Unsupported type for subtraction {}".format(type(other)))
+        return Taylor._new(a - b)
+
+
+    def __rsub__(self, other):
+        a, b = self._operands(other)
+        if a is None:
+            raise TypeError("Unsupported type for subtraction {}".format(type(other)))
+        return Taylor._new(b - a)
+
+
+    def __neg__(self):
+        return Taylor._new(-self.coefficients)
+
+
+    def __pos__(self):
+        return self
+
+
+    def __mul__(self, other):
+        """
+        Multiplies by a Taylor polynomial, with the Cauchy product :math:`u_k = \\sum_{i=0}^k a_i b_{k-i}`, or by an
+        array or scalar
+        """
+
+        a, b = self._operands(other)
+        if a is None:
+            raise TypeError("Unsupported type for multiplication {}".format(type(other)))
+        if isinstance(other, Taylor):
+            return Taylor._new(_product(a, b))
+        return Taylor._new(a * b[:1])
+
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+
+    def __truediv__(self, other):
+        """
+        Divides by a Taylor polynomial, array or scalar, using :math:`u_k = (a_k - \\sum_{j=1}^k b_j u_{k-j}) / b_0`
+        for a polynomial
+
+
+        Raises
+        ------
+        ZeroDivisionError
+            If the value of the divisor is 0 at any point.
+        """
+
+        a, b = self._operands(other)
+        if a is None:
+            raise TypeError("Unsupported type for division {}".format(type(other)))
+        return _divide(a, b)
+
+
+    def __rtruediv__(self, other):
+        a, b = self._operands(other)
+        if a is None:
+            raise TypeError("Unsupported type for division {}".format(type(other)))
+        return _divide(b, a)
+
+
+    def __pow__(self, power):
+        """
+        Raises the polynomial to a scalar or Taylor polynomial power
+
+        Non negative integer powers are computed by repeated multiplication and are defined everywhere, other scalar
+        powers use the recurrence :math:`k a_0 u_k = \\sum_{j=1}^k (pj - (k - j)) a_j u_{k-j}` and a polynomial power
+        is :math:`e^{b \\ln a}`.
+
+
+        Raises
+        ------
+        ValueError
+            If the power is not defined at any point, for a zero value raised to a negative or fractional power or to
+            the power 0, or a negative value raised to a fractional or a polynomial power.
+        """
+
+        if isinstance(power, (int, np.integer)) or (isinstance(power, (float, np.floating)) and float(power).is_integer()):
+            return self._integer_power(int(power))
+        if isinstance(power, (float, np.floating)):
+            a = self.coefficients
+            invalid = _check_domain(a[0] == 0, ValueError, "cannot raise 0 to negative or fractional exponents",
+                                    ErrorCode.ZERO_BASE)
+            invalid = _either(invalid, _check_domain(a[0] < 0, ValueError,
+                                                     "cannot raise negative numbers to fractional powers",
+                                                     ErrorCode.NEGATIVE_BASE))
+            return _result(_power(a, power), invalid)
+        if self._coefficients(power) is None:
+            raise TypeError("can only raise Taylor to Taylor, an array, int or float")
+        return (self.log() * power).exp()
+
+
+    def __rpow__(self, other):
+        base = self._coefficients(other)
+        if base is None:
+            raise TypeError("can only raise an array, int or float to a Taylor power")
+        return Taylor._new(base).__pow__(self)
+
+
+    def _integer_power(self, power):
+        """
+        Raises the polynomial to an integer power, by repeated squaring for non negative powers
+        """
+
+        a = self.coefficients
+        if power < 0:
+            invalid = _check_domain(a[0] == 0, ValueError, "cannot raise 0 to negative exponents", ErrorCode.ZERO_BASE)
+            return _result(_power(a, power), invalid)
+        invalid = None
+        if power == 0:
+            invalid = _check_domain(a[0] == 0, ValueError, "0^0 is not defined", ErrorCode.ZERO_TO_ZERO)
+        result = np.zeros_like(a)
+        result[0] = 1
+        square = a
+        while power:
+            if power & 1:
+                result = _product(result, square)
+            power >>= 1
+            if power:
+                square = _product(square, square)
+        return _result(result, invalid)
+
+
+    def __lt__(self, other):
+        """
+        Compares the values elementwise, ignoring the higher coefficients as :meth:`Dual.__lt__
+        <dual_autodiff.dual.Dual.__lt__>` ignores the dual part
+        """
+
+        return self._compare(np.less, other)
+
+
+    def __le__(self, other):
+        return self._compare(np.less_equal, other)
+
+
+    def __gt__(self, other):
+        return self._compare(np.greater, other)
+
+
+    def __ge__(self, other):
+        return self._compare(np.greater_equal, other)
+
+
+    def _compare(self, comparison, other):
+        """
+        Applies an ordering `comparison` to the values
+        """
+
+        b = self._coefficients(other)
+        if b is None:
+            return NotImplemented
+        return comparison(self.coefficients[0], b[0])
+
+
+    def __abs__(self):
+        """
+        Computes the absolute value, :math:`\\mathrm{sign}(a_0) u`
+
+
+        Raises
+        ------
+        ValueError
+            If the value is zero at any point, where the derivatives are undefined.
+        """
+
+        a = self.coefficients
+        invalid = _check_domain(a[0] == 0, ValueError, "absolute value is not differentiable for a zero real part",
+                                ErrorCode.NOT_DIFFERENTIABLE)
+        return _result(np.sign(a[0]) * a, invalid)
+
+
+    def sin(self):
+        """
+        Computes the sine, propagated together with the cosine from :math:`s' = c a'` and :math:`c' = -s a'`
+        """
+
+        return self._sin_cos()[0]
+
+
+    def cos(self):
+        """
+        Computes the cosine, propagated together with the sine from :math:`s' = c a'` and :math:`c' = -s a'`
+        """
+
+        return self._sin_cos()[1]
+
+
+    def _sin_cos(self):
+        """
+        The sine and cosine of the polynomial, whose recurrences depend on each other
+        """
+
+        a = self.coefficients
+        s, c = np.empty_like(a), np.empty_like(a)
+        s[0], c[0] = np.sin(a[0]), np.cos(a[0])
+        for k in range(1, len(a)):
+            s[k] = _weighted(a, c, k) / k
+            c[k] = -_weighted(a, s, k) / k
+        return Taylor._new(s), Taylor._new(c)
+
+
+    def tan(self):
+        """
+        Computes the tangent, from :math:`u' = (1 + u^2) a'`
+
+
+        Raises
+        ------
+        ZeroDivisionError
+            If the cosine of the value is zero at any point, making the tangent undefined.
+        """
+
+        a = self.coefficients
+        u, g = np.empty_like(a), np.empty_like(a)
+        u[0] = np.tan(a[0])
+        g[0] = 1 + u[0] * u[0]
+        invalid = _check_domain(np.abs(g[0]) >= 1e16, ZeroDivisionError,
+                                "tangent is non-defined when real component = pi/2 + n*pi", ErrorCode.TAN_POLE)
+        for k in range(1, len(a)):
+            u[k] = _weighted(a, g, k) / k
+            g[k] = np.sum(u[:k + 1] * u[k::-1], axis=0)
+        return _result(u, invalid)
+
+
+    def sinh(self):
+        """
+        Computes the hyperbolic sine, propagated together with the hyperbolic cosine
+        """
+
+        return self._sinh_cosh()[0]
+
+
+    def cosh(self):
+        """
+        Computes the hyperbolic cosine, propagated together with the hyperbolic sine
+        """
+
+        return self._sinh_cosh()[1]
+
+
+    def _sinh_cosh(self):
+        """
+        The hyperbolic sine and cosine of the polynomial, from :math:`s' = c a'` and :math:`c' = s a'`
+        """
+
+        a = self.coefficients
+        s, c = np.empty_like(a), np.empty_like(a)
+        s[0], c[0] = np.sinh(a[0]), np.cosh(a[0])
+        for k in range(1, len(a)):
+            s[k] = _weighted(a, c, k) / k
+            c[k] = _weighted(a, s, k) / k
+        return Taylor._new(s), Taylor._new(c)
+
+
+    def tanh(self):
+        """
+        Computes the hyperbolic tangent, from :math:`u' = (1 - u)(1 + u) a'`
+
+        The factors :math:`1 \\mp u` are started from :math:`2\\sigma(\\mp 2a_0)`, so they keep their relative precision
+        where the tangent rounds to :math:`\\pm 1`.
+        """
+
+        a = self.coefficients
+        u, minus, plus, g = np.empty_like(a), np.empty_like(a), np.empty_like(a), np.empty_like(a)
+        u[0] = np.tanh(a[0])
+        minus[0], plus[0] = 2 * _sigmoid(-2 * a[0]), 2 * _sigmoid(2 * a[0])
+        g[0] = minus[0] * plus[0]
+        for k in range(1, len(a)):
+            u[k] = _weighted(a, g, k) / k
+            minus[k], plus[k] = -u[k], u[k]
+            g[k] = np.sum(minus[:k + 1] * plus[k::-1], axis=0)
+        return Taylor._new(u)
+
+
+    def exp(self):
+        """
+        Computes the exponential, from :math:`u' = u a'`
+        """
+
+        return Taylor._new(_exp(self.coefficients))
+
+
+    def expm1(self):
+        """
+        Computes :math:`e^a - 1`, accurately for small values
+        """
+
+        u = _exp(self.coefficients)
+        u[0] = np.expm1(self.coefficients[0])
+        return Taylor._new(u)
+
+
+    def log(self):
+        """
+        Computes the natural logarithm, from :math:`a u' = a'`
+
+
+        Raises
+        ------
+        ValueError
+            If the value is not positive at any point.
+        """
+
+        a = self.coefficients
+        invalid = _check_domain(a[0] <= 0, ValueError, "Natural Logarithm is not defined for non-positive real parts",
+                                ErrorCode.LOG_DOMAIN)
+        return _result(_quotient_integral(a, a, np.log(a[0])), invalid)
+
+
+    def log1p(self):
+        """
+        Computes :math:`\\log(1 + a)`, accurately for small values
+
+
+        Raises
+        ------
+        ValueError
+            If the value is not greater than -1 at any point.
+        """
+
+        a = self.coefficients
+        invalid = _check_domain(a[0] <= -1, ValueError, "log1p is not defined for real parts less than or equal to -1",
+                                ErrorCode.LOG_DOMAIN)
+        h = a.copy()
+        h[0] += 1
+        return _result(_quotient_integral(a, h, np.log1p(a[0])), invalid)
+
+
+    def log10(self):
+        """
+        Computes the base 10 logarithm
+
+
+        Raises
+        ------
+        ValueError
+            If the value is not positive at any point.
+        """
+
+        u = self.log()
+        u.coefficients /= _LN10
+        u.coefficients[0] = np.log10(self.coefficients[0])
+        return u
+
+
+    def log2(self):
+        """
+        Computes the base 2 logarithm
+
+
+        Raises
+        ------
+        ValueError
+            If the value is not positive at any point.
+        """
+
+        u = self.log()
+        u.coefficients /= _LN2
+        u.coefficients[0] = np.log2(self.coefficients[0])
+        return u
+
+
+    def sqrt(self):
+        """
+        Computes the square root, from :math:`u u = a`
+
+
+        Raises
+        ------
+        ValueError
+            If the value is not positive at any point.
+        """
+
+        a = self.coefficients
+        invalid = _check_domain(a[0] <= 0, ValueError, "Square root is undefined for a non positive real part",
+                                ErrorCode.SQRT_DOMAIN)
+        return _result(_sqrt(a, np.sqrt(a[0])), invalid)
+
+
+    def cbrt(self):
+        """
+        Computes the real cube root, from :math:`a u' = \\frac{1}{3} a' u`
+
+
+        Raises
+        ------
+        ValueError
+            If the value is zero at any point, where the derivatives are undefined.
+        """
+
+        a = self.coefficients
+        invalid = _check_domain(a[0] == 0, ValueError, "cube root is not differentiable for a zero real part",
+                                ErrorCode.NOT_DIFFERENTIABLE)
+        u = np.empty_like(a)
+        u[0] = np.cbrt(a[0])
+        return _result(_fill_power(a, u, 1 / 3), invalid)
+
+
+    def arcsin(self):
+        """
+        Computes the inverse sine, from :math:`\\sqrt{1 - a^2} u' = a'`
+
+
+        Raises
+        ------
+        ValueError
+            If the value is not strictly between -1 and 1 at any point.
+        """
+
+        a = self.coefficients
+        invalid = _check_domain(np.abs(a[0]) >= 1, ValueError,
+                                "inverse sine is only differentiable for real parts strictly between -1 and 1",
+                                ErrorCode.INVERSE_TRIG_DOMAIN)
+        return _result(_quotient_integral(a, _sqrt_one_minus_square(a), np.arcsin(a[0])), invalid)
+
+
+    def arccos(self):
+        """
+        Computes the inverse cosine, from :math:`\\sqrt{1 - a^2} u' = -a'`
+
+
+        Raises
+        ------
+        ValueError
+            If the value is not strictly between -1 and 1 at any point.
+        """
+
+        a = self.coefficients
+        invalid = _check_domain(np.abs(a[0]) >= 1, ValueError,
+                                "inverse cosine is only differentiable for real parts strictly between -1 and 1",
+                                ErrorCode.INVERSE_TRIG_DOMAIN)
+        u = -_quotient_integral(a, _sqrt_one_minus_square(a), 0)
+        u[0] = np.arccos(a[0])
+        return _result(u, invalid)
+
+
+    def arctan(self):
+        """
+        Computes the inverse tangent, from :math:`(1 + a^2) u' = a'`
+        """
+
+        a = self.coefficients
+        h = _product(a, a)
+        h[0] += 1
+        return Taylor._new(_quotient_integral(a, h, np.arctan(a[0])))
+
+
+    def arctan2(self, other):
+        """
+        Computes the angle of the point (other, self), the two argument inverse tangent
+
+        Away from the value of the angle, the coefficients are those of :math:`\\arctan(y / x)`, or equivalently of
+        :math:`-\\arctan(x / y)` which is used where :math:`|y_0| > |x_0|` so that the quotient stays bounded.
+
+
+        Raises
+        ------
+        ValueError
+            If both values are 0 at any point.
+        """
+
+        y, x = self._operands(other)
+        if y is None:
+            raise TypeError("Unsupported type for arctan2 {}".format(type(other)))
+        invalid = _check_domain((y[0] == 0) & (x[0] == 0), ValueError,
+                                "arctan2 is not defined when both real parts are 0", ErrorCode.NOT_DIFFERENTIABLE)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            steep = np.abs(y[0]) > np.abs(x[0])
+            y_over_x = Taylor._new(_divide_coefficients(y, x)).arctan().coefficients
+            x_over_y = Taylor._new(_divide_coefficients(x, y)).arctan().coefficients
+        u = np.where(steep, -x_over_y, y_over_x)
+        u[0] = np.arctan2(y[0], x[0])
+        return _result(u, invalid)
+
+
+    def hypot(self, other):
+        """
+        Computes :math:`\\sqrt{a^2 + b^2}` without overflow in the value
+
+
+        Raises
+        ------
+        ValueError
+            If both values are 0 at any point.
+        """
+
+        a, b = self._operands(other)
+        if a is None:
+            raise TypeError("Unsupported type for hypot {}".format(type(other)))
+        value = np.hypot(a[0], b[0])
+        invalid = _check_domain(value == 0, ValueError, "hypot is not differentiable when both real parts are 0",
+                                ErrorCode.NOT_DIFFERENTIABLE)
+        return _result(_sqrt(_product(a, a) + _product(b, b), value), invalid)
+
+
+    def erf(self):
+        """
+        Computes the error function, from :math:`u' = \\frac{2}{\\sqrt{\\pi}} e^{-a^2} a'`
+
+        Uses :func:`scipy.special.erf` for the value when scipy is installed and :func:`math.erf` element by element
+        otherwise.
+        """
+
+        erf, _ = _error_functions()
+        a = self.coefficients
+        return Taylor._new(_integral(a, self._gaussian(), erf(a[0])))
+
+
+    def erfc(self):
+        """
+        Computes the complementary error function, accurately for large values
+        """
+
+        _, erfc = _error_functions()
+        a = self.coefficients
+        u = -_integral(a, self._gaussian(), 0)
+        u[0] = erfc(a[0])
+        return Taylor._new(u)
+
+
+    def _gaussian(self):
+        """
+        The coefficients of the derivative of the error function, :math:`\\frac{2}{\\sqrt{\\pi}} e^{-a^2}`
+        """
+
+        a = self.coefficients
+        return _TWO_OVER_SQRT_PI * _exp(-_product(a, a))
+
+
+    def sigmoid(self):
+        """
+        Computes the logistic sigmoid, from :math:`u' = u(1 - u) a'`, with :math:`1 - u` started from
+        :math:`\\sigma(-a_0)` so that it keeps its relative precision where the sigmoid rounds to 1
+        """
+
+        return Taylor._new(_sigmoid_coefficients(self.coefficients))
+
+
+    def softplus(self):
+        """
+        Computes the softplus function :math:`\\log(1 + e^{a})`, from :math:`u' = \\sigma(a) a'`
+        """
+
+        a = self.coefficients
+        value = np.maximum(a[0], 0) + np.log1p(np.exp(-np.abs(a[0])))
+        return Taylor._new(_integral(a, _sigmoid_coefficients(a), value))
+
+
+
+def _align(a, b):
+    """
+    Inserts axes after the order axis of two coefficient arrays so that their batch shapes broadcast like numpy arrays
+    """
+
+    ndim = max(a.ndim, b.ndim)
+    a = a.reshape(a.shape[:1] + (1,) * (ndim - a.ndim) + a.shape[1:])
+    b = b.reshape(b.shape[:1] + (1,) * (ndim - b.ndim) + b.shape[1:])
+    return a, b
+
+
+
+def _result(coefficients, invalid=None):
+    """
+    Builds the polynomial of a result, setting every coefficient of the `invalid` points to nan
+    """
+
+    if invalid is not None:
+        coefficients = np.where(np.broadcast_to(invalid, coefficients.shape[1:]), np.nan, coefficients)
+    return Taylor._new(coefficients)
+
+
+
+def _divide_coefficients(a, b):
+    """
+    The coefficients of the quotient a / b, from :math:`u_k = (a_k - \\sum_{j=1}^k b_j u_{k-j}) / b_0`
+    """
+
+    u = np.empty(np.broadcast_shapes(a.shape, b.shape), np.result_type(a, b))
+    for k in range(len(u)):
+        u[k] = (a[k] - np.sum(b[1:k + 1] * u[:k][::-1], axis=0)) / b[0]
+    return u
+
+
+
+def _divide(a, b):
+    """
+    Divides the polynomial with coefficients `a` by the one with coefficients `b`, applying the domain policy to the
+    points where the divisor is 0
+    """
+
+    invalid = _check_domain(b[0] == 0, ZeroDivisionError, "The real part of the divisor is 0, division is not defined",
+                            ErrorCode.ZERO_DIVISION)
+    return _result(_divide_coefficients(a, b), invalid)
+
+
+
+def _fill_power(a, u, p):
+    """
+    Recomputes the coefficients above the value of a power `u` of `a`, after the value u_0 has been replaced
+    """
+
+    for k in range(1, len(u)):
+        j = np.arange(1, k + 1).reshape((k,) + (1,) * (a.ndim - 1))
+        u[k] = np.sum((p * j - (k - j)) * a[1:k + 1] * u[k - 1::-1], axis=0) / (k * a[0])
+    return u
+
+
+
+def _sqrt_one_minus_square(a):
+    """
+    The coefficients of :math:`\\sqrt{1 - a^2}`, with the value computed as :math:`\\sqrt{(1 - a_0)(1 + a_0)}`
+    """
+
+    h = -_product(a, a)
+    h[0] = (1 - a[0]) * (1 + a[0])
+    return _sqrt(h, np.sqrt(h[0]))
+
+
+
+def _sigmoid_coefficients(a):
+    """
+    The coefficients of the logistic sigmoid of `a`, propagated with its complement 1 - u
+    """
+
+    u, complement, g = np.empty_like(a), np.empty_like(a), np.empty_like(a)
+    u[0], complement[0] = _sigmoid(a[0]), _sigmoid(-a[0])
+    g[0] = u[0] * complement[0]
+    for k in range(1, len(a)):
+        u[k] = _weighted(a, g, k) / k
+        complement[k] = -u[k]
+        g[k] = np.sum(u[:k + 1] * complement[k::-1], axis=0)
+    return u
+
+
+
+def derivatives(f, x, order):
+    """
+    Computes the derivatives of `f` of orders 0 to `order` at the points `x`, by evaluating `f` once on a Taylor
+    polynomial
+
+
+    Parameters
+    ----------
+    f : callable
+        The function to differentiate, built from the operators and methods of :class:`Taylor`
+    x : float or array_like
+        The points to differentiate at
+    order : int
+        The highest order of derivative
+
+
+    Returns
+    -------
+    numpy.ndarray
+        The derivatives along the first axis, of shape ``(order + 1,) + numpy.shape(x)``
+
+
+    Examples
+    --------
+    >>> derivatives(lambda x: x.exp() * x, 0.0, 4)
+    array([0., 1., 2., 3., 4.])
+    """
+
+    result = f(Taylor.variable(x, order))
+    if not isinstance(result, Taylor):
+        result = Taylor.constant(np.broadcast_to(result, np.shape(x)), order)
+    return result.derivatives()
@@ -0,0 +1,520 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+#
+# Batch versions of the Dual operations which work on whole planes of dual numbers held in contiguous float64 buffers
+# (numpy arrays, array.array or anything else supporting the buffer protocol). Each call crosses from python into C once
+# for the whole batch rather than once per number, and the loops run without the GIL.
+#
+# Every function returns the (out_real, out_dual) buffers. These are allocated as numpy arrays unless given, so callers
+# may reuse buffers between calls, and the outputs may be the input buffers to update them in place.
+#
+# Points outside the domain of an operation follow the domain policy of the Dual class (read once per call): "raise"
+# raises the same exception as Dual, "nan" and "mask" set the invalid lanes to nan and write their error code to the
+# optional uint8 `invalid` buffer, and "off" skips the checks. Every function accepts `invalid`, so all of them can be called the same
+# way, and functions defined everywhere never flag a lane. Under "raise" the exception is raised at the first invalid
+# lane, after the lanes before it have been written to the outputs.
+
+from libc.math cimport sin as c_sin, cos as c_cos, tan as c_tan, sinh as c_sinh, cosh as c_cosh, tanh as c_tanh
+from libc.math cimport exp as c_exp, log as c_log, sqrt as c_sqrt, fabs, isinf, NAN
+
+import numpy as np
+
+from dual_autodiff_x import dual as _dual
+
+
+# the kernels record the lane of an invalid point, or VALID if every lane is valid
+cdef enum:
+    VALID = -1
+
+
+# the codes written for invalid lanes, the values of dual_autodiff.policy.ErrorCode
+cdef enum:
+    ZERO_DIVISION = 2
+    LOG_DOMAIN = 3
+    SQRT_DOMAIN = 4
+    TAN_POLE = 8
+    OVERFLOW = 11
+
+
+
+def _outputs(Py_ssize_t n, out_real, out_dual):
+    """
+    Allocates the output buffers which were not given
+    """
+
+    if out_real is None:
+        out_real = np.empty(n)
+    if out_dual is None:
+        out_dual = np.empty(n)
+    return out_real, out_dual
+
+
+
+cdef int _policy() except -1:
+    """
+    Reads the domain policy, 0 for raise, 1 for nan or mask and 2 for off
+    """
+
+    policy = _dual._DOMAIN_POLICY.get()
+    if policy == "raise":
+        return 0
+    if policy == "off":
+        return 2
+    return 1
+
+
+
+cdef void _lengths(Py_ssize_t n, Py_ssize_t m, Py_ssize_t r, Py_ssize_t d) except *:
+    """
+    Raises a ValueError unless every buffer holds the same number of elements
+    """
+
+    if not (n == m == r == d):
+        raise ValueError("every buffer must hold the same number of elements, got {}, {}, {} and {}".format(n, m, r, d))
+
+
+
+cdef void _flag_length(Py_ssize_t n, unsigned char[::1] flags, bint flagged) except *:
+    """
+    Raises a ValueError unless the `invalid` buffer, if given, holds one flag for each of the n elements
+    """
+
+    if flagged and flags.shape[0] != n:
+        raise ValueError("invalid must hold one flag for each of the {} elements, got {}".format(n, flags.shape[0]))
+
+
+
+cdef object _finish(Py_ssize_t bad, int policy, error, message, out_real, out_dual):
+    """
+    Raises `error` if an invalid point was found under the "raise" policy and otherwise returns the outputs
+    """
+
+    if bad != VALID and policy == 0:
+        raise error(message)
+    return out_real, out_dual
+
+
+
+cdef inline void _mark(double[::1] r, double[::1] d, unsigned char[::1] flags, bint flagged, Py_ssize_t i,
+                       unsigned char code) noexcept nogil:
+    """
+    Sets lane i of the outputs to nan and flags it with the error `code`
+    """
+
+    r[i] = NAN
+    d[i] = NAN
+    if flagged:
+        flags[i] = code
+
+
+
+def add(real, dual, other_real, other_dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Adds two batches of dual numbers, :math:`(a + c) + (b + d)\\epsilon`
+    """
+
+    cdef const double[::1] a = real, b = dual, c = other_real, e = other_dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef Py_ssize_t i
+    _lengths(a.shape[0], c.shape[0], r.shape[0], d.shape[0])
+    _lengths(a.shape[0], b.shape[0], e.shape[0], a.shape[0])
+
+    with nogil:
+        for i in range(a.shape[0]):
+            r[i] = a[i] + c[i]
+            d[i] = b[i] + e[i]
+    return out_real, out_dual
+
+
+
+def subtract(real, dual, other_real, other_dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Subtracts two batches of dual numbers, :math:`(a - c) + (b - d)\\epsilon`
+    """
+
+    cdef const double[::1] a = real, b = dual, c = other_real, e = other_dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef Py_ssize_t i
+    _lengths(a.shape[0], c.shape[0], r.shape[0], d.shape[0])
+    _lengths(a.shape[0], b.shape[0], e.shape[0], a.shape[0])
+
+    with nogil:
+        for i in range(a.shape[0]):
+            r[i] = a[i] - c[i]
+            d[i] = b[i] - e[i]
+    return out_real, out_dual
+
+
+
+def multiply(real, dual, other_real, other_dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Multiplies two batches of dual numbers, :math:`ac + (ad + bc)\\epsilon`
+    """
+
+    cdef const double[::1] a = real, b = dual, c = other_real, e = other_dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef Py_ssize_t i
+    cdef double x, y, u, v
+    _lengths(a.shape[0], c.shape[0], r.shape[0], d.shape[0])
+    _lengths(a.shape[0], b.shape[0], e.shape[0], a.shape[0])
+
+    with nogil:
+        for i in range(a.shape[0]):
+            # the inputs are read before writing so the outputs may be any of the inputs
+            x = a[i]
+            y = b[i]
+            u = c[i]
+            v = e[i]
+            r[i] = x * u
+            d[i] = x * v + y * u
+    return out_real, out_dual
+
+
+
+def divide(real, dual, other_real, other_dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Divides two batches of dual numbers, :math:`\\frac{a}{c} + \\frac{bc - ad}{c^2}\\epsilon`
+
+
+    Raises
+    ------
+    ZeroDivisionError
+        If the real part of a divisor is zero.
+    """
+
+    cdef const double[::1] a = real, b = dual, c = other_real, e = other_dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef unsigned char[::1] flags = invalid
+    cdef bint flagged = invalid is not None
+    cdef int policy = _policy()
+    cdef Py_ssize_t i, bad = VALID
+    cdef double x, y, u, v
+    _lengths(a.shape[0], c.shape[0], r.shape[0], d.shape[0])
+    _lengths(a.shape[0], b.shape[0], e.shape[0], a.shape[0])
+    _flag_length(a.shape[0], flags, flagged)
+
+    with nogil:
+        for i in range(a.shape[0]):
+            x = a[i]
+            y = b[i]
+            u = c[i]
+            v = e[i]
+            if u == 0 and policy != 2:
+                bad = i
+                if policy == 0:
+                    break
+                _mark(r, d, flags, flagged, i, ZERO_DIVISION)
+                continue
+            r[i] = x / u
+            d[i] = (y * u - x * v) / (u * u)
+    return _finish(bad, policy, ZeroDivisionError, "The real part of the divisor is 0, division is not defined",
+                   out_real, out_dual)
+
+
+
+def sin(real, dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Computes the sine of a batch of dual numbers, :math:`\\sin(a) + b \\cos(a)\\epsilon`
+    """
+
+    cdef const double[::1] a = real, b = dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef Py_ssize_t i
+    cdef double x, y
+    _lengths(a.shape[0], b.shape[0], r.shape[0], d.shape[0])
+
+    with nogil:
+        for i in range(a.shape[0]):
+            x = a[i]
+            y = b[i]
+            r[i] = c_sin(x)
+            d[i] = y * c_cos(x)
+    return out_real, out_dual
+
+
+
+def cos(real, dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Computes the cosine of a batch of dual numbers, :math:`\\cos(a) - b \\sin(a)\\epsilon`
+    """
+
+    cdef const double[::1] a = real, b = dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef Py_ssize_t i
+    cdef double x, y
+    _lengths(a.shape[0], b.shape[0], r.shape[0], d.shape[0])
+
+    with nogil:
+        for i in range(a.shape[0]):
+            x = a[i]
+            y = b[i]
+            r[i] = c_cos(x)
+            d[i] = -y * c_sin(x)
+    return out_real, out_dual
+
+
+
+def tan(real, dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Computes the tangent of a batch of dual numbers, :math:`\\tan(a) + b \\sec^{2}(a)\\epsilon`
+
+
+    Raises
+    ------
+    ZeroDivisionError
+        If the cosine of a real part is zero, with the same tolerance as Dual.tan.
+    """
+
+    cdef const double[::1] a = real, b = dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef unsigned char[::1] flags = invalid
+    cdef bint flagged = invalid is not None
+    cdef int policy = _policy()
+    cdef Py_ssize_t i, bad = VALID
+    cdef double t, sec2, y
+    _lengths(a.shape[0], b.shape[0], r.shape[0], d.shape[0])
+    _flag_length(a.shape[0], flags, flagged)
+
+    with nogil:
+        for i in range(a.shape[0]):
+            y = b[i]
+            t = c_tan(a[i])
+            sec2 = 1 + t * t
+            if sec2 >= 1e16 and policy != 2:
+                bad = i
+                if policy == 0:
+                    break
+                _mark(r, d, flags, flagged, i, TAN_POLE)
+                continue
+            r[i] = t
+            d[i] = y * sec2
+    return _finish(bad, policy, ZeroDivisionError, "tangent is non-defined when real component = pi/2 + n*pi",
+                   out_real, out_dual)
+
+
+
+def sinh(real, dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Computes the hyperbolic sine of a batch of dual numbers, :math:`\\sinh(a) + b \\cosh(a)\\epsilon`
+
+
+    Raises
+    ------
+    ValueError
+        If the result overflows.
+    """
+
+    cdef const double[::1] a = real, b = dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef unsigned char[::1] flags = invalid
+    cdef bint flagged = invalid is not None
+    cdef int policy = _policy()
+    cdef Py_ssize_t i, bad = VALID
+    cdef double x, y, s
+    _lengths(a.shape[0], b.shape[0], r.shape[0], d.shape[0])
+    _flag_length(a.shape[0], flags, flagged)
+
+    with nogil:
+        for i in range(a.shape[0]):
+            x = a[i]
+            y = b[i]
+            s = c_sinh(x)
+            if isinf(s) and policy != 2:
+                bad = i
+                if policy == 0:
+                    break
+                _mark(r, d, flags, flagged, i, OVERFLOW)
+                continue
+            r[i] = s
+            d[i] = y * c_cosh(x)
+    return _finish(bad, policy, ValueError, "hyperbolic sine overflows", out_real, out_dual)
+
+
+
+def cosh(real, dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Computes the hyperbolic cosine of a batch of dual numbers, :math:`\\cosh(a) + b \\sinh(a)\\epsilon`
+
+
+    Raises
+    ------
+    ValueError
+        If the result overflows.
+    """
+
+    cdef const double[::1] a = real, b = dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef unsigned char[::1] flags = invalid
+    cdef bint flagged = invalid is not None
+    cdef int policy = _policy()
+    cdef Py_ssize_t i, bad = VALID
+    cdef double x, y, s
+    _lengths(a.shape[0], b.shape[0], r.shape[0], d.shape[0])
+    _flag_length(a.shape[0], flags, flagged)
+
+    with nogil:
+        for i in range(a.shape[0]):
+            x = a[i]
+            y = b[i]
+            s = c_cosh(x)
+            if isinf(s) and policy != 2:
+                bad = i
+                if policy == 0:
+                    break
+                _mark(r, d, flags, flagged, i, OVERFLOW)
+                continue
+            r[i] = s
+            d[i] = y * c_sinh(x)
+    return _finish(bad, policy, ValueError, "hyperbolic cosine overflows", out_real, out_dual)
+
+
+
+def tanh(real, dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Computes the hyperbolic tangent of a batch of dual numbers, :math:`\\tanh(a) + b (1 - \\tanh^{2}(a))\\epsilon`,
+    finite for every real part as in Dual.tanh
+    """
+
+    cdef const double[::1] a = real, b = dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef Py_ssize_t i
+    cdef double x, y, t, e
+    _lengths(a.shape[0], b.shape[0], r.shape[0], d.shape[0])
+
+    with nogil:
+        for i in range(a.shape[0]):
+            x = a[i]
+            y = b[i]
+            t = c_tanh(x)
+            r[i] = t
+            if fabs(x) < 1:
+                d[i] = y * (1 - t) * (1 + t)
+            else:
+                e = c_exp(-2 * fabs(x))
+                d[i] = y * 4 * e / ((1 + e) * (1 + e))
+    return out_real, out_dual
+
+
+
+def exp(real, dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Computes the exponential of a batch of dual numbers, :math:`e^{a} + b e^{a}\\epsilon`
+
+
+    Raises
+    ------
+    ValueError
+        If the result overflows.
+    """
+
+    cdef const double[::1] a = real, b = dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef unsigned char[::1] flags = invalid
+    cdef bint flagged = invalid is not None
+    cdef int policy = _policy()
+    cdef Py_ssize_t i, bad = VALID
+    cdef double y, s
+    _lengths(a.shape[0], b.shape[0], r.shape[0], d.shape[0])
+    _flag_length(a.shape[0], flags, flagged)
+
+    with nogil:
+        for i in range(a.shape[0]):
+            y = b[i]
+            s = c_exp(a[i])
+            if isinf(s) and policy != 2:
+                bad = i
+                if policy == 0:
+                    break
+                _mark(r, d, flags, flagged, i, OVERFLOW)
+                continue
+            r[i] = s
+            d[i] = y * s
+    return _finish(bad, policy, ValueError, "exponential overflows", out_real, out_dual)
+
+
+
+def log(real, dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Computes the natural logarithm of a batch of dual numbers, :math:`\\log(a) + \\frac{b}{a}\\epsilon`
+
+
+    Raises
+    ------
+    ValueError
+        If a real part is not positive.
+    """
+
+    cdef const double[::1] a = real, b = dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef unsigned char[::1] flags = invalid
+    cdef bint flagged = invalid is not None
+    cdef int policy = _policy()
+    cdef Py_ssize_t i, bad = VALID
+    cdef double x, y
+    _lengths(a.shape[0], b.shape[0], r.shape[0], d.shape[0])
+    _flag_length(a.shape[0], flags, flagged)
+
+    with nogil:
+        for i in range(a.shape[0]):
+            x = a[i]
+            y = b[i]
+            if x <= 0 and policy != 2:
+                bad = i
+                if policy == 0:
+                    break
+                _mark(r, d, flags, flagged, i, LOG_DOMAIN)
+                continue
+            r[i] = c_log(x)
+            d[i] = y / x
+    return _finish(bad, policy, ValueError, "Natural Logarithm is not defined for non-positive real parts",
+                   out_real, out_dual)
+
+
+
+def sqrt(real, dual, out_real=None, out_dual=None, invalid=None):
+    """
+    Computes the square root of a batch of dual numbers, :math:`\\sqrt{a} + \\frac{b}{2\\sqrt{a}}\\epsilon`
+
+
+    Raises
+    ------
+    ValueError
+        If a real part is not positive.
+    """
+
+    cdef const double[::1] a = real, b = dual
+    out_real, out_dual = _outputs(a.shape[0], out_real, out_dual)
+    cdef double[::1] r = out_real, d = out_dual
+    cdef unsigned char[::1] flags = invalid
+    cdef bint flagged = invalid is not None
+    cdef int policy = _policy()
+    cdef Py_ssize_t i, bad = VALID
+    cdef double x, y, s
+    _lengths(a.shape[0], b.shape[0], r.shape[0], d.shape[0])
+    _flag_length(a.shape[0], flags, flagged)
+
+    with nogil:
+        for i in range(a.shape[0]):
+            x = a[i]
+            y = b[i]
+            if x <= 0 and policy != 2:
+                bad = i
+                if policy == 0:
+                    break
+                _mark(r, d, flags, flagged, i, SQRT_DOMAIN)
+                continue
+            s = c_sqrt(x)
+            r[i] = s
+            d[i] = y / (2 * s)
+    return _finish(bad, policy, ValueError, "Square root is undefined for a non positive real part", out_real, out_dual)
@@ -7,6 +7,7 @@ from Cython.Build import cythonize
 # Define the extensions (Cython modules)
 extensions = [
     Extension("dual_autodiff_x.dual", ["dual.pyx"]),
+    Extension("dual_autodiff_x.batch", ["batch.pyx"]),
 ]
 
 
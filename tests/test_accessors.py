@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+
+pd = pytest.importorskip("pandas")
+import dual_autodiff.accessors
+
+
+def test_series_derivative():
+    """
+    Tests differentiating a function at every value of a Series
+    """
+
+    s = pd.Series([1.0, 2.0, 4.0], index=["a", "b", "c"], name="x")
+
+    derivative = s.dual.derivative(lambda x: x * x.log())
+    result = s.dual.value_and_derivative(np.sqrt)
+
+    assert derivative.dtype == np.float64
+    assert derivative.name == "x"
+    assert list(derivative.index) == ["a", "b", "c"]
+    assert derivative.to_numpy() == pytest.approx(np.log([1, 2, 4]) + 1, rel=1e-12)
+    assert list(result.columns) == ["value", "derivative"]
+    assert result["value"].to_numpy() == pytest.approx([1, np.sqrt(2), 2], rel=1e-12)
+    assert result["derivative"].to_numpy() == pytest.approx([0.5, 0.5 / np.sqrt(2), 0.25], rel=1e-12)
+
+    # constants have a zero derivative at every value
+    assert s.dual.derivative(lambda x: 3).tolist() == [0, 0, 0]
+
+    with pytest.raises(AttributeError):
+        pd.Series(["a", "b"]).dual
+
+
+def test_frame_gradient():
+    """
+    Tests partial derivatives of a function of several columns
+    """
+
+    df = pd.DataFrame({"x": [1.0, 2.0], "y": [3, 4], "label": ["p", "q"]})
+
+    gradient = df.dual.gradient(lambda x, y: x * x * y)
+
+    assert list(gradient.columns) == ["x", "y"]
+    assert gradient["x"].tolist() == pytest.approx([6, 16], rel=1e-12)
+    assert gradient["y"].tolist() == pytest.approx([1, 4], rel=1e-12)
+    assert df.dual.derivative(lambda x, y: (x / y).sin(), "y").tolist() == pytest.approx(
+        [-np.cos(1 / 3) / 9, -np.cos(0.5) / 8], rel=1e-12)
+
+    pairs = pd.DataFrame({"real": [1.0, 2.0], "dual": [0.5, 1.0]})
+    assert (pairs.dual.to_array("real", "dual").exp().dual == pytest.approx([0.5 * np.e, np.e ** 2], rel=1e-12))
+
+    with pytest.raises(KeyError):
+        df.dual.derivative(lambda **columns: 0, "label")
+
+
+def test_groupby_derivative():
+    """
+    Tests evaluating a function separately for each group, keeping the row order of the frame
+    """
+
+    df = pd.DataFrame({"g": ["a", "b", "a", "b"], "x": [1.0, 2.0, 3.0, 6.0]})
+
+    # the group total is taken as a constant, so the derivative of each share is 1 / total of its group
+    def share(x):
+        total = x.real.sum()
+        return x / total
+
+    derivative = df.dual.derivative(share, "x", by="g")
+
+    assert derivative.tolist() == pytest.approx([1 / 4, 1 / 8, 1 / 4, 1 / 8], rel=1e-12)
+    assert list(df.dual.gradient(lambda x: x * x, by="g").columns) == ["x"]
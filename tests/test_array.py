@@ -0,0 +1,404 @@
+# This file covers tests for the DualArray class, results are checked against the scalar Dual class element by element
+import pytest
+import numpy as np
+from dual_autodiff import Dual
+from dual_autodiff.array import DualArray
+
+
+def _assert_matches(result, expected, rel=1e-12):
+    """
+    Checks every element of a DualArray against a list of Dual numbers
+    """
+
+    assert result.shape == (len(expected),)
+    for i, d in enumerate(expected):
+        assert result.real[i] == pytest.approx(d.real, rel=rel)
+        assert result.dual[i] == pytest.approx(d.dual, rel=rel)
+
+
+def test_array_initialisation():
+    """
+    Tests the DualArray can be initialised from arrays, scalars and Dual numbers
+    """
+
+    # dual part is broadcast against the real part
+    x = DualArray([1, 2, 3], 1)
+    assert x.shape == (3,)
+    assert x.dtype == np.float64
+    assert np.array_equal(x.real, [1, 2, 3])
+    assert np.array_equal(x.dual, [1, 1, 1])
+
+    # no dual part given
+    x = DualArray(np.arange(6.0).reshape(2, 3))
+    assert x.shape == (2, 3)
+    assert np.all(x.dual == 0)
+
+    # from a list of duals
+    x = DualArray.from_duals([Dual(1, 2), Dual(3.5, -4)])
+    assert np.array_equal(x.real, [1, 3.5])
+    assert np.array_equal(x.dual, [2, -4])
+
+    # single elements come back as Duals and slices as DualArrays
+    assert x[1] == Dual(3.5, -4)
+    assert isinstance(x[:1], DualArray)
+    assert x.to_duals() == [Dual(1, 2), Dual(3.5, -4)]
+
+    # assigning elements
+    x[0] = Dual(5, 6)
+    x[1] = 2
+    assert np.array_equal(x.real, [5, 2])
+    assert np.array_equal(x.dual, [6, 0])
+
+    # invalid inputs mirror the Dual class
+    with pytest.raises(TypeError):
+        DualArray(["a", "b"], 1)
+    with pytest.raises(TypeError):
+        DualArray([1, 2], None)
+    with pytest.raises(ValueError):
+        DualArray([1, np.nan], 1)
+    with pytest.raises(ValueError):
+        DualArray([1, 2], [1, np.inf])
+    with pytest.raises(TypeError):
+        DualArray.from_duals([Dual(1, 2), 3])
+
+
+def test_array_arithmetic():
+    """
+    Tests arithmetic between DualArrays, Duals, arrays and scalars against the scalar class
+    """
+
+    a = [Dual(1.5, 2), Dual(-2, 0.5), Dual(3, -1)]
+    b = [Dual(2, -1), Dual(0.5, 3), Dual(-4, 2)]
+    x = DualArray.from_duals(a)
+    y = DualArray.from_duals(b)
+
+    _assert_matches(x + y, [p + q for p, q in zip(a, b)])
+    _assert_matches(x - y, [p - q for p, q in zip(a, b)])
+    _assert_matches(x * y, [p * q for p, q in zip(a, b)])
+    _assert_matches(x / y, [p / q for p, q in zip(a, b)])
+    _assert_matches(-x, [-p for p in a])
+
+    # scalars and single duals
+    _assert_matches(x + 2, [p + 2 for p in a])
+    _assert_matches(2 - x, [2 - p for p in a])
+    _assert_matches(x * Dual(2, 1), [p * Dual(2, 1) for p in a])
+    _assert_matches(Dual(2, 1) * x, [Dual(2, 1) * p for p in a])
+    _assert_matches(Dual(2, 1) - x, [Dual(2, 1) - p for p in a])
+    _assert_matches(3 / x, [3 / p for p in a])
+
+    # numpy arrays are treated as having a zero dual part on either side
+    values = np.array([2.0, -1.0, 0.5])
+    _assert_matches(x * values, [p * float(v) for p, v in zip(a, values)])
+    _assert_matches(values - x, [float(v) - p for p, v in zip(a, values)])
+    _assert_matches(values / x, [float(v) / p for p, v in zip(a, values)])
+
+    with pytest.raises(ZeroDivisionError):
+        x / DualArray([1, 0, 1], 1)
+    with pytest.raises(ZeroDivisionError):
+        1 / DualArray([1, 0, 1], 1)
+    with pytest.raises(TypeError):
+        x + "string"
+
+
+def test_array_power():
+    """
+    Tests powers of DualArrays, including the undefined cases of the scalar class
+    """
+
+    a = [Dual(1.5, 2), Dual(2, 0.5), Dual(3, -1)]
+    x = DualArray.from_duals(a)
+    p = Dual(2, 0.5)
+
+    _assert_matches(x ** 3, [d ** 3 for d in a])
+    _assert_matches(x ** 0.5, [d ** 0.5 for d in a])
+    _assert_matches(x ** p, [d ** p for d in a])
+    _assert_matches(2 ** x, [2 ** d for d in a])
+    _assert_matches(x ** x, [d ** d for d in a])
+
+    # negative bases may be raised to integer valued powers
+    _assert_matches(DualArray([-2.0, 3.0], 1) ** 2, [Dual(-2, 1) ** 2, Dual(3, 1) ** 2])
+
+    with pytest.raises(ValueError, match="0\\^0 is not defined"):
+        DualArray([0, 1], 1) ** 0
+    with pytest.raises(ValueError, match="fractional powers"):
+        DualArray([-1, 1], 1) ** 0.5
+    with pytest.raises(ValueError, match="cannot raise 0 to negative exponents"):
+        DualArray([0, 1], 1) ** -1
+    with pytest.raises(ValueError):
+        DualArray([0, 1], 1) ** Dual(2, 1)
+
+
+def test_array_functions():
+    """
+    Tests the elementary functions, including through numpy ufuncs, against the scalar class
+    """
+
+    a = [Dual(0.5, 2), Dual(1.2, -0.5), Dual(2.5, 1)]
+    x = DualArray.from_duals(a)
+
+    for name in ["sin", "cos", "tan", "sinh", "cosh", "tanh", "sqrt", "exp", "log"]:
+        _assert_matches(getattr(x, name)(), [getattr(d, name)() for d in a])
+        _assert_matches(getattr(np, name)(x), [getattr(d, name)() for d in a])
+
+    # functions added on top of the original set
+    a = [Dual(0.5, 2), Dual(-0.7, -0.5), Dual(0.2, 1)]
+    x = DualArray.from_duals(a)
+    for name in ["arcsin", "arccos", "arctan", "cbrt", "log1p", "expm1", "erf", "erfc", "sigmoid", "softplus", "__abs__"]:
+        _assert_matches(getattr(x, name)(), [getattr(d, name)() for d in a])
+    _assert_matches(abs(x), [abs(d) for d in a])
+    _assert_matches(np.arctan2(x, 2.0), [d.arctan2(2.0) for d in a])
+    _assert_matches(np.hypot(x, x), [d.hypot(d) for d in a])
+    _assert_matches(np.log10(x + 1), [(d + 1).log10() for d in a])
+    _assert_matches(np.log2(x + 1), [(d + 1).log2() for d in a])
+
+    # functions written for numpy arrays work unchanged
+    f = lambda x: np.exp(np.sin(x) * x) / (1 + x ** 2)
+    _assert_matches(f(x), [f(d) for d in a])
+
+    with pytest.raises(ValueError):
+        DualArray([1, -1], 1).log()
+    with pytest.raises(ValueError):
+        DualArray([1, 0], 1).sqrt()
+    with pytest.raises(ZeroDivisionError):
+        DualArray([1, np.pi / 2], 1).tan()
+    with pytest.raises(ValueError):
+        DualArray([0.5, 1], 1).arcsin()
+    with pytest.raises(ValueError):
+        DualArray([0.5, 0], 1).cbrt()
+
+
+def test_array_precision():
+    """
+    Tests the precision of each plane and the promotion rules
+    """
+
+    x = DualArray([1, 2, 3], 1, dtype=np.float32)
+    assert x.dtype == np.float32
+    assert x.dual_dtype == np.float32
+    assert x.nbytes == 24
+
+    # scalars and duals do not change the precision
+    assert (x * 2.5).dtype == np.float32
+    assert (x + Dual(1, 2)).dual_dtype == np.float32
+    assert x.sin().dtype == np.float32
+
+    # arrays and other DualArrays promote as in numpy
+    assert (x * np.ones(3)).dtype == np.float64
+    assert (x + DualArray([1, 2, 3], 1, dtype=np.float16)).dtype == np.float32
+    assert (x + DualArray([1, 2, 3], 1, dtype=np.float64)).dual_dtype == np.float64
+
+    # the dual plane may use a different precision to the real plane
+    x = DualArray([1, 2, 3], 1, dtype=np.float64, dual_dtype=np.float16)
+    y = (x * x).exp()
+    assert y.dtype == np.float64
+    assert y.dual_dtype == np.float16
+    assert y.dual == pytest.approx([2 * np.exp(1), 4 * np.exp(4), 6 * np.exp(9)], rel=1e-3)
+
+    # extended precision
+    x = DualArray([0.5], 1, dtype=np.longdouble)
+    assert x.log().dtype == np.longdouble
+
+    # converting between precisions
+    y = x.astype(np.float32, np.float16)
+    assert y.dtype == np.float32
+    assert y.dual_dtype == np.float16
+
+    with pytest.raises(TypeError):
+        DualArray([1, 2], 1, dtype=np.int64)
+
+
+def test_array_tan_tanh_stability():
+    """
+    Tests the vectorised tangent and hyperbolic tangent across the whole float range
+    """
+
+    a = [Dual(-800, 1), Dual(-20, 2), Dual(0.5, -1), Dual(30, 1), Dual(1e300, 1)]
+    x = DualArray.from_duals(a)
+    _assert_matches(x.tanh(), [d.tanh() for d in a])
+    assert np.all(np.isfinite(x.tanh().dual))
+
+    a = [Dual(-1.5, 1), Dual(0.3, 2), Dual(1.5707, 1)]
+    _assert_matches(DualArray.from_duals(a).tan(), [d.tan() for d in a])
+
+
+def test_array_ordering():
+    """
+    Tests elementwise comparisons and the selection functions, which take each lane from the branch it selects
+    """
+
+    from dual_autodiff.array import where, maximum, minimum, clip
+
+    a = [Dual(-2, 1), Dual(0.5, 2), Dual(3, -1)]
+    x = DualArray.from_duals(a)
+
+    assert (x > 0).tolist() == [False, True, True]
+    assert (0 >= x).tolist() == [True, False, False]
+    assert (x < DualArray([0.0, 0.0, 4.0])).tolist() == [True, False, True]
+    assert np.less_equal(x, 0.5).tolist() == [True, True, False]
+
+    # equality also compares the real parts elementwise
+    assert (x == x.copy()).tolist() == [True, True, True]
+    assert (x != DualArray([-2.0, 1.0, 3.0], 7)).tolist() == [False, True, False]
+    assert (Dual(0.5, 9) == x).tolist() == [False, True, False]
+    assert np.equal(x, 3).tolist() == [False, False, True]
+    assert (x == "a") is False
+    with pytest.raises(TypeError):
+        hash(x)
+
+    # a piecewise function evaluated in one pass matches branching on each element
+    def piecewise(d):
+        return d * d if d > 0 else -d
+
+    _assert_matches(where(x > 0, x * x, -x), [piecewise(d) for d in a])
+    _assert_matches(maximum(x, 0), [d if d > 0 else Dual(0, 0) for d in a])
+    _assert_matches(np.minimum(x, Dual(1, 5)), [d if d < 1 else Dual(1, 5) for d in a])
+    _assert_matches(clip(x, -1, 1), [Dual(-1, 0), Dual(0.5, 2), Dual(1, 0)])
+    assert maximum(Dual(1, 2), Dual(0, 3)) == Dual(1, 2)
+
+    # precision of the selected planes is kept
+    y = DualArray([1, 2], 1, dtype=np.float32)
+    assert where(y > 1, y, 0).dtype == np.float32
+
+    with pytest.raises(TypeError):
+        DualArray([1j]) < 0
+    with pytest.raises(TypeError):
+        maximum(x, "a")
+
+
+def test_array_in_place():
+    """
+    Tests the augmented assignment operators update the planes in place and match the ordinary operators
+    """
+
+    x = DualArray([1.0, 2.0, 3.0], [1.0, -1.0, 2.0])
+    y = DualArray([0.5, -2.0, 4.0], [2.0, 1.0, -1.0])
+    expected = (((x + y) - 1.5) * y) / x
+    real, dual = x.real, x.dual
+
+    z = x.copy()
+    planes = z.real, z.dual
+    z += y
+    z -= 1.5
+    z *= y
+    z /= x
+    assert z.real is planes[0] and z.dual is planes[1]
+    assert np.allclose(z.real, expected.real, rtol=1e-12)
+    assert np.allclose(z.dual, expected.dual, rtol=1e-12)
+
+    # scalars, Dual numbers and broadcast arrays, in reduced precision
+    w = DualArray(np.ones((2, 3)), 1, dtype=np.float32)
+    w *= Dual(2, 1)
+    w += np.arange(3.0)
+    w /= 2
+    assert w.dtype == np.float32
+    assert np.allclose(w.real, [[1.0, 1.5, 2.0]] * 2)
+    assert np.allclose(w.dual, 1.5)
+
+    # the operands are untouched, and a result never shares a plane with an operand
+    assert x.real is real and list(x.real) == [1.0, 2.0, 3.0] and list(x.dual) == [1.0, -1.0, 2.0]
+    v = x + 1
+    v *= 2
+    assert list(x.dual) == [1.0, -1.0, 2.0]
+
+    with pytest.raises(ZeroDivisionError):
+        z /= DualArray([1.0, 0.0, 1.0], 1)
+    assert np.allclose(z.real, expected.real, rtol=1e-12)
+
+
+def test_array_out():
+    """
+    Tests the out argument of the elementwise functions and of numpy ufuncs
+    """
+
+    from dual_autodiff.policy import domain_policy
+
+    x = DualArray([0.5, 1.0, 2.0], [1.0, 2.0, 3.0])
+    out = DualArray(np.zeros(3), 0)
+    real = out.real
+    for name in ["sin", "exp", "log", "arctan", "sigmoid"]:
+        result = getattr(x, name)(out=out)
+        assert result is out and out.real is real
+        _assert_matches(out, [getattr(Dual(x.real[i], x.dual[i]), name)() for i in range(3)])
+
+    assert np.sin(x, out=(out,)) is out
+    _assert_matches(out, [Dual(x.real[i], x.dual[i]).sin() for i in range(3)])
+    assert np.multiply(x, x, out=(out,)) is out
+    _assert_matches(out, [Dual(x.real[i], x.dual[i]) ** 2 for i in range(3)])
+
+    # np.add(z, x, out=z) updates z in place
+    z = x.copy()
+    assert np.add(z, x, out=(z,)) is z
+    assert list(z.real) == [1.0, 2.0, 4.0]
+
+    # invalid lanes are marked in out
+    y = DualArray([-1.0, 1.0, 4.0], 1)
+    with domain_policy("mask"):
+        y.sqrt(out=out)
+    assert list(out.mask) == [True, False, False]
+    assert out.real[2] == 2.0
+
+    with pytest.raises(ValueError):
+        x.sin(out=DualArray(np.zeros(2), 0))
+
+
+def test_array_format_csv(tmp_path):
+    """
+    Tests bulk formatting matches formatting each Dual and the CSV file reads back exactly
+    """
+
+    x = DualArray(np.linspace(-1, 1, 12).reshape(3, 4), np.arange(12.0).reshape(3, 4) / 7)
+    text = x.format()
+    assert text.shape == (3, 4)
+    assert text[1, 2] == str(Dual(float(x.real[1, 2]), float(x.dual[1, 2])))
+    assert x.format("%.2f")[0, 0] == "{:.2f}".format(Dual(-1.0, 0.0))
+
+    path = tmp_path / "x.csv"
+    x.to_csv(path)
+    with open(path) as file:
+        assert file.readline() == "real,dual\n"
+    values = np.loadtxt(path, delimiter=",", skiprows=1)
+    assert values.shape == (12, 2)
+    assert np.array_equal(values[:, 0], x.real.ravel())
+    assert np.array_equal(values[:, 1], x.dual.ravel())
+
+    with pytest.raises(TypeError):
+        DualArray([1j], 1).to_csv(path)
+
+
+def test_array_layouts():
+    """
+    Tests the interleaved layout shares one structured array, keeps its layout through indexing and in place updates,
+    and gives the same results as the planar layout
+    """
+
+    x = DualArray(np.linspace(0.5, 2, 10), np.arange(10.0))
+    y = x.to_layout("interleaved")
+    assert (x.layout, y.layout) == ("planar", "interleaved")
+    assert x.to_layout("planar") is x
+    records = y.to_records()
+    assert records.dtype == np.dtype([("real", "f8"), ("dual", "f8")])
+    assert np.shares_memory(y.real, records) and np.shares_memory(y.dual, records)
+
+    indices = np.array([7, 2, 2, 9])
+    gathered = y[indices]
+    assert gathered.layout == "interleaved"
+    assert np.array_equal(gathered.real, x.real[indices]) and np.array_equal(gathered.dual, x.dual[indices])
+    assert y[3] == x[3]
+    assert y.reshape(2, 5).layout == "interleaved"
+
+    y[np.array([0, 1])] = DualArray([5.0, 6.0], [7.0, 8.0])
+    y += 1
+    assert y.layout == "interleaved"
+    assert records[:2].tolist() == [(6.0, 7.0), (7.0, 8.0)]
+    z = y.sin()
+    assert z.layout == "planar"
+    assert np.array_equal(z.dual, y.to_layout("planar").sin().dual)
+
+    w = DualArray.from_records(records[::2])
+    assert w.layout == "interleaved" and w.shape == (5,)
+    with pytest.raises(TypeError):
+        DualArray.from_records(np.zeros(3, [("dual", "f8"), ("real", "f8")]))
+    with pytest.raises(TypeError):
+        DualArray.from_records(np.zeros(3, [("real", "i8"), ("dual", "f8")]))
+    with pytest.raises(ValueError):
+        x.to_layout("blocked")
@@ -0,0 +1,238 @@
+# Conformance tests which every backend of the Dual class must pass, these are checked against the pure python
+# implementation so that the compiled backend can be trusted to give the same answers
+import importlib
+import operator
+import os
+import pytest
+import numpy as np
+import dual_autodiff
+from dual_autodiff import backends
+from dual_autodiff.dual import Dual as PythonDual
+
+
+BACKENDS = ["python", "cython"]
+
+
+@pytest.fixture(params=BACKENDS)
+def Dual(request):
+    """
+    Provides the Dual class of each backend, skipping backends which are not installed
+    """
+
+    if request.param not in backends.available_backends():
+        pytest.skip("{} backend is not available".format(request.param))
+    return backends.load_backend(request.param)
+
+
+# operations which must give the same result on every backend, each takes the Dual class and returns a dual number
+OPERATIONS = [
+    lambda D: D(1.5, 2) + D(2, -1),
+    lambda D: 3 + D(1.5, 2),
+    lambda D: D(1.5, 2) - D(2, -1),
+    lambda D: 3 - D(1.5, 2),
+    lambda D: D(1.5, 2) * D(2, -1),
+    lambda D: 3 * D(1.5, 2),
+    lambda D: D(1.5, 2) / D(2, -1),
+    lambda D: 3 / D(1.5, 2),
+    lambda D: -D(1.5, 2),
+    lambda D: D(1.5, 2) ** 3,
+    lambda D: D(1.5, 2) ** 0.5,
+    lambda D: D(1.5, 2) ** D(2, -1),
+    lambda D: 2 ** D(1.5, 2),
+    lambda D: D(1.5, 2).sin(),
+    lambda D: D(1.5, 2).cos(),
+    lambda D: D(0.5, 2).tan(),
+    lambda D: D(1.5, 2).sinh(),
+    lambda D: D(1.5, 2).cosh(),
+    lambda D: D(1.5, 2).tanh(),
+    lambda D: D(1.5, 2).sqrt(),
+    lambda D: D(1.5, 2).exp(),
+    lambda D: D(1.5, 2).log(),
+    lambda D: D(0.5, 2).arcsin(),
+    lambda D: D(0.5, 2).arccos(),
+    lambda D: D(1.5, 2).arctan(),
+    lambda D: D(1.5, 2).arctan2(D(-2, 1)),
+    lambda D: D(1.5, 2).hypot(D(-2, 1)),
+    lambda D: abs(D(-1.5, 2)),
+    lambda D: D(-1.5, 2).cbrt(),
+    lambda D: D(1.5, 2).log1p(),
+    lambda D: D(1.5, 2).expm1(),
+    lambda D: D(1.5, 2).log10(),
+    lambda D: D(1.5, 2).log2(),
+    lambda D: D(1.5, 2).erf(),
+    lambda D: D(1.5, 2).erfc(),
+    lambda D: D(1.5, 2).sigmoid(),
+    lambda D: D(1.5, 2).softplus(),
+    lambda D: (D(0.3, 1).sin() * D(0.3, 1).exp() + 1).log() ** 2,
+]
+
+# operations which must raise the same exception on every backend
+ERRORS = [
+    (lambda D: D("1", 1), TypeError),
+    (lambda D: D(np.nan, 1), ValueError),
+    (lambda D: D(1, np.inf), ValueError),
+    (lambda D: D(1, 1) + "1", TypeError),
+    (lambda D: D(1, 1) / 0, ZeroDivisionError),
+    (lambda D: 1 / D(0, 1), ZeroDivisionError),
+    (lambda D: D(0, 1) ** 0, ValueError),
+    (lambda D: D(-1, 1) ** 0.5, ValueError),
+    (lambda D: D(-1, 1).log(), ValueError),
+    (lambda D: D(-1, 1).sqrt(), ValueError),
+    (lambda D: D(np.pi / 2, 1).tan(), ZeroDivisionError),
+]
+
+
+
+@pytest.mark.parametrize("operation", OPERATIONS)
+def test_backend_matches_python(Dual, operation):
+    """
+    Tests that each operation gives the same result as the pure python implementation
+    """
+
+    result = operation(Dual)
+    expected = operation(PythonDual)
+
+    assert type(result) is Dual
+    assert result.real == pytest.approx(expected.real, rel=1e-12)
+    assert result.dual == pytest.approx(expected.dual, rel=1e-12)
+
+
+@pytest.mark.parametrize("operation, error", ERRORS)
+def test_backend_errors(Dual, operation, error):
+    """
+    Tests that each backend rejects invalid operations in the same way
+    """
+
+    with pytest.raises(error):
+        operation(Dual)
+
+
+def test_backend_comparison(Dual):
+    """
+    Tests equality on each backend
+    """
+
+    assert Dual(3.0, 0.0) == 3.0
+    assert 3.0 == Dual(3.0, 0.0)
+    assert Dual(3.0, 1.0) == Dual(3.0, 1.0 + 1e-15)
+    assert not Dual(3.0, 1.0) == Dual(3.0, 2.0)
+    assert str(Dual(2, 3)) == "Dual(real = 2, dual = 3)"
+
+
+def test_backend_ordering(Dual):
+    """
+    Tests ordering on each backend, which compares the real parts only
+    """
+
+    assert Dual(1, 5) < Dual(2, -1)
+    assert Dual(2, 5) <= Dual(2, -1)
+    assert Dual(3, 0) > 2
+    assert 2 <= Dual(2, 1)
+    assert not Dual(2, 1) < 2
+    assert max(Dual(3, 1), Dual(1, 2)) == Dual(3, 1)
+    assert sorted([Dual(3, 1), Dual(1, 2), Dual(2, 3)]) == [Dual(1, 2), Dual(2, 3), Dual(3, 1)]
+
+    # branching on a dual number gives the derivative of the branch taken
+    x = Dual(-2, 1)
+    assert (x if x > 0 else -x) == Dual(2, -1)
+
+    with pytest.raises(TypeError):
+        Dual(1, 1) < "1"
+
+
+def test_backend_mutable(Dual):
+    """
+    Tests the in place operators of the MutableDual class of each backend match the operators of Dual
+    """
+
+    MutableDual = importlib.import_module(Dual.__module__).MutableDual
+    acc = MutableDual(1.5, 2)
+    same = acc
+    acc += Dual(2, -1)
+    acc -= 0.5
+    acc *= Dual(2, -1)
+    acc /= Dual(4, 3)
+    expected = (Dual(1.5, 2) + Dual(2, -1) - 0.5) * Dual(2, -1) / Dual(4, 3)
+    assert acc is same
+    assert acc.real == pytest.approx(expected.real, rel=1e-12)
+    assert acc.dual == pytest.approx(expected.dual, rel=1e-12)
+
+    # other operations give an ordinary Dual
+    assert type(acc * 2) is Dual
+    assert type(acc.freeze()) is Dual
+
+    with pytest.raises(ZeroDivisionError):
+        acc /= Dual(0, 1)
+    with pytest.raises(TypeError):
+        acc += "1"
+
+    # other operands fall back to the binary operators, as for Dual
+    acc = MutableDual(1.5, 2)
+    acc += np.int64(2)
+    assert acc == Dual(3.5, 2)
+    # a DualArray only takes the dual numbers of the selected backend
+    if Dual is not backends.Dual:
+        return
+    x = dual_autodiff.DualArray([1.0, 2.0], [0.5, 1.0])
+    for op in (operator.iadd, operator.isub, operator.imul, operator.itruediv):
+        y, expected = op(MutableDual(1.5, 2), x), op(Dual(1.5, 2), x)
+        assert isinstance(y, dual_autodiff.DualArray)
+        assert np.allclose(y.real, expected.real) and np.allclose(y.dual, expected.dual)
+
+
+def test_sources_in_sync():
+    """
+    Tests that the cython source compiles exactly the pure python implementation, so the two backends cannot drift apart
+    """
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(root, "dual_autodiff", "dual.py")) as f:
+        python_source = f.read()
+    with open(os.path.join(root, "dual_autodiff_x", "dual.pyx")) as f:
+        cython_source = f.read()
+
+    assert python_source == cython_source
+
+
+def test_backend_selection(monkeypatch):
+    """
+    Tests choosing a backend by name and through the environment variable
+    """
+
+    assert "python" in backends.available_backends()
+    assert backends.available_backends()[-1] == "python"
+    assert backends.load_backend("python") is PythonDual
+    assert dual_autodiff.Dual is backends.load_backend(dual_autodiff.BACKEND)
+
+    # auto picks the fastest available backend
+    assert backends.resolve_backend("auto") == backends.available_backends()[0]
+
+    monkeypatch.setenv(backends.ENV_VAR, "python")
+    assert backends.resolve_backend() == "python"
+
+    monkeypatch.setenv(backends.ENV_VAR, " Python ")
+    assert backends.resolve_backend() == "python"
+
+    with pytest.raises(ValueError, match="unknown backend"):
+        backends.resolve_backend("fortran")
+
+    if "cython" not in backends.available_backends():
+        with pytest.raises(ImportError):
+            backends.resolve_backend("cython")
+
+
+def test_stale_extension(monkeypatch):
+    """
+    Tests that a compiled Dual class built from an older source, which lacks methods of the python class, is not used
+    """
+
+    import sys
+    import types
+
+    stale = types.ModuleType("stale_dual")
+    stale.Dual = type("Dual", (), {"sin": PythonDual.sin, "cos": PythonDual.cos})
+    stale.MutableDual = stale.Dual
+    stale._DOMAIN_POLICY = None
+    monkeypatch.setitem(sys.modules, "stale_dual", stale)
+    assert not backends._matches_source("stale_dual")
+    assert backends._matches_source("dual_autodiff.dual")
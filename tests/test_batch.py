@@ -0,0 +1,132 @@
+# Tests of the compiled batch kernels of dual_autodiff_x, which are checked element by element against the python Dual
+# class, and of their use by DualArray when the cython backend is selected
+import math
+import pytest
+import numpy as np
+from dual_autodiff import DualArray, backends, config
+from dual_autodiff.dual import Dual
+from dual_autodiff.policy import ErrorCode, domain_policy
+
+
+# dual_autodiff_x raises a plain ImportError when it has not been built, which importorskip does not catch
+if "cython" not in backends.available_backends() or backends.load_batch("cython") is None:
+    pytest.skip("dual_autodiff_x has not been built", allow_module_level=True)
+batch = backends.load_batch("cython")
+
+
+UNARY = ["sin", "cos", "tan", "sinh", "cosh", "tanh", "exp", "log", "sqrt"]
+BINARY = [("add", "__add__"), ("subtract", "__sub__"), ("multiply", "__mul__"), ("divide", "__truediv__")]
+
+
+@pytest.mark.parametrize("name", UNARY)
+def test_unary_kernels(name):
+    """
+    Checks each unary kernel agrees with the corresponding Dual method
+    """
+
+    real = np.array([0.1, 0.7, 1.3, 2.9])
+    dual = np.array([1.0, -2.0, 0.5, 3.0])
+    new_real, new_dual = getattr(batch, name)(real, dual)
+    for i in range(len(real)):
+        expected = getattr(Dual(real[i], dual[i]), name)()
+        assert new_real[i] == pytest.approx(expected.real, rel=1e-12)
+        assert new_dual[i] == pytest.approx(expected.dual, rel=1e-12)
+
+
+@pytest.mark.parametrize("name, method", BINARY)
+def test_binary_kernels(name, method):
+    """
+    Checks each binary kernel agrees with the corresponding Dual operator
+    """
+
+    real, dual = np.array([0.5, -1.5, 2.0]), np.array([1.0, 2.0, -3.0])
+    other_real, other_dual = np.array([2.0, 0.25, -4.0]), np.array([-1.0, 0.5, 2.0])
+    new_real, new_dual = getattr(batch, name)(real, dual, other_real, other_dual)
+    for i in range(len(real)):
+        expected = getattr(Dual(real[i], dual[i]), method)(Dual(other_real[i], other_dual[i]))
+        assert new_real[i] == pytest.approx(expected.real, rel=1e-12)
+        assert new_dual[i] == pytest.approx(expected.dual, rel=1e-12)
+
+
+def test_out_buffers():
+    """
+    Checks given output buffers are filled and returned, including the input buffers for an in place update
+    """
+
+    real, dual = np.array([0.5, 1.0]), np.array([1.0, 1.0])
+    out_real, out_dual = np.empty(2), np.empty(2)
+    result = batch.sin(real, dual, out_real, out_dual)
+    assert result[0] is out_real and result[1] is out_dual
+    assert out_real[1] == pytest.approx(math.sin(1.0), rel=1e-12)
+
+    # multiply reads every input before writing, so the product of an array with itself may be written in place
+    batch.multiply(real, dual, real, dual, out_real=real, out_dual=dual)
+    assert list(real) == [0.25, 1.0]
+    assert list(dual) == [1.0, 2.0]
+
+
+def test_lengths():
+    """
+    Checks buffers of different lengths are rejected
+    """
+
+    with pytest.raises(ValueError):
+        batch.sin(np.ones(3), np.ones(2))
+    with pytest.raises(ValueError):
+        batch.add(np.ones(3), np.ones(3), np.ones(3), np.ones(3), out_real=np.empty(4))
+    with domain_policy("nan"), pytest.raises(ValueError):
+        batch.divide(np.ones(3), np.ones(3), np.zeros(3), np.ones(3), invalid=np.zeros(1, np.uint8))
+
+
+def test_kernel_domain_policy():
+    """
+    Checks the kernels raise like Dual under the default policy and otherwise set the invalid lanes and their codes
+    """
+
+    real, dual = np.array([-1.0, 4.0]), np.array([1.0, 1.0])
+    with pytest.raises(ValueError):
+        batch.sqrt(real, dual)
+    with pytest.raises(ZeroDivisionError):
+        batch.divide(dual, dual, np.array([0.0, 1.0]), dual)
+
+    flags = np.zeros(2, np.uint8)
+    with domain_policy("nan"):
+        new_real, new_dual = batch.sqrt(real, dual, invalid=flags)
+    assert math.isnan(new_real[0]) and math.isnan(new_dual[0])
+    assert new_real[1] == 2.0 and new_dual[1] == 0.25
+    assert list(flags) == [ErrorCode.SQRT_DOMAIN, 0]
+
+
+def test_array_uses_kernels():
+    """
+    Checks DualArray gives the same results with the cython backend, which uses the kernels, as with numpy
+    """
+
+    x = DualArray(np.linspace(-1, 2, 12).reshape(3, 4), np.arange(12.0).reshape(3, 4))
+    y = DualArray(np.linspace(1, 3, 12).reshape(3, 4), 1.0)
+    for f in [lambda x, y: x.sin(), lambda x, y: x.cos(), lambda x, y: x.tanh(), lambda x, y: y.sqrt(),
+              lambda x, y: x * y, lambda x, y: x / y]:
+        with config(backend="cython"):
+            fast = f(x, y)
+        with config(backend="python"):
+            slow = f(x, y)
+        assert fast.shape == slow.shape
+        assert np.allclose(fast.real, slow.real, rtol=1e-12)
+        assert np.allclose(fast.dual, slow.dual, rtol=1e-12)
+
+
+def test_array_kernels_mask():
+    """
+    Checks lanes flagged by the kernels are masked like the numpy implementation masks them
+    """
+
+    x = DualArray([-1.0, 1.0, 4.0], 1.0)
+    with config(backend="cython", domain="mask"):
+        y = x.sqrt()
+        z = y * x
+        q = x / DualArray([1.0, 0.0, 2.0], 0.0)
+    assert list(y.mask) == [True, False, False]
+    assert list(z.mask) == [True, False, False]
+    assert list(z.errors) == [ErrorCode.SQRT_DOMAIN, 0, 0]
+    assert list(q.errors) == [0, ErrorCode.ZERO_DIVISION, 0]
+    assert z.real[2] == 8.0
@@ -0,0 +1,138 @@
+import cmath
+import pytest
+import numpy as np
+from dual_autodiff import Dual
+from dual_autodiff.array import DualArray
+from dual_autodiff.complex_dual import ComplexDual
+from dual_autodiff.policy import domain_policy
+
+
+def test_complex_arithmetic():
+    """
+    Tests arithmetic of complex dual numbers
+    """
+
+    z = ComplexDual(1 + 2j, 1)
+    w = ComplexDual(2 - 1j, 1j)
+
+    x = z * w
+    assert x.real == pytest.approx((1 + 2j) * (2 - 1j), rel=1e-12)
+    assert x.dual == pytest.approx((1 + 2j) * 1j + (2 - 1j), rel=1e-12)
+
+    x = z / w
+    assert x.real == pytest.approx((1 + 2j) / (2 - 1j), rel=1e-12)
+    assert x.dual == pytest.approx(((2 - 1j) - (1 + 2j) * 1j) / (2 - 1j) ** 2, rel=1e-12)
+
+    # mixing with scalars and real duals
+    assert 1j + z == ComplexDual(1 + 3j, 1)
+    assert 2 - z == ComplexDual(1 - 2j, -1)
+    assert z + Dual(1, 2) == ComplexDual(2 + 2j, 3)
+    assert Dual(1, 2) + z == ComplexDual(2 + 2j, 3)
+    assert Dual(1, 2) * z == ComplexDual(1 + 2j, 3 + 4j)
+    assert Dual(1, 2) == ComplexDual(1, 2) and z != "z" and "z" not in [z]
+    assert z * 2j == ComplexDual(-4 + 2j, 2j)
+
+    # the derivative of z^3 is 3z^2
+    x = z ** 3
+    assert x.real == pytest.approx((1 + 2j) ** 3, rel=1e-12)
+    assert x.dual == pytest.approx(3 * (1 + 2j) ** 2, rel=1e-12)
+
+    # the derivative of 2^z is 2^z log(2)
+    x = 2 ** z
+    assert x.dual == pytest.approx(2 ** (1 + 2j) * np.log(2), rel=1e-12)
+
+    with pytest.raises(ZeroDivisionError):
+        z / 0
+    with pytest.raises(ValueError):
+        ComplexDual(0, 1) ** 0.5
+    with pytest.raises(ValueError):
+        ComplexDual(complex(np.nan, 0), 1)
+    with pytest.raises(TypeError):
+        ComplexDual("1", 1)
+
+
+def test_complex_functions():
+    """
+    Tests the complex elementary functions against their complex derivatives
+    """
+
+    z = ComplexDual(0.5 + 1j, 2)
+    a = 0.5 + 1j
+    derivatives = {
+        "sin": cmath.cos(a),
+        "cos": -cmath.sin(a),
+        "tan": 1 / cmath.cos(a) ** 2,
+        "sinh": cmath.cosh(a),
+        "cosh": cmath.sinh(a),
+        "tanh": 1 / cmath.cosh(a) ** 2,
+        "sqrt": 1 / (2 * cmath.sqrt(a)),
+        "exp": cmath.exp(a),
+        "log": 1 / a,
+    }
+    for name, derivative in derivatives.items():
+        x = getattr(z, name)()
+        assert x.real == pytest.approx(getattr(cmath, name)(a), rel=1e-12)
+        assert x.dual == pytest.approx(2 * derivative, rel=1e-12)
+
+    # the principal branch is used for negative real numbers
+    x = ComplexDual(-4, 1).sqrt()
+    assert x.real == pytest.approx(2j, rel=1e-12)
+
+    with pytest.raises(ValueError):
+        ComplexDual(0, 1).log()
+    with pytest.raises(ValueError):
+        ComplexDual(1, 1).arcsin()
+    with pytest.raises(ValueError):
+        ComplexDual(1j, 1).arctan()
+    with pytest.raises(ValueError):
+        ComplexDual(-1, 1).log1p()
+
+    # log1p and expm1 keep their accuracy for small real parts
+    assert ComplexDual(1e-10 + 1e-12j, 1).log1p().real == pytest.approx(1e-10 - 5e-21 + 1e-12j, rel=1e-12)
+    assert ComplexDual(1e-10 + 1e-12j, 1).expm1().real == pytest.approx(1e-10 + 5e-21 + 1e-12j, rel=1e-12)
+
+    # an overflowing result is a domain error, which is nan under the nan policy
+    for name in ("exp", "expm1", "sinh", "cosh"):
+        with pytest.raises(ValueError):
+            getattr(ComplexDual(1000, 1), name)()
+        with domain_policy("nan"):
+            x = getattr(ComplexDual(1000 + 1j, 1), name)()
+        assert cmath.isnan(x.real) and cmath.isnan(x.dual)
+
+
+def test_complex_array():
+    """
+    Tests complex planes in a DualArray agree with the scalar ComplexDual class
+    """
+
+    values = [0.5 + 1j, -2 + 0.5j, 3 - 1j]
+    z = DualArray(values, 1)
+    assert z.dtype == np.complex128
+    assert z.is_complex
+
+    for name in ["sin", "cos", "tan", "sinh", "cosh", "tanh", "sqrt", "exp", "log", "arcsin", "arccos", "arctan", "log1p",
+                 "expm1", "log10", "log2"]:
+        result = getattr(z, name)()
+        for i, a in enumerate(values):
+            expected = getattr(ComplexDual(a, 1), name)()
+            assert result.real[i] == pytest.approx(expected.real, rel=1e-12)
+            assert result.dual[i] == pytest.approx(expected.dual, rel=1e-12)
+
+    # elements come back as ComplexDuals
+    assert z[1] == ComplexDual(-2 + 0.5j, 1)
+
+    # a real array mixed with complex numbers becomes complex in both planes
+    x = DualArray([1.0, 2.0], 1) * 1j
+    assert x.dual_dtype == np.complex128
+    assert np.allclose(x.dual, [1j, 1j])
+
+    # single precision complex planes
+    z = DualArray(values, 1, dtype=np.complex64)
+    assert z.exp().dtype == np.complex64
+
+    # logarithms of negative real parts are defined for complex planes
+    x = DualArray([-1.0, 4.0], 1).astype(np.complex128).log()
+    assert x.real[0] == pytest.approx(1j * np.pi, rel=1e-12)
+
+    with pytest.raises(ValueError):
+        DualArray([0j, 1], 1).log()
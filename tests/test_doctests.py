@@ -0,0 +1,29 @@
+# Runs the examples in the docstrings of every module, so that they stay in step with the outputs of the package
+import doctest
+import importlib
+
+import pytest
+
+from dual_autodiff import policy, settings
+
+
+# modules whose examples need an optional dependency, mapped to the dependency
+OPTIONAL = {"accessors": "pandas", "io": "pyarrow"}
+
+MODULES = ["accessors", "array", "backends", "complex_dual", "dual", "gradcheck", "io", "numba", "ode", "policy",
+           "primitives", "profiling", "reductions", "settings", "spectral", "sweep", "taylor"]
+
+
+@pytest.mark.parametrize("name", MODULES)
+def test_docstring_examples(name):
+    """
+    The examples of each module give the outputs shown, and leave the domain policy and configuration as they were
+    """
+
+    if name in OPTIONAL:
+        pytest.importorskip(OPTIONAL[name])
+    module = importlib.import_module("dual_autodiff." + name)
+    before = (policy.get_domain_policy(), repr(settings.get_config()))
+    result = doctest.testmod(module, optionflags=doctest.ELLIPSIS)
+    assert result.failed == 0
+    assert (policy.get_domain_policy(), repr(settings.get_config())) == before
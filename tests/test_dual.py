@@ -147,18 +147,31 @@ def test_comparison():
     d2 = Dual(0, 0)
     assert d1 == d2
 
+    # other types compare unequal, so dual numbers can be looked up among other objects
     d1 = Dual(0, 0)  
     d2 = 'Dual'
-    with pytest.raises(TypeError):
-        assert d1 == d2
-
-    d1 = Dual(0, 0) 
-    d2 = 'Dual'
-    with pytest.raises(TypeError):
-        assert d2 == d1
+    assert not d1 == d2
+    assert not d2 == d1
+    assert d1 != d2
+    assert d2 not in [d1] and d1 not in [d2, None]
 
 
 
 
     
 
+
+
+def test_representation():
+    """
+    Testing repr gives the components and format applies a format specification to both
+    """
+
+    assert repr(Dual(2, 3)) == "Dual(2, 3)"
+    assert str([Dual(0.5, -1.0)]) == "[Dual(0.5, -1.0)]"
+    assert "{:.3f}".format(Dual(2, 1 / 3)) == "Dual(real = 2.000, dual = 0.333)"
+    assert "{:>6}".format(Dual(2, 3)) == "Dual(real =      2, dual =      3)"
+    assert format(Dual(2, 3)) == str(Dual(2, 3))
+
+    with pytest.raises(ValueError):
+        format(Dual(2.0, 3.0), "d")
@@ -0,0 +1,69 @@
+# Tests of check_grad, which compares dual derivatives with finite difference estimates over arrays of points
+import numpy as np
+import pytest
+from dual_autodiff import check_grad
+from dual_autodiff.array import DualArray
+
+
+def _f(x):
+    return (x * x).sin() + x.exp() / x - x.sqrt()
+
+
+@pytest.mark.parametrize("method", ["central", "complex"])
+def test_check_grad_passes(method):
+    """
+    Checks correct derivatives pass at every point with both finite difference methods
+    """
+
+    xs = np.linspace(0.1, 5, 10000).reshape(100, 100)
+    result = check_grad(_f, xs, method=method)
+    assert result
+    assert result.derivative.shape == (100, 100)
+    assert result.max_error < (1e-3 if method == "central" else 1e-9)
+    assert len(result.failures[0]) == 0
+
+
+def test_check_grad_finds_errors():
+    """
+    Checks a wrong derivative is reported at the offending points
+    """
+
+    def wrong(x):
+        # the derivative of x^2 should be 2x, it is only correct where x = 0
+        return DualArray(x.real ** 2, x.real * x.dual)
+
+    result = check_grad(wrong, [0.0, 1.0, 2.0, 3.0])
+    assert not result
+    assert list(result.failures[0]) == [1, 2, 3]
+    assert result.max_error == pytest.approx(0.5, rel=1e-6)
+    assert result.estimate == pytest.approx([0, 2, 4, 6], rel=1e-8, abs=1e-8)
+
+    worst = result.worst(1)[0]
+    assert worst[1] in (1.0, 2.0, 3.0)
+    assert "3 of 4 points failed" in str(result)
+
+
+def test_check_grad_domain():
+    """
+    Checks points outside the domain of f fail the check rather than raising
+    """
+
+    result = check_grad(lambda x: x.log(), [-1.0, 0.0, 1.0, 2.0])
+    assert list(result.passed) == [False, False, True, True]
+    assert result.max_error == np.inf
+
+
+def test_check_grad_errors():
+    """
+    Checks unsupported methods, points and results are rejected
+    """
+
+    with pytest.raises(ValueError):
+        check_grad(_f, [1.0], method="forward")
+    with pytest.raises(ValueError):
+        check_grad(_f, [1j])
+    with pytest.raises(TypeError):
+        check_grad(lambda x: "x", [1.0])
+    # abs is not holomorphic so has no complex step
+    with pytest.raises(TypeError):
+        check_grad(lambda x: abs(x), [1.0], method="complex")
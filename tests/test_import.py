@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+import dual_autodiff
+from dual_autodiff import backends
+
+
+# cold start target for ``import dual_autodiff`` in a fresh interpreter, in seconds
+IMPORT_TIME_TARGET = 0.25
+
+
+def _cold_import(backend):
+    """
+    Imports dual_autodiff in a fresh interpreter and returns the import time and the modules loaded
+    """
+
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import dual_autodiff\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'time': elapsed, 'modules': sorted(sys.modules)}))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, **{backends.ENV_VAR: backend})
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize("backend", backends.available_backends())
+def test_import_without_numpy(backend):
+    """
+    Tests that importing the package and using the scalar Dual class does not import numpy
+    """
+
+    result = _cold_import(backend)
+
+    assert "numpy" not in result["modules"]
+    assert "dual_autodiff.profiling" not in result["modules"]
+
+
+@pytest.mark.parametrize("backend", backends.available_backends())
+def test_import_time(backend):
+    """
+    Benchmarks the cold start of the package, taking the best of a few runs to reduce noise
+    """
+
+    best = min(_cold_import(backend)["time"] for _ in range(3))
+
+    assert best < IMPORT_TIME_TARGET
+
+
+def test_lazy_attributes():
+    """
+    Tests that lazily loaded features are available from the package
+    """
+
+    from dual_autodiff.profiling import profile
+
+    assert dual_autodiff.profile is profile
+    assert "profile" in dir(dual_autodiff)
+
+    with pytest.raises(AttributeError):
+        dual_autodiff.not_a_feature
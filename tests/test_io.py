@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+from dual_autodiff import DualArray
+
+pytest.importorskip("pyarrow")
+from dual_autodiff import io
+
+
+def _assert_same(result, expected):
+    """
+    Checks two DualArrays hold the same planes in the same precision
+    """
+
+    assert result.shape == expected.shape
+    assert result.dtype == expected.dtype
+    assert result.dual_dtype == expected.dual_dtype
+    np.testing.assert_array_equal(result.real, expected.real)
+    np.testing.assert_array_equal(result.dual, expected.dual)
+
+
+@pytest.mark.parametrize("layout", io.LAYOUTS)
+def test_arrow_round_trip(layout):
+    """
+    Tests converting to and from arrow tables in both layouts, keeping precision and shape
+    """
+
+    x = DualArray(np.linspace(0.5, 2, 6).reshape(2, 3), 1, dual_dtype=np.float32)
+    y = x.log()
+
+    table = io.to_arrow({"x": x, "y": y}, layout)
+
+    _assert_same(io.from_arrow(table, "x"), x)
+    _assert_same(io.from_arrow(table, "y"), y)
+    with pytest.raises(ValueError):
+        io.from_arrow(table)
+    with pytest.raises(KeyError):
+        io.from_arrow(table, "z")
+
+
+def test_arrow_errors():
+    """
+    Tests that unsupported layouts and precisions are rejected
+    """
+
+    with pytest.raises(ValueError):
+        io.to_arrow(DualArray([1.0]), layout="rows")
+    with pytest.raises(TypeError):
+        io.to_arrow(DualArray([1j]))
+    with pytest.raises(TypeError):
+        io.to_arrow({"x": np.ones(2)})
+
+
+@pytest.mark.parametrize("layout", io.LAYOUTS)
+def test_ipc(tmp_path, layout):
+    """
+    Tests writing an IPC file and reading it back without copying, whole and in chunks
+    """
+
+    path = tmp_path / "sweep.arrow"
+    x = DualArray(np.arange(1000.0), np.arange(1000.0) * 2)
+    io.write_ipc(path, x, layout)
+
+    result = io.read_ipc(path)
+    _assert_same(result, x)
+    assert not result.real.flags.owndata
+
+    io.write_ipc(path, {"x": x}, layout, chunk_size=300)
+    chunks = list(io.iter_ipc(path, "x"))
+    assert [c.size for c in chunks] == [300, 300, 300, 100]
+    _assert_same(io.read_ipc(path, "x"), x)
+    np.testing.assert_array_equal(np.concatenate([c.dual for c in chunks]), x.dual)
+
+
+@pytest.mark.parametrize("layout", io.LAYOUTS)
+def test_parquet(tmp_path, layout):
+    """
+    Tests writing a Parquet file and reading it back whole and in chunks
+    """
+
+    pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "sweep.parquet"
+    x = DualArray(np.linspace(0, 1, 500, dtype=np.float32), 1)
+    io.write_parquet(path, {"x": x, "y": x.sin()}, layout, chunk_size=128)
+
+    _assert_same(io.read_parquet(path, "x"), x)
+    chunks = list(io.iter_parquet(path, "y", chunk_size=200))
+    assert sum(c.size for c in chunks) == 500
+    np.testing.assert_array_equal(np.concatenate([c.real for c in chunks]), x.sin().real)
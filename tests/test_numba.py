@@ -0,0 +1,94 @@
+# Tests of the numba extension, functions compiled with jit are checked against the same functions run on the python
+# Dual class
+import pytest
+from dual_autodiff import Dual
+from dual_autodiff import numba as dual_numba
+from dual_autodiff.dual import Dual as PythonDual
+
+
+pytest.importorskip("numba")
+
+
+METHODS = ["sin", "cos", "tan", "sinh", "cosh", "tanh", "exp", "log", "sqrt", "arcsin", "arccos", "arctan", "cbrt",
+           "log1p", "expm1", "log10", "log2", "erf", "erfc", "sigmoid", "softplus"]
+
+
+def _close(a, b):
+    return a.real == pytest.approx(b.real, rel=1e-12) and a.dual == pytest.approx(b.dual, rel=1e-12)
+
+
+@pytest.mark.parametrize("name", METHODS)
+def test_jit_methods(name):
+    """
+    Checks each compiled method agrees with the Dual method
+    """
+
+    f = dual_numba.jit(lambda x: getattr(x, name)())
+    for x in [Dual(0.3, 2.0), Dual(-0.6, -1.5)]:
+        if name in ("log", "sqrt", "log10", "log2") and x.real < 0:
+            continue
+        assert _close(f(x), getattr(x, name)())
+
+
+def test_jit_arithmetic():
+    """
+    Checks the compiled operators agree with Dual, with dual numbers and scalars on either side
+    """
+
+    x, y = Dual(1.5, 2.0), Dual(-0.5, 3.0)
+    operations = [lambda x, y: x + y, lambda x, y: x - y, lambda x, y: x * y, lambda x, y: x / y,
+                  lambda x, y: 2 + x - y * 3, lambda x, y: 1.5 / x - y / 4, lambda x, y: -x + y,
+                  lambda x, y: x ** 3, lambda x, y: y ** 2, lambda x, y: x ** 0.5, lambda x, y: x ** y,
+                  lambda x, y: 2 ** y, lambda x, y: abs(y), lambda x, y: x.arctan2(y), lambda x, y: x.hypot(2)]
+    for operation in operations:
+        assert _close(dual_numba.jit(operation)(x, y), operation(x, y))
+
+    compare = dual_numba.jit(lambda x, y: (x < y, x <= 1.5, 2 > y, x >= y))
+    assert compare(x, y) == (False, True, True, True)
+
+
+def test_jit_loop():
+    """
+    Checks dual numbers can be created, accumulated and returned in a compiled loop
+    """
+
+    def f(x, n):
+        acc = Dual(0, 0)
+        for k in range(n):
+            acc += (x * k).sin() / (1 + k)
+            acc *= 0.5
+        return acc
+
+    expected = f(Dual(0.2, 1.0), 50)
+    result = dual_numba.jit(f)(PythonDual(0.2, 1.0), 50)
+    assert isinstance(result, Dual)
+    assert _close(result, expected)
+
+
+def test_jit_domain_errors():
+    """
+    Checks invalid points raise the same exceptions as the default policy of Dual
+    """
+
+    with pytest.raises(ValueError):
+        dual_numba.jit(lambda x: x.log())(Dual(-1, 1))
+    with pytest.raises(ValueError):
+        dual_numba.jit(lambda x: x ** 0.5)(Dual(-1, 1))
+    with pytest.raises(ZeroDivisionError):
+        dual_numba.jit(lambda x, y: x / y)(Dual(1, 1), Dual(0, 1))
+    with pytest.raises(ValueError):
+        dual_numba.jit(lambda x: x.exp())(Dual(1000, 1))
+
+
+def test_jit_fallback(monkeypatch):
+    """
+    Checks jit returns the function unchanged when numba is not installed
+    """
+
+    def f(x):
+        return x * x
+
+    monkeypatch.setattr(dual_numba, "numba", None)
+    assert dual_numba.jit(f) is f
+    assert dual_numba.jit(cache=True)(f) is f
+    assert f(Dual(3, 1)).dual == 6
@@ -0,0 +1,108 @@
+# Tests of the ODE integrators, the solutions and their sensitivities are checked against closed form solutions
+import math
+import pytest
+import numpy as np
+from dual_autodiff import Dual
+from dual_autodiff.array import DualArray
+from dual_autodiff.ode import rk4, rk45, sensitivities
+
+
+def _decay(t, y, k):
+    return -k * y
+
+
+def _oscillator(t, y, k):
+    return [y[1], -k * y[0]]
+
+
+def test_rk4_sensitivity():
+    """
+    Tests rk4 gives the derivative of exp(-kt) with respect to k
+    """
+
+    t = np.linspace(0, 2, 21)
+    y = rk4(_decay, t, 1.0, args=(Dual(2, 1),), substeps=10)
+    assert y.shape == (21,)
+    assert y.real == pytest.approx(np.exp(-2 * t), rel=1e-8)
+    assert y.dual == pytest.approx(-t * np.exp(-2 * t), rel=1e-7)
+
+    # seeding the initial state gives the derivative with respect to it instead
+    y = rk4(_decay, t, Dual(3, 1), args=(2,), substeps=10)
+    assert y.dual == pytest.approx(np.exp(-2 * t), rel=1e-8)
+
+
+def test_rk45_sensitivity():
+    """
+    Tests rk45 gives the solution and the derivative with respect to the stiffness of a harmonic oscillator
+    """
+
+    t_eval = [0.0, 0.5, 1.0, 3.0]
+    t, y = rk45(_oscillator, (0, 3), [1.0, 0.0], args=(Dual(4, 1),), t_eval=t_eval, rtol=1e-10, atol=1e-12)
+    assert list(t) == t_eval
+    assert y.shape == (4, 2)
+
+    # y = cos(sqrt(k) t), dy/dk = -t sin(sqrt(k) t) / (2 sqrt(k))
+    for i, s in enumerate(t_eval):
+        assert y.real[i, 0] == pytest.approx(math.cos(2 * s), rel=1e-8, abs=1e-10)
+        assert y.dual[i, 0] == pytest.approx(-s * math.sin(2 * s) / 4, rel=1e-7, abs=1e-10)
+
+    # without t_eval every accepted step is returned
+    t, y = rk45(_decay, (0, 1), 1.0, args=(2.0,))
+    assert t[0] == 0 and t[-1] == 1 and np.all(np.diff(t) > 0)
+    assert y.real[-1] == pytest.approx(math.exp(-2), rel=1e-5)
+
+
+def test_batched_trajectories():
+    """
+    Tests a DualArray of parameters integrates a family of trajectories at once
+    """
+
+    k = DualArray([1.0, 2.0, 3.0], 1)
+    t, y = rk45(_decay, (0, 1), 1.0, args=(k,), t_eval=[1.0], rtol=1e-10, atol=1e-12)
+    assert y.shape == (1, 3)
+    assert y.real[0] == pytest.approx(np.exp(-k.real), rel=1e-8)
+    assert y.dual[0] == pytest.approx(-np.exp(-k.real), rel=1e-8)
+
+
+def test_sensitivities():
+    """
+    Tests the Jacobian with respect to several parameters matches central finite differences
+    """
+
+    def damped(t, y, k, c):
+        return [y[1], -k * y[0] - c * y[1]]
+
+    params = [4.0, 0.5]
+    t, y, jacobian = sensitivities(damped, (0, 2), [1.0, 0.0], params, t_eval=[2.0], rtol=1e-11, atol=1e-13)
+    assert y.shape == (1, 2)
+    assert jacobian.shape == (1, 2, 2)
+
+    for j in range(2):
+        h = 1e-5
+        up, down = list(params), list(params)
+        up[j] += h
+        down[j] -= h
+        _, y_up = rk45(damped, (0, 2), [1.0, 0.0], args=up, t_eval=[2.0], rtol=1e-12, atol=1e-14)
+        _, y_down = rk45(damped, (0, 2), [1.0, 0.0], args=down, t_eval=[2.0], rtol=1e-12, atol=1e-14)
+        difference = (y_up.real[0] - y_down.real[0]) / (2 * h)
+        assert jacobian[0, :, j] == pytest.approx(difference, rel=1e-5)
+
+    _, _, fixed = sensitivities(damped, np.linspace(0, 2, 201), [1.0, 0.0], params, method="rk4")
+    assert fixed[-1] == pytest.approx(jacobian[0], rel=1e-6)
+
+
+def test_ode_errors():
+    """
+    Tests invalid times and a step budget which is too small are rejected
+    """
+
+    with pytest.raises(ValueError):
+        rk45(_decay, (1, 0), 1.0, args=(1.0,))
+    with pytest.raises(ValueError):
+        rk45(_decay, (0, 1), 1.0, args=(1.0,), t_eval=[0.5, 0.2])
+    with pytest.raises(ValueError):
+        rk4(_decay, [[0, 1]], 1.0, args=(1.0,))
+    with pytest.raises(RuntimeError):
+        rk45(_decay, (0, 100), 1.0, args=(1.0,), max_steps=3)
+    with pytest.raises(ValueError):
+        sensitivities(_decay, (0, 1), 1.0, [1.0], method="euler")
@@ -0,0 +1,210 @@
+import math
+import pytest
+import numpy as np
+from dual_autodiff import backends, DualArray, ComplexDual
+from dual_autodiff.policy import ErrorCode, domain_policy, get_domain_policy, set_domain_policy
+
+
+@pytest.fixture(params=["python", "cython"])
+def Dual(request):
+    """
+    Provides the Dual class of each backend, skipping backends which are not installed
+    """
+
+    if request.param not in backends.available_backends():
+        pytest.skip("{} backend is not available".format(request.param))
+    return backends.load_backend(request.param)
+
+
+# operations outside of their domain, each raises under the default policy
+INVALID = [
+    lambda D: D(1, 1) / 0,
+    lambda D: D(1, 1) / D(0, 1),
+    lambda D: 1 / D(0, 1),
+    lambda D: D(0, 1) ** 0,
+    lambda D: D(-1, 1) ** 0.5,
+    lambda D: D(0, 1) ** D(2, 1),
+    lambda D: D(-1, 1).log(),
+    lambda D: D(-1, 1).sqrt(),
+    lambda D: D(math.pi / 2, 1).tan(),
+    lambda D: D(2, 1).arcsin(),
+    lambda D: D(0, 1).cbrt(),
+    lambda D: D(1000, 1).exp(),
+]
+
+
+
+def test_policy_setting():
+    """
+    Tests setting and restoring the domain policy
+    """
+
+    assert get_domain_policy() == "raise"
+    with domain_policy("nan"):
+        assert get_domain_policy() == "nan"
+        with domain_policy("off"):
+            assert get_domain_policy() == "off"
+        assert get_domain_policy() == "nan"
+    assert get_domain_policy() == "raise"
+
+    assert set_domain_policy("mask") == "raise"
+    assert set_domain_policy("raise") == "mask"
+
+    with pytest.raises(ValueError, match="unknown domain policy"):
+        set_domain_policy("ignore")
+
+
+@pytest.mark.parametrize("operation", INVALID)
+@pytest.mark.parametrize("policy", ["nan", "mask"])
+def test_scalar_nan(Dual, operation, policy):
+    """
+    Tests that invalid scalar operations give nan instead of raising on every backend
+    """
+
+    with domain_policy(policy):
+        result = operation(Dual)
+
+    assert type(result) is Dual
+    assert math.isnan(result.real)
+    assert math.isnan(result.dual)
+
+
+def test_scalar_policy(Dual):
+    """
+    Tests that valid operations are unaffected by the policy and that nan components are accepted
+    """
+
+    with domain_policy("nan"):
+        assert Dual(4, 1).sqrt() == Dual(2, 0.25)
+        assert math.isnan(Dual(math.nan, 1).real)
+        assert math.isnan((Dual(-1, 1).log() + 1).dual)
+
+    with domain_policy("off"):
+        assert Dual(2, 1) ** 2 == Dual(4, 4)
+        with pytest.raises(ValueError):
+            Dual(-1, 1).log()
+
+    with pytest.raises(ValueError):
+        Dual(math.nan, 1)
+
+
+def test_complex_policy():
+    """
+    Tests the policy with complex dual numbers
+    """
+
+    with domain_policy("nan"):
+        result = ComplexDual(0, 1).log()
+        assert math.isnan(result.real.real)
+        assert math.isnan((ComplexDual(1, 1) / 0).dual.imag)
+
+    with pytest.raises(ValueError):
+        ComplexDual(0, 1).log()
+
+
+def test_array_nan():
+    """
+    Tests that only the invalid lanes of an array become nan under the nan policy
+    """
+
+    x = DualArray([-1.0, 1.0, 4.0], 1)
+
+    with domain_policy("nan"):
+        y = x.sqrt()
+        z = 1 / DualArray([0.0, 2.0], 1)
+
+    assert np.isnan(y.real[0]) and np.isnan(y.dual[0])
+    assert y.real[1:] == pytest.approx([1, 2], rel=1e-12)
+    assert y.dual[1:] == pytest.approx([0.5, 0.25], rel=1e-12)
+    assert np.isnan(z.real[0])
+    assert z.real[1] == pytest.approx(0.5, rel=1e-12)
+    assert not np.any(y.mask)
+
+
+def test_array_mask():
+    """
+    Tests that invalid lanes are recorded in the mask and carried through later operations
+    """
+
+    x = DualArray([-1.0, 1.0, 0.0, 4.0], 1, dtype=np.float32)
+
+    with domain_policy("mask"):
+        y = x.log()
+        z = (2 * y + x).sqrt() ** 2
+        w = x ** 0.5 + y
+
+    assert y.mask.tolist() == [True, False, True, False]
+    assert z.mask.tolist() == [True, False, True, False]
+    assert w.mask.tolist() == [True, False, True, False]
+    assert z.dtype == np.float32
+    assert z.real[3] == pytest.approx(2 * math.log(4) + 4, rel=1e-6)
+    assert y[1:].mask.tolist() == [False, True, False]
+    assert y.reshape(2, 2).mask.tolist() == [[True, False], [True, False]]
+
+    with domain_policy("mask"):
+        assert np.isnan(y[0].real)
+        assert DualArray([1.0, np.inf], [0.0, 1.0]).mask.tolist() == [False, True]
+
+    with pytest.raises(ValueError):
+        x.log()
+
+
+def test_array_errors():
+    """
+    Tests that each invalid lane records the code of the rule it broke, and later operations keep the first code
+    """
+
+    x = DualArray([-1.0, 0.0, 2.0, 4.0], 1)
+    base = DualArray([0.0, -2.0, 0.0, 3.0], 1)
+
+    with domain_policy("mask"):
+        logs = x.log()
+        quotients = 1 / (x - 2)
+        combined = (logs + quotients).sqrt()
+        zero = base ** 0
+        fractional = base ** 0.5
+        dual_power = base ** x
+        total = DualArray([[-1.0, 1.0], [1.0, 1.0]], 1).sqrt().sum(axis=1)
+        first = (1 / DualArray([[0.0, 1.0, 1.0]], 1) + DualArray([[1.0, -1.0, 1.0]], 1).log()).sum(axis=1)
+        large = DualArray([1.0, 800.0, -800.0], 1)
+        overflows = [large.exp(), large.expm1(), large.sinh(), large.cosh()]
+
+    assert logs.errors.tolist() == [ErrorCode.LOG_DOMAIN] * 2 + [ErrorCode.OK] * 2
+    assert quotients.errors.tolist() == [0, 0, ErrorCode.ZERO_DIVISION, 0]
+    assert combined.errors.tolist() == [ErrorCode.LOG_DOMAIN, ErrorCode.LOG_DOMAIN, ErrorCode.ZERO_DIVISION, 0]
+    assert zero.errors.tolist() == [ErrorCode.ZERO_TO_ZERO, 0, ErrorCode.ZERO_TO_ZERO, 0]
+    assert fractional.errors.tolist() == [ErrorCode.ZERO_BASE, ErrorCode.NEGATIVE_BASE, ErrorCode.ZERO_BASE, 0]
+    assert dual_power.errors.tolist() == [ErrorCode.ZERO_BASE, ErrorCode.NEGATIVE_BASE, ErrorCode.ZERO_BASE, 0]
+    assert total.errors.tolist() == [ErrorCode.SQRT_DOMAIN, 0]
+    # a reduction keeps the code of the first invalid element, not the largest code
+    assert first.errors.tolist() == [ErrorCode.ZERO_DIVISION]
+    assert combined.mask.tolist() == [True, True, True, False]
+    assert [y.errors.tolist() for y in overflows] == [[0, ErrorCode.OVERFLOW, 0]] * 2 + [[0] + [ErrorCode.OVERFLOW] * 2] * 2
+    with pytest.raises(ValueError):
+        large.exp()
+
+    # the valid lanes are computed as usual
+    assert logs.real[2:] == pytest.approx(np.log([2.0, 4.0]), rel=1e-12)
+    assert combined.real[3] == pytest.approx(math.sqrt(math.log(4) + 0.5), rel=1e-12)
+
+    # assigning invalid elements to an array without a mask keeps their codes
+    target = DualArray(np.ones(4), 1)
+    target[1:3] = logs[:2]
+    assert target.errors.tolist() == [0, ErrorCode.LOG_DOMAIN, ErrorCode.LOG_DOMAIN, 0]
+
+    # codes are only recorded under the mask policy
+    with domain_policy("nan"):
+        assert not np.any(x.log().errors)
+
+
+def test_array_off():
+    """
+    Tests that the off policy skips the domain checks
+    """
+
+    with domain_policy("off"):
+        y = DualArray([-1.0, 4.0], 1).sqrt()
+
+    assert np.isnan(y.real[0])
+    assert y.real[1] == pytest.approx(2, rel=1e-12)
+    assert not np.any(y.mask)
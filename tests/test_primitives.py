@@ -0,0 +1,108 @@
+# Tests of user registered primitives, which are checked against the same function composed from the built in ones on
+# scalar dual numbers, arrays and in numba compiled code
+import math
+import pytest
+import numpy as np
+from dual_autodiff import backends, config, Dual, DualArray
+from dual_autodiff.complex_dual import ComplexDual
+from dual_autodiff.policy import ErrorCode, domain_policy
+from dual_autodiff.primitives import get_primitive, primitive, registered
+
+
+@primitive(derivative=lambda x: -2 * x * math.exp(-x * x), vectorised=lambda x: np.exp(-x * x),
+           vectorised_derivative=lambda x: -2 * x * np.exp(-x * x))
+def gaussian(x):
+    return math.exp(-x * x)
+
+
+@primitive(derivative=lambda x: -1 / (x * x), domain=lambda x: x != 0, name="reciprocal")
+def _reciprocal(x):
+    return 1 / x
+
+
+def test_primitive_scalar():
+    """
+    Checks a primitive gives the same value and derivative as the composed function on every backend
+    """
+
+    for backend in backends.available_backends():
+        with config(backend=backend):
+            result = gaussian(Dual(0.7, 2.0))
+            assert type(result) is backends.load_backend(backend)
+        expected = (-(Dual(0.7, 2.0) * Dual(0.7, 2.0))).exp()
+        assert result.real == pytest.approx(expected.real, rel=1e-12)
+        assert result.dual == pytest.approx(expected.dual, rel=1e-12)
+
+    assert gaussian(0.5) == math.exp(-0.25)
+    assert gaussian.__name__ == "gaussian"
+    assert gaussian.primitive.name == "gaussian"
+    assert get_primitive("reciprocal") is _reciprocal
+    assert {"gaussian", "reciprocal"} <= set(registered())
+
+    result = _reciprocal(ComplexDual(1j, 1))
+    assert isinstance(result, ComplexDual)
+    assert result.dual == pytest.approx(1, rel=1e-12)
+
+    with pytest.raises(TypeError):
+        gaussian("x")
+    with pytest.raises(KeyError):
+        get_primitive("missing")
+
+
+def test_primitive_array():
+    """
+    Checks arrays use the vectorised functions, or the scalar ones when no vectorised form is given
+    """
+
+    x = DualArray(np.linspace(-2, 2, 9), np.arange(9.0), dtype=np.float32)
+    result = gaussian(x)
+    assert result.dtype == np.float32
+    assert result.dual == pytest.approx(x.dual * -2 * x.real * np.exp(-x.real ** 2), rel=1e-6)
+    assert gaussian(np.array([0.0, 1.0])) == pytest.approx([1.0, math.exp(-1)], rel=1e-12)
+
+    y = _reciprocal(DualArray([2.0, 4.0], 1))
+    assert list(y.real) == [0.5, 0.25]
+    assert list(y.dual) == [-0.25, -0.0625]
+
+
+def test_primitive_domain():
+    """
+    Checks points outside the domain follow the domain policy without evaluating the function there
+    """
+
+    x = DualArray([0.0, 2.0], 1)
+    with pytest.raises(ValueError):
+        _reciprocal(x)
+    with pytest.raises(ValueError):
+        _reciprocal(Dual(0.0, 1.0))
+
+    with domain_policy("mask"):
+        y = _reciprocal(x)
+        z = _reciprocal(Dual(0.0, 1.0))
+    assert y.errors.tolist() == [ErrorCode.PRIMITIVE_DOMAIN, 0]
+    assert math.isnan(y.real[0]) and y.real[1] == 0.5
+    assert math.isnan(z.real) and math.isnan(z.dual)
+
+
+def test_primitive_numba():
+    """
+    Checks registered primitives can be called in compiled code, including primitives registered after the numba
+    extension is imported
+    """
+
+    pytest.importorskip("numba")
+    from dual_autodiff import numba as dual_numba
+
+    @primitive(derivative=lambda x: 3 * x * x)
+    def cube(x):
+        return x * x * x
+
+    f = dual_numba.jit(lambda x: gaussian(x) + cube(x) * _reciprocal(x))
+    result = f(Dual(0.7, 2.0))
+    expected = gaussian(Dual(0.7, 2.0)) + cube(Dual(0.7, 2.0)) * _reciprocal(Dual(0.7, 2.0))
+    assert result.real == pytest.approx(expected.real, rel=1e-12)
+    assert result.dual == pytest.approx(expected.dual, rel=1e-12)
+    assert f(0.7) == pytest.approx(expected.real, rel=1e-12)
+
+    with pytest.raises(ValueError):
+        f(Dual(0.0, 1.0))
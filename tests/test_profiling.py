@@ -0,0 +1,86 @@
+import pytest
+from dual_autodiff import Dual
+from dual_autodiff.profiling import profile
+
+
+def test_profile_counts():
+    """
+    Tests that the profiler counts calls to each operation and construction
+    """
+
+    with profile() as p:
+        x = Dual(0.5, 1)
+        y = x * x + x.sin()
+        y.log()
+
+    assert p.calls["Dual.__mul__"] == 1
+    assert p.calls["Dual.__add__"] == 1
+    assert p.calls["Dual.sin"] == 1
+    assert p.calls["Dual.log"] == 1
+    # one explicit construction and one for each of the four results
+    assert p.calls["Dual.__init__"] == 5
+
+    # own time never exceeds total time
+    for name in p.calls:
+        assert p.own_time[name] <= p.total_time[name]
+
+    # __rpow__ calls __pow__ so its own time is less than its total time
+    with profile() as p:
+        2 ** Dual(0.5, 1)
+    assert p.calls["Dual.__pow__"] == 1
+    assert p.own_time["Dual.__rpow__"] < p.total_time["Dual.__rpow__"]
+
+
+def test_profile_restores_class():
+    """
+    Tests that the class is left untouched once profiling has finished, including when an exception is raised
+    """
+
+    original_add = Dual.__dict__["__add__"]
+    original_init = Dual.__dict__["__init__"]
+
+    with profile():
+        assert Dual.__dict__["__add__"] is not original_add
+
+    assert Dual.__dict__["__add__"] is original_add
+    assert Dual.__dict__["__init__"] is original_init
+
+    # errors inside the block still restore the class and are still raised
+    with pytest.raises(ValueError):
+        with profile() as p:
+            Dual(-1, 1).log()
+    assert Dual.__dict__["__add__"] is original_add
+    assert p.calls["Dual.log"] == 1
+
+    # nested profiles both record calls made in the inner block
+    with profile() as outer:
+        Dual(1, 1) + 1
+        with profile() as inner:
+            Dual(1, 1) + 1
+    assert outer.calls["Dual.__add__"] == 2
+    assert inner.calls["Dual.__add__"] == 1
+    assert Dual.__dict__["__add__"] is original_add
+
+
+def test_profile_report():
+    """
+    Tests the ordering and formatting of the profile report
+    """
+
+    with profile() as p:
+        x = Dual(1, 1)
+        for _ in range(10):
+            x = x + 1
+        x.exp()
+
+    top = p.top(2, by="calls")
+    assert top[0][0] == "Dual.__init__"
+    assert top[1][0] == "Dual.__add__"
+    assert top[1][1] == 10
+
+    report = p.report(3)
+    assert "operation" in report
+    assert len(report.splitlines()) == 4
+
+    with pytest.raises(ValueError):
+        p.top(by="name")
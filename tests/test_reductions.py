@@ -0,0 +1,99 @@
+import math
+import pytest
+import numpy as np
+import dual_autodiff
+from dual_autodiff import Dual
+from dual_autodiff.array import DualArray
+from dual_autodiff.policy import domain_policy
+
+
+def test_iterable_reductions():
+    """
+    Tests the reductions over lists of dual numbers and scalars
+    """
+
+    values = [Dual(0.1, 1), Dual(0.2, 2), 0.3]
+
+    assert dual_autodiff.sum(values) == Dual(0.6, 3)
+    assert dual_autodiff.sum([]) == Dual(0, 0)
+    assert dual_autodiff.mean(values) == Dual(0.2, 1)
+    assert dual_autodiff.prod([Dual(2, 1), Dual(3, 2), 4]) == Dual(24, 4 * 3 + 2 * 2 * 4)
+    assert dual_autodiff.norm([Dual(3, 1), Dual(4, 2)]) == Dual(5, (3 + 8) / 5)
+
+    # compensated summation in both planes
+    many = [Dual(0.1, 0.1)] * 10
+    assert dual_autodiff.sum(many).real == 1.0
+    assert dual_autodiff.sum(many).dual == 1.0
+
+    # the derivative of a product is exact when a real part is zero
+    assert dual_autodiff.prod([Dual(2, 1), Dual(0, 1), Dual(3, 1)]) == Dual(0, 6)
+
+    with pytest.raises(ValueError):
+        dual_autodiff.mean([])
+    with pytest.raises(ValueError):
+        dual_autodiff.norm([Dual(0, 1), 0])
+    with pytest.raises(TypeError):
+        dual_autodiff.sum(["a"])
+    with domain_policy("nan"):
+        assert math.isnan(dual_autodiff.norm([Dual(0, 1)]).real)
+
+
+def test_logsumexp():
+    """
+    Tests logsumexp against the direct formula and for large real parts
+    """
+
+    values = [Dual(0.5, 1), Dual(-1, 2), Dual(2, -1)]
+    expected = (values[0].exp() + values[1].exp() + values[2].exp()).log()
+
+    assert dual_autodiff.logsumexp(values) == expected
+    assert dual_autodiff.logsumexp([Dual(1000, 1), Dual(1000, 3)]) == Dual(1000 + math.log(2), 2)
+
+
+def test_array_reductions():
+    """
+    Tests the DualArray reductions along every axis and along single axes against the scalar reductions
+    """
+
+    x = DualArray(np.arange(1.0, 7.0).reshape(2, 3), np.arange(6.0).reshape(2, 3) - 2)
+    rows = [x[i].to_duals() for i in range(2)]
+    columns = [[x[0, j], x[1, j]] for j in range(3)]
+    flat = rows[0] + rows[1]
+
+    for name in ["sum", "mean", "prod", "norm", "logsumexp"]:
+        scalar = getattr(dual_autodiff, name)
+        result = getattr(x, name)()
+        assert isinstance(result, Dual)
+        assert result == scalar(flat)
+        assert scalar(x) == result
+
+        along_rows = getattr(x, name)(axis=1)
+        along_columns = getattr(x, name)(axis=0)
+        for i in range(2):
+            assert along_rows[i] == scalar(rows[i])
+        for j in range(3):
+            assert along_columns[j] == scalar(columns[j])
+
+    # several axes at once reduce the elements of each slice in index order
+    y = DualArray(np.arange(1.0, 25.0).reshape(2, 3, 4) / 10, np.arange(24.0).reshape(2, 3, 4) - 12)
+    for name in ["sum", "mean", "prod", "norm", "logsumexp"]:
+        scalar = getattr(dual_autodiff, name)
+        result = getattr(y, name)(axis=(0, 2))
+        for j in range(3):
+            assert result[j] == scalar(y[:, j].reshape(-1).to_duals())
+
+
+def test_array_reduction_precision():
+    """
+    Tests that reductions keep the precision of each plane and combine masks
+    """
+
+    x = DualArray(np.ones((2, 2)), 1, dtype=np.float32, dual_dtype=np.float16)
+    for name in ["sum", "mean", "prod", "norm", "logsumexp"]:
+        result = getattr(x, name)(axis=0)
+        assert result.dtype == np.float32
+        assert result.dual_dtype == np.float16
+
+    with domain_policy("mask"):
+        y = DualArray([[-1.0, 1.0], [1.0, 1.0]], 1).log()
+        assert y.sum(axis=1).mask.tolist() == [True, False]
@@ -0,0 +1,126 @@
+import asyncio
+import math
+import threading
+import pytest
+import numpy as np
+import dual_autodiff
+from dual_autodiff import backends, DualArray
+from dual_autodiff.settings import config, get_config, set_config
+
+
+def test_config_defaults():
+    """
+    Tests the default settings and that the config block restores them
+    """
+
+    settings = get_config()
+    assert settings.check is True
+    assert settings.domain == "raise"
+    assert settings.dtype is None
+    assert settings.backend == dual_autodiff.BACKEND
+    assert settings.Dual is dual_autodiff.Dual
+
+    with config(domain="nan", dtype=np.float32) as inner:
+        assert inner is get_config()
+        assert inner.domain == "nan"
+        assert inner.dtype == np.float32
+        with config(check=False):
+            # unchanged settings are inherited from the enclosing block
+            assert get_config().domain == "nan"
+            assert get_config().check is False
+        assert get_config().check is True
+
+    assert get_config() is settings
+
+    with pytest.raises(ValueError):
+        with config(domain="ignore"):
+            pass
+    with pytest.raises(ValueError):
+        with config(backend="fortran"):
+            pass
+    with pytest.raises(TypeError):
+        with config(dtype=np.int32):
+            pass
+
+
+def test_set_config():
+    """
+    Tests changing the settings without a block
+    """
+
+    previous = set_config(domain="mask")
+    assert previous.domain == "raise"
+    assert dual_autodiff.get_domain_policy() == "mask"
+    set_config(domain=previous.domain)
+    assert get_config().domain == "raise"
+
+
+def test_config_array_settings():
+    """
+    Tests the settings used by DualArray construction
+    """
+
+    with config(dtype=np.float32):
+        assert DualArray([1, 2, 3], 1).dtype == np.float32
+        assert DualArray([1, 2, 3], 1, dtype=np.float64).dtype == np.float64
+
+    with config(check=False):
+        x = DualArray([1.0, np.nan], 1)
+    assert math.isnan(x.real[1])
+
+    with pytest.raises(ValueError):
+        DualArray([1.0, np.nan], 1)
+
+
+@pytest.mark.parametrize("backend", backends.available_backends())
+def test_config_backend(backend):
+    """
+    Tests that the backend setting chooses the Dual class returned by arrays and reductions
+    """
+
+    with config(backend=backend):
+        Dual = backends.load_backend(backend)
+        assert type(DualArray([1.0, 2.0], 1)[0]) is Dual
+        assert type(dual_autodiff.sum([1, 2])) is Dual
+
+
+def test_config_threads():
+    """
+    Tests that each thread has its own settings
+    """
+
+    results = {}
+    barrier = threading.Barrier(2)
+
+    def work(name, domain):
+        with config(domain=domain):
+            barrier.wait()
+            try:
+                results[name] = math.isnan(dual_autodiff.Dual(-1, 1).log().real)
+            except ValueError:
+                results[name] = "raised"
+
+    threads = [threading.Thread(target=work, args=("nan", "nan")), threading.Thread(target=work, args=("raise", "raise"))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {"nan": True, "raise": "raised"}
+    assert get_config().domain == "raise"
+
+
+def test_config_tasks():
+    """
+    Tests that asyncio tasks have their own settings
+    """
+
+    async def work(dtype):
+        with config(dtype=dtype):
+            await asyncio.sleep(0)
+            return DualArray([1, 2], 1).dtype
+
+    async def main():
+        return await asyncio.gather(work(np.float32), work(np.float16), work(np.float64))
+
+    assert asyncio.run(main()) == [np.float32, np.float16, np.float64]
@@ -0,0 +1,131 @@
+# Tests of the Fourier transforms and convolution of DualArrays, whose dual parts are checked against numpy on the dual
+# plane, central differences and products of scalar dual numbers
+import pytest
+import numpy as np
+import dual_autodiff
+from dual_autodiff import Dual, DualArray
+from dual_autodiff.policy import ErrorCode, domain_policy
+from dual_autodiff.spectral import convolve, fft, ifft, irfft, rfft
+
+
+def test_transforms():
+    """
+    The transforms match numpy on both planes, and the inverses undo them
+    """
+
+    rng = np.random.default_rng(0)
+    x = DualArray(rng.random((3, 16)), rng.random((3, 16)))
+    for f, g in ((fft, np.fft.fft), (ifft, np.fft.ifft), (rfft, np.fft.rfft)):
+        y = f(x, norm="ortho")
+        assert np.allclose(y.real, g(x.real, norm="ortho")) and np.allclose(y.dual, g(x.dual, norm="ortho"))
+    y = fft(x, n=8, axis=0)
+    assert y.shape == (8, 16) and np.allclose(y.dual, np.fft.fft(x.dual, n=8, axis=0))
+    z = irfft(rfft(x))
+    assert np.allclose(z.real, x.real) and np.allclose(z.dual, x.dual)
+    z = ifft(fft(x))
+    assert np.allclose(z.real, x.real) and np.allclose(z.dual, x.dual)
+    assert dual_autodiff.fft is fft and dual_autodiff.convolve is convolve
+
+
+
+def test_transform_derivative():
+    """
+    The derivative of a power spectrum with respect to the frequency of the signal matches a central difference
+    """
+
+    t = np.linspace(0, 1, 64, endpoint=False)
+
+    def power(w):
+        s = np.fft.fft(np.sin(w * 2 * np.pi * t))
+        return np.abs(s) ** 2
+
+    w, h = 5.3, 1e-6
+    s = fft(DualArray(w * 2 * np.pi * t, 2 * np.pi * t).sin())
+    derivative = 2 * (s.real.conj() * s.dual).real
+    assert np.allclose(derivative, (power(w + h) - power(w - h)) / (2 * h), rtol=1e-5, atol=1e-4)
+
+
+
+def test_transform_inputs():
+    """
+    Arrays of numbers and lists of dual numbers are transformed, and rfft only takes real planes
+    """
+
+    y = fft([1.0, 2.0])
+    assert np.allclose(y.real, [3, -1]) and not np.any(y.dual)
+    assert np.allclose(fft([Dual(1, 1), Dual(2, 0)]).dual, [1, 1])
+    with pytest.raises(TypeError):
+        rfft(fft([1.0, 2.0]))
+    with pytest.raises(ValueError):
+        fft(DualArray(1.0, 1.0))
+
+
+
+@pytest.mark.parametrize("mode", ["full", "same", "valid"])
+@pytest.mark.parametrize("method", ["direct", "fft"])
+def test_convolve(mode, method):
+    """
+    Convolution matches numpy on the real parts and sums of products of dual numbers on the dual parts, with either
+    sequence the longer
+    """
+
+    rng = np.random.default_rng(1)
+    for n, m in ((40, 7), (7, 40), (5, 5), (1, 3)):
+        a = DualArray(rng.random(n), rng.random(n))
+        v = DualArray(rng.random(m), rng.random(m))
+        y = convolve(a, v, mode, method)
+        assert np.allclose(y.real, np.convolve(a.real, v.real, mode))
+        full = [sum((Dual(a.real[i], a.dual[i]) * Dual(v.real[k - i], v.dual[k - i])
+                     for i in range(max(0, k - m + 1), min(n, k + 1))), Dual(0, 0)) for k in range(n + m - 1)]
+        expected = np.array([d.dual for d in full])
+        cropped = {"full": expected, "same": expected[(min(n, m) - 1) // 2:][:max(n, m)],
+                   "valid": expected[min(n, m) - 1:max(n, m)]}[mode]
+        assert y.shape == np.convolve(a.real, v.real, mode).shape
+        assert np.allclose(y.dual, cropped)
+
+
+
+def test_convolve_constant_kernel():
+    """
+    A kernel of numbers filters the dual part with the same kernel, and complex sequences are convolved too
+    """
+
+    y = convolve(DualArray([1.0, 2.0, 3.0], [1.0, 0.0, 0.0]), [0.5, 0.5])
+    assert np.allclose(y.real, [0.5, 1.5, 2.5, 1.5]) and np.allclose(y.dual, [0.5, 0.5, 0, 0])
+    rng = np.random.default_rng(2)
+    a = DualArray(rng.random(300) + 1j * rng.random(300), rng.random(300))
+    v = rng.random(200)
+    for method in ("direct", "fft", "auto"):
+        y = convolve(a, v, method=method)
+        assert np.allclose(y.real, np.convolve(a.real, v)) and np.allclose(y.dual, np.convolve(a.dual, v))
+
+
+
+def test_convolve_errors():
+    """
+    Convolution takes non-empty one dimensional sequences and known modes and methods
+    """
+
+    with pytest.raises(ValueError):
+        convolve(DualArray(np.ones((2, 2)), 0), [1.0])
+    with pytest.raises(ValueError):
+        convolve([], [1.0])
+    with pytest.raises(ValueError):
+        convolve([1.0], [1.0], mode="circular")
+    with pytest.raises(ValueError):
+        convolve([1.0], [1.0], method="winograd")
+
+
+
+def test_spectral_mask():
+    """
+    Under the mask policy an invalid element marks every element computed from it with its error code
+    """
+
+    with domain_policy("mask"):
+        x = DualArray([1.0, -1.0, 2.0, 3.0], 1).log()
+        assert np.all(fft(x).errors == ErrorCode.LOG_DOMAIN)
+        y = DualArray(np.array([[1.0, 2.0], [-1.0, 2.0]]), 1).sqrt()
+        assert fft(y, axis=1).errors.tolist() == [[0, 0], [ErrorCode.SQRT_DOMAIN] * 2]
+        assert np.all(convolve([1.0, 1.0], x).errors == ErrorCode.LOG_DOMAIN)
+        assert not convolve([1.0, 1.0], [2.0]).mask.any()
@@ -0,0 +1,101 @@
+# Tests of chunked sweeps and their checkpoints, an interruption is simulated by a function which raises part way through
+import json
+import os
+import pytest
+import numpy as np
+from dual_autodiff import sweep
+from dual_autodiff.array import DualArray
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _f(x):
+    return (x * x).sin() + x.exp()
+
+
+def test_sweep_matches_array():
+    """
+    Checks a chunked sweep gives exactly the result of evaluating the whole array at once
+    """
+
+    xs = np.linspace(0, 2, 1001).reshape(7, 143)
+    expected = _f(DualArray(xs, 1))
+    result = sweep(_f, xs, chunk_size=64)
+    assert result.shape == (7, 143)
+    assert np.array_equal(result.real, expected.real)
+    assert np.array_equal(result.dual, expected.dual)
+
+    # a DualArray keeps its own dual parts
+    result = sweep(_f, DualArray(xs, 2.0), chunk_size=500)
+    assert np.array_equal(result.dual, 2 * expected.dual)
+
+
+def test_sweep_resumes(tmp_path):
+    """
+    Checks an interrupted sweep restarts from the first unfinished chunk and skips the saved ones
+    """
+
+    xs = np.linspace(0, 2, 1000)
+    calls = []
+
+    def interrupted(x):
+        calls.append(len(x))
+        if len(calls) == 4 and interrupt:
+            raise Interrupted
+        return _f(x)
+
+    interrupt = True
+
+    with pytest.raises(Interrupted):
+        sweep(interrupted, xs, chunk_size=100, checkpoint=tmp_path)
+    with open(tmp_path / "progress.json") as file:
+        assert json.load(file)["done"] == [0, 1, 2]
+
+    calls.clear()
+    interrupt = False
+    result = sweep(interrupted, xs, chunk_size=100, checkpoint=tmp_path)
+    assert len(calls) == 7
+    expected = _f(DualArray(xs, 1))
+    assert np.array_equal(result.real, expected.real)
+    assert np.array_equal(result.dual, expected.dual)
+
+    # a completed sweep is loaded without evaluating anything
+    calls.clear()
+    sweep(interrupted, xs, chunk_size=100, checkpoint=tmp_path)
+    assert calls == []
+
+
+def test_sweep_lost_chunk(tmp_path):
+    """
+    Checks a chunk recorded as done whose file is missing is evaluated again
+    """
+
+    xs = np.linspace(0, 1, 300)
+    sweep(_f, xs, chunk_size=100, checkpoint=tmp_path)
+    os.remove(tmp_path / "chunk_000001.npz")
+    calls = []
+    result = sweep(lambda x: calls.append(1) or _f(x), xs, chunk_size=100, checkpoint=tmp_path)
+    assert len(calls) == 1
+    assert np.array_equal(result.real, _f(DualArray(xs, 1)).real)
+
+
+def test_sweep_errors(tmp_path):
+    """
+    Checks a checkpoint of a different sweep and functions which are not elementwise are rejected
+    """
+
+    xs = np.linspace(0, 1, 300)
+    sweep(_f, xs, chunk_size=100, checkpoint=tmp_path)
+    with pytest.raises(ValueError):
+        sweep(_f, xs + 1, chunk_size=100, checkpoint=tmp_path)
+    with pytest.raises(ValueError):
+        sweep(_f, xs, chunk_size=50, checkpoint=tmp_path)
+
+    with pytest.raises(ValueError):
+        sweep(lambda x: x[:2], xs, chunk_size=100)
+    with pytest.raises(TypeError):
+        sweep(lambda x: "x", xs)
+    with pytest.raises(ValueError):
+        sweep(_f, xs, chunk_size=0)
@@ -0,0 +1,166 @@
+# Tests of the Taylor polynomial type, the coefficients are checked against Cauchy integrals of numpy's complex functions
+# evaluated on a circle about each point, which give every Taylor coefficient independently of the recurrences
+import math
+import pytest
+import numpy as np
+from dual_autodiff import Dual
+from dual_autodiff.policy import domain_policy
+from dual_autodiff.taylor import Taylor, derivatives
+
+
+ORDER = 8
+
+
+def _cauchy(g, x, order=ORDER, radius=0.3, n=128):
+    """
+    The Taylor coefficients of g at x, as the discrete Fourier coefficients of g on a circle of radius `radius`
+    """
+
+    theta = 2 * np.pi * np.arange(n) / n
+    values = g(x + radius * np.exp(1j * theta))
+    return np.array([np.mean(values * np.exp(-1j * k * theta)).real / radius ** k for k in range(order + 1)])
+
+
+def _erf(z):
+    # the power series of erf, which converges quickly near the real points tested
+    return 2 / np.sqrt(np.pi) * sum((-1) ** n * z ** (2 * n + 1) / (math.factorial(n) * (2 * n + 1)) for n in range(60))
+
+
+CASES = [
+    ("sin", lambda t: t.sin(), np.sin, 0.7),
+    ("cos", lambda t: t.cos(), np.cos, 0.7),
+    ("tan", lambda t: t.tan(), np.tan, 0.7),
+    ("sinh", lambda t: t.sinh(), np.sinh, 0.7),
+    ("cosh", lambda t: t.cosh(), np.cosh, -0.7),
+    ("tanh", lambda t: t.tanh(), np.tanh, 3.0),
+    ("exp", lambda t: t.exp(), np.exp, 0.7),
+    ("expm1", lambda t: t.expm1(), np.expm1, 0.7),
+    ("log", lambda t: t.log(), np.log, 0.7),
+    ("log1p", lambda t: t.log1p(), np.log1p, 0.7),
+    ("log10", lambda t: t.log10(), np.log10, 0.7),
+    ("log2", lambda t: t.log2(), np.log2, 0.7),
+    ("sqrt", lambda t: t.sqrt(), np.sqrt, 0.7),
+    ("cbrt", lambda t: t.cbrt(), lambda z: -(-z) ** (1 / 3), -0.7),
+    ("arcsin", lambda t: t.arcsin(), np.arcsin, 0.3),
+    ("arccos", lambda t: t.arccos(), np.arccos, 0.3),
+    ("arctan", lambda t: t.arctan(), np.arctan, 0.7),
+    ("erf", lambda t: t.erf(), _erf, 0.7),
+    ("erfc", lambda t: t.erfc(), lambda z: 1 - _erf(z), 0.7),
+    ("sigmoid", lambda t: t.sigmoid(), lambda z: 1 / (1 + np.exp(-z)), 0.7),
+    ("softplus", lambda t: t.softplus(), lambda z: np.log(1 + np.exp(z)), 0.7),
+    ("abs", lambda t: abs(t), lambda z: -z, -0.7),
+    ("arctan2", lambda t: t.arctan2(t * t + 0.2), lambda z: np.arctan(z / (z * z + 0.2)), 0.7),
+    ("hypot", lambda t: t.hypot(t.exp()), lambda z: np.sqrt(z * z + np.exp(2 * z)), 0.7),
+]
+
+
+@pytest.mark.parametrize("name, f, g, x", CASES, ids=[case[0] for case in CASES])
+def test_taylor_functions(name, f, g, x):
+    """
+    Checks every coefficient of each elementary function up to order 8
+    """
+
+    result = f(Taylor.variable(x, ORDER))
+    assert result.coefficients == pytest.approx(_cauchy(g, x), rel=1e-9, abs=1e-11)
+
+
+def test_taylor_arithmetic():
+    """
+    Checks the operators and powers, including integer powers through zero and polynomial powers
+    """
+
+    x = 0.7
+    t = Taylor.variable(x, ORDER)
+    cases = [
+        (lambda t: (t * t + 1) / (t.sin() + 2), lambda z: (z * z + 1) / (np.sin(z) + 2)),
+        (lambda t: 3 / t - t / 2 + 1 - t, lambda z: 3 / z - z / 2 + 1 - z),
+        (lambda t: -t ** 2.5, lambda z: -z ** 2.5),
+        (lambda t: t ** -3, lambda z: z ** -3.0),
+        (lambda t: t ** t, lambda z: z ** z),
+        (lambda t: 2 ** t, lambda z: 2 ** z),
+    ]
+    for f, g in cases:
+        assert f(t).coefficients == pytest.approx(_cauchy(g, x), rel=1e-9, abs=1e-11)
+
+    # integer powers are defined where the value is zero
+    assert list((Taylor.variable(0.0, 4) ** 3).coefficients) == [0, 0, 0, 1, 0]
+    assert (Taylor.variable(-2.0, 3) ** -2.0).coefficients == pytest.approx([0.25, 0.25, 0.1875, 0.125], rel=1e-12)
+
+
+def test_taylor_matches_dual():
+    """
+    Checks the first order coefficients agree with Dual
+    """
+
+    t = Taylor.variable(0.4, 1, seed=2.0)
+    d = Dual(0.4, 2.0)
+    for name in ["sin", "tan", "tanh", "exp", "log", "sqrt", "arcsin", "sigmoid", "softplus"]:
+        result = getattr(t, name)()
+        expected = getattr(d, name)()
+        assert result.coefficients == pytest.approx([expected.real, expected.dual], rel=1e-12)
+
+
+def test_taylor_batch():
+    """
+    Checks a batch of points gives the same coefficients as each point alone, and batches broadcast
+    """
+
+    xs = np.linspace(0.2, 2, 12).reshape(3, 4)
+    t = Taylor.variable(xs, 5)
+    result = (t.sin() * t.exp()).log1p()
+    assert result.shape == (3, 4)
+    assert result.order == 5
+    single = (Taylor.variable(xs[1, 2], 5).sin() * Taylor.variable(xs[1, 2], 5).exp()).log1p()
+    assert result[1, 2].coefficients == pytest.approx(single.coefficients, rel=1e-12)
+
+    scalar = Taylor.variable(1.0, 5)
+    assert (np.array([1.0, 2.0]) * scalar).shape == (2,)
+    assert (scalar + Taylor.variable([1.0, 2.0, 3.0], 3)).shape == (3,)
+    # different orders are truncated to the lower order
+    assert (scalar * Taylor.variable(1.0, 2)).order == 2
+
+    d = derivatives(lambda x: x.exp() * x, [0.0, 1.0], 4)
+    assert d.shape == (5, 2)
+    assert d[:, 0] == pytest.approx([0, 1, 2, 3, 4], abs=1e-15)
+    assert d[:, 1] == pytest.approx(math.e * np.arange(1, 6), rel=1e-12)
+
+
+def test_taylor_domain():
+    """
+    Checks invalid points raise like Dual under the default policy and become nan under the "nan" policy
+    """
+
+    t = Taylor.variable([-1.0, 0.0, 2.0], 3)
+    with pytest.raises(ValueError):
+        t.log()
+    with pytest.raises(ZeroDivisionError):
+        1 / t
+    with pytest.raises(ValueError):
+        Taylor.variable(0.0, 3) ** 0
+    with pytest.raises(ValueError):
+        t ** 0.5
+    with pytest.raises(ValueError):
+        Taylor([1.0, np.nan])
+
+    with domain_policy("nan"), np.errstate(all="ignore"):
+        result = t.sqrt()
+    assert np.isnan(result.coefficients[:, :2]).all()
+    assert result.coefficients[:, 2] == pytest.approx(_cauchy(np.sqrt, 2.0, 3), rel=1e-9)
+
+
+def test_taylor_errors():
+    """
+    Checks unsupported operands and invalid construction are rejected
+    """
+
+    t = Taylor.variable(1.0, 3)
+    with pytest.raises(TypeError):
+        t + "a"
+    with pytest.raises(TypeError):
+        t * Dual(1, 1)
+    with pytest.raises(TypeError):
+        Taylor([1j, 2])
+    with pytest.raises(ValueError):
+        Taylor([])
+    with pytest.raises(ValueError):
+        t.derivative(4)